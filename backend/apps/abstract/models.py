@@ -8,4 +8,11 @@ class AuditDates(models.Model):
 
     class Meta:
         abstract = True
-        ordering = ['-created_at']
\ No newline at end of file
+        ordering = ["-created_at", "-id"]
+        # Índice para la paginación keyset sobre (created_at, id)
+        indexes = [
+            models.Index(
+                fields=["created_at", "id"],
+                name="%(app_label)s_%(class)s_keyset",
+            ),
+        ]
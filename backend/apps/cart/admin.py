@@ -0,0 +1,15 @@
+from django.contrib import admin
+
+from . import models
+
+
+class CartAdmin(admin.ModelAdmin):
+    list_display = ("user", "updated_at")
+    list_select_related = ("user",)
+    search_fields = ("user__email",)
+    raw_id_fields = ("user",)
+    readonly_fields = ("items",)
+    list_per_page = 25
+
+
+admin.site.register(models.Cart, CartAdmin)
@@ -0,0 +1,40 @@
+from rest_framework import serializers
+
+from apps.cart.services import MAX_QUANTITY
+from apps.catalog.models import ProductListing
+
+
+class CartItemSerializer(serializers.Serializer):
+    product_id = serializers.IntegerField(min_value=1)
+    quantity = serializers.IntegerField(min_value=1, max_value=MAX_QUANTITY, default=1)
+
+    def validate_product_id(self, value):
+        if not ProductListing.objects.filter(product_id=value).exists():
+            msg = "Product not available."
+            raise serializers.ValidationError(msg)
+        return value
+
+
+class CartQuantitySerializer(serializers.Serializer):
+    quantity = serializers.IntegerField(min_value=0, max_value=MAX_QUANTITY)
+
+
+class CartLineSerializer(serializers.Serializer):
+    product_id = serializers.IntegerField()
+    quantity = serializers.IntegerField()
+    name = serializers.CharField()
+    slug = serializers.CharField()
+    image_url = serializers.CharField()
+    in_stock = serializers.BooleanField()
+    list_price = serializers.DecimalField(max_digits=10, decimal_places=2)
+    unit_price = serializers.DecimalField(max_digits=10, decimal_places=2)
+    discount = serializers.DecimalField(max_digits=12, decimal_places=2)
+    line_total = serializers.DecimalField(max_digits=12, decimal_places=2)
+
+
+class CartSerializer(serializers.Serializer):
+    items = CartLineSerializer(many=True)
+    subtotal = serializers.DecimalField(max_digits=12, decimal_places=2)
+    coupon_code = serializers.CharField()
+    coupon_discount = serializers.DecimalField(max_digits=12, decimal_places=2)
+    total = serializers.DecimalField(max_digits=12, decimal_places=2)
@@ -0,0 +1,126 @@
+from django.db import transaction
+from django.utils.decorators import method_decorator
+from drf_spectacular.utils import OpenApiParameter
+from drf_spectacular.utils import extend_schema
+from drf_spectacular.utils import extend_schema_view
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.viewsets import ViewSet
+
+from apps.cart import services
+from apps.catalog.models import ProductListing
+from apps.pricing.engine import InvalidCouponError
+from apps.pricing.engine import Item
+from apps.pricing.engine import load_rules
+
+from .serializers import CartItemSerializer
+from .serializers import CartQuantitySerializer
+from .serializers import CartSerializer
+
+
+@extend_schema_view(
+    list=extend_schema(
+        parameters=[OpenApiParameter("coupon", str)],
+        responses=CartSerializer,
+    ),
+    destroy=extend_schema(responses=CartSerializer),
+    clear=extend_schema(request=None, responses=CartSerializer),
+)
+@method_decorator(transaction.non_atomic_requests, name="dispatch")
+class CartViewSet(ViewSet):
+    """
+    The authenticated user's cart.
+
+    The cart itself lives in Redis, so the view opts out of
+    ``ATOMIC_REQUESTS``: the only SQL it runs is one read of the listing rows
+    for the products in the cart (the promotion rules come from the cache).
+    """
+
+    permission_classes = [IsAuthenticated]
+    lookup_field = "product_id"
+    lookup_value_regex = r"\d+"
+
+    def cart_data(self) -> dict:
+        """
+        The cart priced by the pricing engine, with the coupon from
+        ``?coupon=`` applied.
+        """
+        items = services.get_items(self.request.user.pk)
+        listings = {
+            listing.product_id: listing
+            for listing in (
+                ProductListing.objects.filter(product_id__in=items).defer(
+                    "search_vector",
+                )
+                if items
+                else []
+            )
+        }
+        priced_items = {
+            pk: Item(pk, listing.price, listing.tree_path, listing.brand_id)
+            for pk, listing in listings.items()
+        }
+        try:
+            cart = load_rules().price(
+                priced_items,
+                {pk: qty for pk, qty in items.items() if pk in listings},
+                coupon=self.request.query_params.get("coupon", ""),
+            )
+        except InvalidCouponError as exc:
+            raise ValidationError({"coupon": str(exc)}) from exc
+        lines = [
+            {
+                "product_id": line.product_id,
+                "quantity": line.quantity,
+                "name": listings[line.product_id].name,
+                "slug": listings[line.product_id].slug,
+                "image_url": listings[line.product_id].image_url,
+                "in_stock": listings[line.product_id].in_stock,
+                "list_price": line.list_price,
+                "unit_price": line.unit_price,
+                "discount": line.discount,
+                "line_total": line.line_total,
+            }
+            for line in cart.lines
+        ]
+        return CartSerializer(
+            {
+                "items": lines,
+                "subtotal": cart.subtotal,
+                "coupon_code": cart.coupon_code,
+                "coupon_discount": cart.coupon_discount,
+                "total": cart.total,
+            },
+        ).data
+
+    def list(self, request):
+        return Response(self.cart_data())
+
+    @extend_schema(request=CartItemSerializer, responses=CartSerializer)
+    def create(self, request):
+        serializer = CartItemSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        services.add_item(request.user.pk, **serializer.validated_data)
+        return Response(self.cart_data())
+
+    @extend_schema(request=CartQuantitySerializer, responses=CartSerializer)
+    def update(self, request, product_id=None):
+        serializer = CartQuantitySerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        services.set_quantity(
+            request.user.pk,
+            int(product_id),
+            serializer.validated_data["quantity"],
+        )
+        return Response(self.cart_data())
+
+    def destroy(self, request, product_id=None):
+        services.remove_item(request.user.pk, int(product_id))
+        return Response(self.cart_data())
+
+    @action(detail=False, methods=["post"])
+    def clear(self, request):
+        services.clear(request.user.pk)
+        return Response(self.cart_data())
@@ -0,0 +1,67 @@
+import random
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from apps.cart import services
+from apps.cart.models import Cart
+from apps.utils.benchmark import format_summary
+from apps.utils.benchmark import measure
+
+BENCH_EMAIL = "bench-cart@example.com"
+
+
+def orm_get_items(user_id):
+    """Baseline: the cart as a Postgres row, read inside a request transaction."""
+    with transaction.atomic():
+        items = (
+            Cart.objects.filter(user_id=user_id).values_list("items", flat=True).first()
+        )
+    return {int(k): v for k, v in (items or {}).items()}
+
+
+def orm_add_item(user_id, product_id, quantity=1):
+    """Baseline: read-modify-write of the cart row under a row lock."""
+    with transaction.atomic():
+        cart, _ = Cart.objects.select_for_update().get_or_create(user_id=user_id)
+        key = str(product_id)
+        cart.items[key] = min(cart.items.get(key, 0) + quantity, services.MAX_QUANTITY)
+        cart.save(update_fields=["items", "updated_at"])
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare p50/p95/p99 latency of cart reads and updates on the Redis "
+        "cart against an ORM-only cart table."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--runs", type=int, default=500)
+        parser.add_argument("--lines", type=int, default=8)
+
+    def handle(self, *args, **options):
+        user, _ = get_user_model().objects.get_or_create(email=BENCH_EMAIL)
+        rng = random.Random(7)  # noqa: S311
+        product_ids = [rng.randint(1, 100_000) for _ in range(options["lines"])]
+
+        def redis_add():
+            services.add_item(user.pk, rng.choice(product_ids))
+
+        def orm_add():
+            orm_add_item(user.pk, rng.choice(product_ids))
+
+        cases = {
+            "redis add item": redis_add,
+            "redis read": lambda: services.get_items(user.pk),
+            "orm add item": orm_add,
+            "orm read": lambda: orm_get_items(user.pk),
+        }
+        try:
+            for label, func in cases.items():
+                timings, queries = measure(func, options["runs"])
+                self.stdout.write(format_summary(label, timings, queries))
+        finally:
+            services.clear(user.pk)
+            Cart.objects.filter(user=user).delete()
+            user.delete()
@@ -0,0 +1,30 @@
+from django.db import migrations
+
+TASK_NAME = 'Flush Redis carts to Postgres'
+
+
+def create_periodic_task(apps, schema_editor):
+    IntervalSchedule = apps.get_model('django_celery_beat', 'IntervalSchedule')
+    PeriodicTask = apps.get_model('django_celery_beat', 'PeriodicTask')
+    schedule, _ = IntervalSchedule.objects.get_or_create(every=1, period='minutes')
+    PeriodicTask.objects.update_or_create(
+        name=TASK_NAME,
+        defaults={'task': 'apps.cart.tasks.flush_carts_task', 'interval': schedule},
+    )
+
+
+def delete_periodic_task(apps, schema_editor):
+    PeriodicTask = apps.get_model('django_celery_beat', 'PeriodicTask')
+    PeriodicTask.objects.filter(name=TASK_NAME).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cart', '0001_initial'),
+        ('django_celery_beat', '0019_alter_periodictasks_options'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_periodic_task, delete_periodic_task),
+    ]
@@ -0,0 +1,30 @@
+from django.conf import settings
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+from apps.abstract.models import AuditDates
+
+
+class Cart(AuditDates):
+    """
+    Copia durable del carrito de un usuario.
+
+    El carrito vivo está en Redis (``apps.cart.services``); esta fila solo se
+    escribe desde ``flush_carts_task`` y se lee cuando Redis no tiene el
+    carrito.
+    """
+
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="cart",
+    )
+    # Cantidad por id de producto; las claves son texto por ser JSON.
+    items = models.JSONField(default=dict, blank=True)
+
+    class Meta(AuditDates.Meta):
+        verbose_name = _("Cart")
+        verbose_name_plural = _("Carts")
+
+    def __str__(self) -> str:
+        return f"Cart of {self.user_id}"
@@ -0,0 +1,166 @@
+"""
+Shopping carts kept in Redis with write-behind to Postgres.
+
+Every active cart is a Redis hash ``cart:<user_id>`` mapping product ids to
+quantities. Cart writes touch only Redis and add the user to the
+``cart:dirty`` set; :func:`flush_carts`, run by celery beat, copies the
+dirty carts to the ``Cart`` table in batches. When Redis does not have a
+cart it is loaded back from that table.
+
+Every write also publishes ``{"type": "cart"}`` to the user's WebSocket
+group in the same pipeline, so the user's other tabs and devices refresh.
+"""
+
+from itertools import batched
+
+import redis
+from django.conf import settings
+from django.contrib.auth import get_user_model
+
+from apps.utils.broadcast import channel
+from apps.utils.broadcast import encode
+from apps.utils.broadcast import user_group
+from apps.utils.redis import get_redis
+
+from .models import Cart
+
+DIRTY_KEY = "cart:dirty"
+FLUSHING_KEY = "cart:flushing"
+FLUSH_LOCK_KEY = "cart:flush-lock"
+FLUSH_LOCK_TIMEOUT = 5 * 60
+# Campo centinela: distingue un carrito vacío ya cargado de uno que no está.
+LOADED_FIELD = "loaded"
+MAX_QUANTITY = 99
+
+
+def cart_key(user_id: int) -> str:
+    return f"cart:{user_id}"
+
+
+def _items(raw: dict[str, str]) -> dict[int, int]:
+    return {
+        int(field): int(value) for field, value in raw.items() if field != LOADED_FIELD
+    }
+
+
+def _load(client: redis.Redis, user_id: int) -> None:
+    """Copy the persisted cart into Redis unless Redis already has it."""
+    key = cart_key(user_id)
+    if client.exists(key):
+        return
+    items = (
+        Cart.objects.filter(user_id=user_id).values_list("items", flat=True).first()
+        or {}
+    )
+    pipe = client.pipeline()
+    # HSETNX para no pisar lo escrito por una petición concurrente.
+    for product_id, quantity in items.items():
+        pipe.hsetnx(key, product_id, quantity)
+    pipe.hsetnx(key, LOADED_FIELD, 1)
+    pipe.expire(key, settings.CART_REDIS_TTL)
+    pipe.execute()
+
+
+def get_items(user_id: int) -> dict[int, int]:
+    """``{product_id: quantity}``; a single Redis round trip when cached."""
+    client = get_redis()
+    raw = client.hgetall(cart_key(user_id))
+    if not raw:
+        _load(client, user_id)
+        raw = client.hgetall(cart_key(user_id))
+    return _items(raw)
+
+
+def _write(user_id: int, *commands: tuple) -> list:
+    client = get_redis()
+    _load(client, user_id)
+    key = cart_key(user_id)
+    pipe = client.pipeline()
+    for command, *args in commands:
+        getattr(pipe, command)(key, *args)
+    pipe.expire(key, settings.CART_REDIS_TTL)
+    pipe.sadd(DIRTY_KEY, user_id)
+    pipe.publish(channel(user_group(user_id)), encode({"type": "cart"}))
+    return pipe.execute()
+
+
+def add_item(user_id: int, product_id: int, quantity: int = 1) -> int:
+    """Add ``quantity`` units and return the new quantity of the line."""
+    total = _write(user_id, ("hincrby", product_id, quantity))[0]
+    if total > MAX_QUANTITY:
+        set_quantity(user_id, product_id, MAX_QUANTITY)
+        total = MAX_QUANTITY
+    return total
+
+
+def set_quantity(user_id: int, product_id: int, quantity: int) -> None:
+    """Set the line to ``quantity``; zero removes it."""
+    if quantity <= 0:
+        _write(user_id, ("hdel", product_id))
+    else:
+        _write(user_id, ("hset", product_id, min(quantity, MAX_QUANTITY)))
+
+
+def remove_item(user_id: int, product_id: int) -> None:
+    set_quantity(user_id, product_id, 0)
+
+
+def clear(user_id: int) -> None:
+    # Se deja el centinela para que el vacío también llegue a Postgres.
+    _write(user_id, ("delete",), ("hset", LOADED_FIELD, 1))
+
+
+def flush_carts(batch_size: int = 500) -> int:
+    """
+    Persist every cart changed since the last flush and return how many.
+
+    The dirty set is renamed before reading it, so writes made during the
+    flush land in a fresh set and are picked up by the next run. A flush
+    that dies halfway leaves ``cart:flushing`` behind and the next run
+    finishes it first.
+    """
+    client = get_redis()
+    lock = client.lock(FLUSH_LOCK_KEY, timeout=FLUSH_LOCK_TIMEOUT, blocking=False)
+    if not lock.acquire():
+        return 0
+    try:
+        if not client.exists(FLUSHING_KEY):
+            try:
+                client.rename(DIRTY_KEY, FLUSHING_KEY)
+            except redis.ResponseError:
+                # No hay carritos pendientes.
+                return 0
+        flushed = 0
+        for user_ids in batched(
+            client.sscan_iter(FLUSHING_KEY, count=batch_size),
+            batch_size,
+        ):
+            flushed += _persist(client, [int(user_id) for user_id in user_ids])
+        client.delete(FLUSHING_KEY)
+        return flushed
+    finally:
+        lock.release()
+
+
+def _persist(client: redis.Redis, user_ids: list[int]) -> int:
+    """Upsert the Redis carts of ``user_ids`` with one Redis and one SQL round trip."""
+    pipe = client.pipeline(transaction=False)
+    for user_id in user_ids:
+        pipe.hgetall(cart_key(user_id))
+    carts = dict(zip(user_ids, pipe.execute(), strict=True))
+    users = set(
+        get_user_model().objects.filter(pk__in=user_ids).values_list("pk", flat=True),
+    )
+    rows = [
+        Cart(user_id=user_id, items={str(k): v for k, v in _items(raw).items()})
+        for user_id, raw in carts.items()
+        # Carritos caducados en Redis o de usuarios ya borrados.
+        if raw and user_id in users
+    ]
+    Cart.objects.bulk_create(
+        rows,
+        update_conflicts=True,
+        unique_fields=["user"],
+        update_fields=["items", "updated_at"],
+    )
+    return len(rows)
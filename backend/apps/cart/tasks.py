@@ -0,0 +1,9 @@
+from celery import shared_task
+
+from .services import flush_carts
+
+
+@shared_task()
+def flush_carts_task():
+    """Write dirty Redis carts to Postgres; scheduled through celery beat."""
+    return flush_carts()
@@ -0,0 +1,72 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from apps.catalog.services import refresh_listings
+from apps.catalog.tests.factories import ProductFactory
+
+pytestmark = [pytest.mark.django_db, pytest.mark.usefixtures("redis_client")]
+
+
+@pytest.fixture
+def api_client(user) -> APIClient:
+    client = APIClient()
+    client.force_authenticate(user)
+    return client
+
+
+class TestCartViewSet:
+    def test_requires_authentication(self):
+        response = APIClient().get(reverse("api:cart-list"))
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_add_update_remove(self, api_client):
+        product = ProductFactory(price="10.00")
+        other = ProductFactory(price="2.50")
+        refresh_listings()
+
+        response = api_client.post(
+            reverse("api:cart-list"),
+            {"product_id": product.pk, "quantity": 2},
+        )
+        assert response.status_code == status.HTTP_200_OK
+        api_client.post(reverse("api:cart-list"), {"product_id": other.pk})
+
+        response = api_client.put(
+            reverse("api:cart-detail", kwargs={"product_id": product.pk}),
+            {"quantity": 3},
+        )
+        assert [
+            (line["product_id"], line["quantity"]) for line in response.data["items"]
+        ] == [(product.pk, 3), (other.pk, 1)]
+        assert response.data["total"] == "32.50"
+
+        response = api_client.delete(
+            reverse("api:cart-detail", kwargs={"product_id": other.pk}),
+        )
+        assert [line["product_id"] for line in response.data["items"]] == [
+            product.pk,
+        ]
+
+        response = api_client.post(reverse("api:cart-clear"))
+        assert response.data["items"] == []
+        assert response.data["total"] == "0.00"
+
+    def test_rejects_unknown_products(self, api_client):
+        response = api_client.post(reverse("api:cart-list"), {"product_id": 999999})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_read_runs_one_query_outside_a_transaction(self, api_client):
+        product = ProductFactory()
+        refresh_listings()
+        api_client.post(reverse("api:cart-list"), {"product_id": product.pk})
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = api_client.get(reverse("api:cart-list"))
+
+        assert response.status_code == status.HTTP_200_OK
+        # Sin SAVEPOINT: la vista no abre la transacción de ATOMIC_REQUESTS.
+        assert len(ctx.captured_queries) == 1
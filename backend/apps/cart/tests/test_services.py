@@ -0,0 +1,85 @@
+import pytest
+
+from apps.cart import services
+from apps.cart.models import Cart
+from apps.cart.services import DIRTY_KEY
+from apps.cart.services import MAX_QUANTITY
+from apps.cart.services import cart_key
+from apps.users.tests.factories import UserFactory
+
+pytestmark = [pytest.mark.django_db, pytest.mark.usefixtures("redis_client")]
+
+
+class TestRedisCart:
+    def test_writes_only_touch_redis(self, user, django_assert_num_queries):
+        services.get_items(user.pk)
+
+        with django_assert_num_queries(0):
+            services.add_item(user.pk, 7, 2)
+            services.add_item(user.pk, 7)
+            services.set_quantity(user.pk, 3, 5)
+            services.remove_item(user.pk, 3)
+            assert services.get_items(user.pk) == {7: 3}
+
+        assert not Cart.objects.exists()
+
+    def test_quantity_is_capped(self, user):
+        assert services.add_item(user.pk, 7, MAX_QUANTITY) == MAX_QUANTITY
+        assert services.add_item(user.pk, 7) == MAX_QUANTITY
+        services.set_quantity(user.pk, 8, MAX_QUANTITY + 5)
+        assert services.get_items(user.pk) == {7: MAX_QUANTITY, 8: MAX_QUANTITY}
+
+    def test_miss_loads_persisted_cart(self, user, redis_client):
+        Cart.objects.create(user=user, items={"7": 2, "9": 1})
+
+        assert services.get_items(user.pk) == {7: 2, 9: 1}
+
+        Cart.objects.filter(user=user).update(items={})
+        assert services.get_items(user.pk) == {7: 2, 9: 1}
+        assert redis_client.ttl(cart_key(user.pk)) > 0
+
+    def test_empty_cart_is_cached(self, user, django_assert_num_queries):
+        services.get_items(user.pk)
+
+        with django_assert_num_queries(0):
+            assert services.get_items(user.pk) == {}
+
+
+class TestFlushCarts:
+    def test_flush_persists_dirty_carts(self, redis_client):
+        first, second, idle = UserFactory.create_batch(3)
+        services.add_item(first.pk, 7, 2)
+        services.add_item(second.pk, 8)
+        services.get_items(idle.pk)
+
+        assert services.flush_carts(batch_size=1) == 2  # noqa: PLR2004
+
+        assert dict(Cart.objects.values_list("user_id", "items")) == {
+            first.pk: {"7": 2},
+            second.pk: {"8": 1},
+        }
+        assert not redis_client.exists(DIRTY_KEY)
+        assert services.flush_carts() == 0
+
+    def test_flush_round_trip_after_redis_loses_cart(self, user, redis_client):
+        services.add_item(user.pk, 7, 2)
+        services.flush_carts()
+        services.clear(user.pk)
+        services.flush_carts()
+        assert Cart.objects.get(user=user).items == {}
+
+        services.add_item(user.pk, 9)
+        services.flush_carts()
+        redis_client.delete(cart_key(user.pk))
+
+        assert services.get_items(user.pk) == {9: 1}
+
+    def test_flush_resumes_interrupted_run(self, user, redis_client):
+        services.add_item(user.pk, 7)
+        redis_client.rename(DIRTY_KEY, services.FLUSHING_KEY)
+        other = UserFactory()
+        services.add_item(other.pk, 8)
+
+        assert services.flush_carts() == 1
+        assert services.flush_carts() == 1
+        assert Cart.objects.count() == 2  # noqa: PLR2004
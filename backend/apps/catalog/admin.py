@@ -0,0 +1,58 @@
+from django.contrib import admin
+
+from . import models
+
+
+class ProductImageInline(admin.TabularInline):
+    model = models.ProductImage
+    extra = 0
+
+
+class CategoryAdmin(admin.ModelAdmin):
+    list_display = ("name", "slug", "parent")
+    search_fields = ("name", "slug")
+    prepopulated_fields = {"slug": ("name",)}
+
+
+class BrandAdmin(admin.ModelAdmin):
+    list_display = ("name", "slug")
+    search_fields = ("name", "slug")
+    prepopulated_fields = {"slug": ("name",)}
+
+
+class ProductAdmin(admin.ModelAdmin):
+    list_display = ("name", "category", "brand", "price", "stock", "is_active")
+    list_filter = ("is_active", "category", "brand")
+    list_select_related = ("category", "brand")
+    search_fields = ("name", "slug")
+    prepopulated_fields = {"slug": ("name",)}
+    inlines = [ProductImageInline]
+    list_per_page = 25
+
+
+class CatalogImportAdmin(admin.ModelAdmin):
+    list_display = (
+        "source",
+        "status",
+        "rows_read",
+        "rows_written",
+        "error_count",
+        "created_at",
+    )
+    list_filter = ("status",)
+    readonly_fields = (
+        "status",
+        "rows_read",
+        "rows_staged",
+        "rows_written",
+        "errors",
+        "error_count",
+        "failure",
+        "finished_at",
+    )
+
+
+admin.site.register(models.Category, CategoryAdmin)
+admin.site.register(models.Brand, BrandAdmin)
+admin.site.register(models.Product, ProductAdmin)
+admin.site.register(models.CatalogImport, CatalogImportAdmin)
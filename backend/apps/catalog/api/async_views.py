@@ -0,0 +1,64 @@
+from asgiref.sync import sync_to_async
+from rest_framework.exceptions import NotFound
+
+from apps.catalog.cache import CATALOG
+from apps.catalog.facets import afacet_counts
+from apps.catalog.models import Product
+from apps.catalog.models import ProductListing
+from apps.catalog.tree import acategory_nodes
+from apps.utils.async_views import AsyncReadView
+from apps.utils.pagination import KeysetPagination
+from apps.utils.response_cache import acache_response
+
+from .serializers import ProductListingSerializer
+from .serializers import ProductSerializer
+from .views import category_param
+from .views import filter_listings
+
+
+class AsyncProductListView(AsyncReadView):
+    """Async ``ProductViewSet.list``: same filters, cursor pages and facets."""
+
+    @acache_response(CATALOG, public=True)
+    async def respond(self, request, *args, **kwargs):
+        return await super().respond(request, *args, **kwargs)
+
+    async def read(self, request):
+        category_id = category_param(request.query_params)
+        nodes = await acategory_nodes() if category_id is not None else {}
+        queryset = filter_listings(
+            ProductListing.objects.defer("search_vector"),
+            request.query_params,
+            category_id,
+            nodes,
+        )
+        paginator = KeysetPagination()
+        page = await paginator.apaginate_queryset(queryset, request, self)
+        data = paginator.get_paginated_data(
+            ProductListingSerializer(page, many=True).data,
+        )
+        data["facets"] = await afacet_counts(category_id)
+        return data
+
+
+class AsyncProductDetailView(AsyncReadView):
+    """Async ``ProductViewSet.retrieve``."""
+
+    @acache_response(CATALOG, public=True)
+    async def respond(self, request, *args, **kwargs):
+        return await super().respond(request, *args, **kwargs)
+
+    async def read(self, request, slug):
+        try:
+            product = await (
+                Product.objects.filter(is_active=True)
+                .select_related("category", "brand")
+                .prefetch_related("images")
+                .aget(slug=slug)
+            )
+        except Product.DoesNotExist:
+            # El mismo mensaje que get_object_or_404 en la vista síncrona.
+            msg = "No Product matches the given query."
+            raise NotFound(msg) from None
+        # sale_price carga las promociones, que pueden ir a la base de datos.
+        return await sync_to_async(lambda: ProductSerializer(product).data)()
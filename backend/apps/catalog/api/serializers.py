@@ -0,0 +1,119 @@
+from django.utils import timezone
+from rest_framework import serializers
+
+from apps.catalog.autocomplete import KIND_ORDER
+from apps.catalog.images import srcset
+from apps.catalog.models import Brand
+from apps.catalog.models import Category
+from apps.catalog.models import Product
+from apps.catalog.models import ProductImage
+from apps.catalog.models import ProductListing
+from apps.pricing.engine import Item
+from apps.pricing.engine import load_rules
+
+
+class ProductListingSerializer(serializers.ModelSerializer):
+    id = serializers.IntegerField(source="product_id", read_only=True)
+
+    class Meta:
+        model = ProductListing
+        fields = (
+            "id",
+            "name",
+            "slug",
+            "brand_name",
+            "category_path",
+            "price",
+            "sale_price",
+            "in_stock",
+            "image_url",
+            "image_srcset",
+        )
+
+
+class ProductSearchResultSerializer(ProductListingSerializer):
+    rank = serializers.FloatField(read_only=True)
+    headline = serializers.CharField(read_only=True)
+
+    class Meta(ProductListingSerializer.Meta):
+        fields = (*ProductListingSerializer.Meta.fields, "rank", "headline")
+
+
+class CategorySerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Category
+        fields = ("id", "name", "slug", "parent")
+
+
+class BrandSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Brand
+        fields = ("id", "name", "slug")
+
+
+class AutocompleteSerializer(serializers.Serializer):
+    kind = serializers.ChoiceField(choices=list(KIND_ORDER))
+    id = serializers.IntegerField()
+    slug = serializers.CharField()
+    name = serializers.CharField()
+
+
+class ImageVariantSerializer(serializers.Serializer):
+    format = serializers.CharField()
+    width = serializers.IntegerField()
+    url = serializers.CharField()
+
+
+class ProductImageSerializer(serializers.ModelSerializer):
+    variants = ImageVariantSerializer(many=True, read_only=True)
+    srcset = serializers.SerializerMethodField()
+
+    class Meta:
+        model = ProductImage
+        fields = (
+            "id",
+            "image",
+            "alt_text",
+            "is_primary",
+            "position",
+            "width",
+            "height",
+            "variants",
+            "srcset",
+        )
+
+    def get_srcset(self, image) -> dict[str, str]:
+        """``srcset`` per format, e.g. ``{"webp": "... 320w, ... 640w"}``."""
+        return {
+            image_format: srcset(image.variants, image_format)
+            for image_format in dict.fromkeys(v["format"] for v in image.variants)
+        }
+
+
+class ProductSerializer(serializers.ModelSerializer):
+    category = CategorySerializer(read_only=True)
+    brand = BrandSerializer(read_only=True)
+    images = ProductImageSerializer(many=True, read_only=True)
+    sale_price = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Product
+        fields = (
+            "id",
+            "name",
+            "slug",
+            "description",
+            "price",
+            "sale_price",
+            "stock",
+            "category",
+            "brand",
+            "images",
+            "created_at",
+            "updated_at",
+        )
+
+    def get_sale_price(self, product) -> str | None:
+        item = Item(product.pk, product.price, product.category.path, product.brand_id)
+        price, sale = load_rules().sale_price(item, timezone.now())
+        return str(price) if sale else None
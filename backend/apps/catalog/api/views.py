@@ -0,0 +1,225 @@
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.utils.decorators import method_decorator
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import OpenApiParameter
+from drf_spectacular.utils import extend_schema
+from drf_spectacular.utils import inline_serializer
+from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound
+from rest_framework.exceptions import ParseError
+from rest_framework.response import Response
+from rest_framework.viewsets import ReadOnlyModelViewSet
+from rest_framework.viewsets import ViewSet
+
+from apps.catalog.autocomplete import suggest
+from apps.catalog.cache import CATALOG
+from apps.catalog.facets import facet_counts
+from apps.catalog.facets import price_band_range
+from apps.catalog.models import Product
+from apps.catalog.models import ProductListing
+from apps.catalog.search import search_listings
+from apps.catalog.tree import category_nodes
+from apps.catalog.tree import nested_tree
+from apps.catalog.tree import node_breadcrumbs
+from apps.recommendations.services import RECOMMENDATIONS
+from apps.recommendations.services import bought_together
+from apps.utils.conditional import conditional
+from apps.utils.response_cache import cache_response
+
+from .serializers import AutocompleteSerializer
+from .serializers import ProductListingSerializer
+from .serializers import ProductSearchResultSerializer
+from .serializers import ProductSerializer
+
+LISTING_FILTERS = {
+    "brand": "brand_id",
+    "in_stock": "in_stock",
+    "min_price": "price__gte",
+    "max_price": "price__lte",
+}
+
+
+def category_param(params) -> int | None:
+    category = params.get("category", "")
+    if category == "":
+        return None
+    if not category.isdigit():
+        msg = "category must be an integer id."
+        raise ParseError(msg)
+    return int(category)
+
+
+def filter_listings(queryset, params, category_id, nodes, lookups=LISTING_FILTERS):
+    """
+    Apply the listing query parameters; ``nodes`` is the category tree, only
+    needed with a ``category_id``.
+    """
+    filters = {
+        lookup: params[param]
+        for param, lookup in lookups.items()
+        if params.get(param, "") != ""
+    }
+    if "in_stock" in filters:
+        filters["in_stock"] = filters["in_stock"].lower() in {"1", "true"}
+    if category_id is not None:
+        node = nodes.get(category_id)
+        if node is None:
+            return queryset.none()
+        filters["tree_path__startswith"] = node["path"]
+    try:
+        if params.get("price_band"):
+            lower, upper = price_band_range(params["price_band"])
+            filters["price__gte"] = lower
+            if upper is not None:
+                filters["price__lt"] = upper
+        return queryset.filter(**filters)
+    except (ValueError, ValidationError) as exc:
+        raise ParseError(str(exc)) from exc
+
+
+class ProductViewSet(ReadOnlyModelViewSet):
+    """
+    Storefront products.
+
+    The list reads only from the denormalized ``ProductListing`` table; the
+    detail view loads the full product with its relations. Every action is
+    the same for all users and goes through the catalog response cache.
+    """
+
+    lookup_field = "slug"
+    search_limit = 12
+    search_max_limit = 50
+    listing_filters = LISTING_FILTERS
+
+    def get_queryset(self):
+        if self.action == "list":
+            return self.filter_listings(
+                ProductListing.objects.defer("search_vector"),
+            )
+        return (
+            Product.objects.filter(is_active=True)
+            .select_related("category", "brand")
+            .prefetch_related("images")
+        )
+
+    @conditional(CATALOG, public=True)
+    @cache_response(CATALOG, public=True)
+    def list(self, request, *args, **kwargs):
+        """Listing page plus precomputed facet counts for the category subtree."""
+        response = super().list(request, *args, **kwargs)
+        response.data["facets"] = facet_counts(self.category_id())
+        return response
+
+    def category_id(self) -> int | None:
+        return category_param(self.request.query_params)
+
+    @conditional(CATALOG, public=True)
+    @cache_response(CATALOG, public=True)
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
+
+    def get_serializer_class(self):
+        if self.action in {"list", "bought_together"}:
+            return ProductListingSerializer
+        if self.action == "search":
+            return ProductSearchResultSerializer
+        return ProductSerializer
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter("q", str, required=True),
+            OpenApiParameter("limit", int),
+        ],
+    )
+    @action(detail=False, pagination_class=None)
+    @cache_response(CATALOG, public=True)
+    def search(self, request):
+        """Ranked full-text search with prefix matching and typo tolerance."""
+        try:
+            limit = int(request.query_params.get("limit", self.search_limit))
+        except ValueError as exc:
+            raise ParseError(str(exc)) from exc
+        limit = max(1, min(limit, self.search_max_limit))
+        results = search_listings(request.query_params.get("q", ""), limit)
+        serializer = self.get_serializer(results, many=True)
+        return Response({"results": serializer.data})
+
+    @action(detail=True, url_path="bought-together", pagination_class=None)
+    @cache_response(CATALOG, RECOMMENDATIONS, public=True)
+    def bought_together(self, request, slug=None):
+        """Products frequently bought with this one, precomputed every night."""
+        serializer = self.get_serializer(bought_together(slug), many=True)
+        return Response({"results": serializer.data})
+
+    def filter_listings(self, queryset):
+        category_id = self.category_id()
+        # Subárbol completo: la ruta sale del árbol cacheado, sin consulta.
+        nodes = category_nodes() if category_id is not None else {}
+        return filter_listings(
+            queryset,
+            self.request.query_params,
+            category_id,
+            nodes,
+            self.listing_filters,
+        )
+
+
+class CategoryViewSet(ViewSet):
+    """Category tree served from the cached tree blob."""
+
+    lookup_field = "slug"
+
+    @extend_schema(operation_id="categories_list", responses=OpenApiTypes.OBJECT)
+    @cache_response(CATALOG, public=True)
+    def list(self, request):
+        return Response(nested_tree(category_nodes()))
+
+    @extend_schema(
+        parameters=[OpenApiParameter("slug", str, OpenApiParameter.PATH)],
+        responses=OpenApiTypes.OBJECT,
+    )
+    @cache_response(CATALOG, public=True)
+    def retrieve(self, request, slug=None):
+        nodes = category_nodes()
+        node = next((node for node in nodes.values() if node["slug"] == slug), None)
+        if node is None:
+            raise NotFound
+        children = [
+            child for child in nodes.values() if child["parent_id"] == node["id"]
+        ]
+        return Response(
+            {
+                **node,
+                "breadcrumbs": node_breadcrumbs(nodes, node["id"]),
+                "children": children,
+            },
+        )
+
+
+# Sin consultas a Postgres mientras Redis responde: ni siquiera el BEGIN.
+@method_decorator(transaction.non_atomic_requests, name="dispatch")
+class AutocompleteViewSet(ViewSet):
+    """Search-as-you-type suggestions; see ``apps.catalog.autocomplete``."""
+
+    limit = 8
+    max_limit = 20
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter("q", str, required=True),
+            OpenApiParameter("limit", int),
+        ],
+        responses=inline_serializer(
+            "AutocompleteResponse",
+            {"results": AutocompleteSerializer(many=True)},
+        ),
+    )
+    def list(self, request):
+        try:
+            limit = int(request.query_params.get("limit", self.limit))
+        except ValueError as exc:
+            raise ParseError(str(exc)) from exc
+        limit = max(1, min(limit, self.max_limit))
+        results = suggest(request.query_params.get("q", ""), limit)
+        return Response({"results": AutocompleteSerializer(results, many=True).data})
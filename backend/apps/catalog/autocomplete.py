@@ -0,0 +1,223 @@
+"""
+Search-as-you-type suggestions from a lexicographic Redis index.
+
+Every active product, brand and category is stored in the sorted set
+``INDEX_KEY`` with score 0, once per word suffix of its normalized name
+(lowercase, no accents), so "camiseta roja" is found by "cam" and "roj". A
+member is ``<term>\\0<kind>\\0<id>\\0<slug>\\0<name>``: a single
+``ZRANGEBYLEX`` returns everything a suggestion needs.
+
+``DOCS_KEY`` maps ``<kind>:<id>`` to the document's members, so a rename
+removes exactly the old ones. Products are indexed from
+``refresh_listings``; brands and categories from their signals. The
+``rebuild_autocomplete`` command rebuilds both keys and swaps them in.
+
+Redis is not required for the catalog to work: index writes that fail are
+logged and dropped (the next rebuild catches up), and :func:`suggest`
+falls back to SQL when Redis is down or the index has not been built yet.
+"""
+
+import json
+import logging
+import unicodedata
+from collections.abc import Iterable
+from collections.abc import Iterator
+from itertools import batched
+
+import redis
+from django.db import transaction
+
+from apps.utils.redis import get_redis
+
+from .models import Brand
+from .models import Category
+from .models import ProductListing
+from .search import search_listings
+
+logger = logging.getLogger(__name__)
+
+INDEX_KEY = "autocomplete:index"
+DOCS_KEY = "autocomplete:docs"
+# Lo crea rebuild(); sin él, suggest() va a SQL.
+READY_KEY = "autocomplete:ready"
+PRODUCT = "product"
+BRAND = "brand"
+CATEGORY = "category"
+KIND_ORDER = {CATEGORY: 0, BRAND: 1, PRODUCT: 2}
+SEP = "\0"
+# Sufijos indexados por nombre: "a b c d e" -> "a b c d e" ... "d e"
+MAX_SUFFIXES = 4
+MAX_TERM_LENGTH = 100
+# Miembros leídos por sugerencia: un documento aparece una vez por sufijo.
+OVERFETCH = 4
+
+Doc = tuple[int, str, str]
+
+
+def normalize(text: str) -> str:
+    """Lowercase, accent-free, single-spaced ``text``."""
+    decomposed = unicodedata.normalize("NFKD", text.lower())
+    return " ".join(
+        "".join(char for char in decomposed if not unicodedata.combining(char)).split(),
+    )
+
+
+def members(kind: str, pk: int, slug: str, name: str) -> list[str]:
+    words = normalize(name).split()
+    return [
+        SEP.join(
+            (" ".join(words[start:])[:MAX_TERM_LENGTH], kind, str(pk), slug, name),
+        )
+        for start in range(min(len(words), MAX_SUFFIXES))
+    ]
+
+
+def _write(
+    client: redis.Redis,
+    kind: str,
+    docs: list[Doc],
+    removed: list[int],
+    keys: tuple[str, str] = (INDEX_KEY, DOCS_KEY),
+) -> None:
+    index_key, docs_key = keys
+    fields = [f"{kind}:{pk}" for pk in removed] + [f"{kind}:{pk}" for pk, *_ in docs]
+    previous = client.hmget(docs_key, fields) if fields else []
+    stale = [member for raw in previous if raw for member in json.loads(raw)]
+    new = {pk: members(kind, pk, slug, name) for pk, slug, name in docs}
+    current = {member for items in new.values() for member in items}
+    pipe = client.pipeline()
+    if stale := [member for member in stale if member not in current]:
+        pipe.zrem(index_key, *stale)
+    if current:
+        pipe.zadd(index_key, dict.fromkeys(current, 0))
+        pipe.hset(
+            docs_key,
+            mapping={f"{kind}:{pk}": json.dumps(items) for pk, items in new.items()},
+        )
+    if removed:
+        pipe.hdel(docs_key, *(f"{kind}:{pk}" for pk in removed))
+    pipe.execute()
+
+
+def update(kind: str, docs: Iterable[Doc] = (), removed: Iterable[int] = ()) -> None:
+    """
+    Index ``docs`` (``(id, slug, name)``) and drop ``removed`` ids once the
+    current transaction commits.
+    """
+    docs, removed = list(docs), list(removed)
+    if not docs and not removed:
+        return
+
+    def write():
+        try:
+            _write(get_redis(), kind, docs, removed)
+        except redis.RedisError:
+            logger.warning("Autocomplete index update failed", exc_info=True)
+
+    transaction.on_commit(write)
+
+
+def _docs() -> Iterator[tuple[str, Doc]]:
+    # Los cursores de servidor, dentro de una transacción (ver apps.utils.db_pool).
+    with transaction.atomic():
+        for kind, queryset in (
+            (PRODUCT, ProductListing.objects.values_list("product_id", "slug", "name")),
+            (BRAND, Brand.objects.values_list("pk", "slug", "name")),
+            (CATEGORY, Category.objects.values_list("pk", "slug", "name")),
+        ):
+            for doc in queryset.order_by().iterator(chunk_size=5000):
+                yield kind, doc
+
+
+def rebuild(batch_size: int = 5000) -> int:
+    """
+    Build the whole index under temporary keys and swap it in; returns the
+    number of documents. Incremental updates made while it runs are lost.
+    """
+    client = get_redis()
+    index_key, docs_key = f"{INDEX_KEY}:new", f"{DOCS_KEY}:new"
+    client.delete(index_key, docs_key)
+    indexed = 0
+    for batch in batched(_docs(), batch_size):
+        by_kind: dict[str, list[Doc]] = {}
+        for kind, doc in batch:
+            by_kind.setdefault(kind, []).append(doc)
+        for kind, docs in by_kind.items():
+            _write(client, kind, docs, [], (index_key, docs_key))
+        indexed += len(batch)
+    pipe = client.pipeline()
+    if indexed:
+        pipe.rename(index_key, INDEX_KEY)
+        pipe.rename(docs_key, DOCS_KEY)
+    else:
+        pipe.delete(INDEX_KEY, DOCS_KEY)
+    pipe.set(READY_KEY, 1)
+    pipe.execute()
+    return indexed
+
+
+def _redis_suggestions(text: str, limit: int) -> list[dict] | None:
+    client = get_redis()
+    prefix = normalize(text).encode()
+    pipe = client.pipeline(transaction=False)
+    pipe.exists(READY_KEY)
+    # \xff no aparece en UTF-8: cierra el rango de todo lo que empieza por prefix.
+    pipe.zrangebylex(
+        INDEX_KEY,
+        b"[" + prefix,
+        b"[" + prefix + b"\xff",
+        start=0,
+        num=limit * OVERFETCH,
+    )
+    ready, found = pipe.execute()
+    if not ready:
+        return None
+    results: dict[tuple[str, int], dict] = {}
+    for member in found:
+        _, kind, pk, slug, name = member.split(SEP)
+        results.setdefault(
+            (kind, int(pk)),
+            {"kind": kind, "id": int(pk), "slug": slug, "name": name},
+        )
+    return sorted(results.values(), key=lambda row: KIND_ORDER[row["kind"]])[:limit]
+
+
+def _sql_suggestions(text: str, limit: int) -> list[dict]:
+    """Same shape as the Redis results, from ``search_listings`` and names."""
+    results = [
+        {"kind": kind, "id": pk, "slug": slug, "name": name}
+        for kind, queryset in (
+            (CATEGORY, Category.objects.filter(name__istartswith=text)),
+            (BRAND, Brand.objects.filter(name__istartswith=text)),
+        )
+        for pk, slug, name in queryset.order_by("name").values_list(
+            "pk",
+            "slug",
+            "name",
+        )[:limit]
+    ]
+    results += [
+        {
+            "kind": PRODUCT,
+            "id": listing.product_id,
+            "slug": listing.slug,
+            "name": listing.name,
+        }
+        for listing in search_listings(text, limit)
+    ]
+    return sorted(results, key=lambda row: KIND_ORDER[row["kind"]])[:limit]
+
+
+def suggest(text: str, limit: int = 10) -> list[dict]:
+    """
+    Up to ``limit`` products, brands and categories with a word starting
+    with ``text``.
+    """
+    if not normalize(text):
+        return []
+    try:
+        results = _redis_suggestions(text, limit)
+    except redis.RedisError:
+        logger.warning("Autocomplete index unavailable", exc_info=True)
+        results = None
+    return _sql_suggestions(text, limit) if results is None else results
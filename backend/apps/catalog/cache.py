@@ -0,0 +1,9 @@
+"""Response cache group of the public catalog API."""
+
+from apps.utils.response_cache import bump_on_commit
+
+CATALOG = "catalog"
+
+
+def invalidate_catalog_responses() -> None:
+    bump_on_commit(CATALOG)
@@ -0,0 +1,163 @@
+"""
+Precomputed facet counts for catalog browsing.
+
+``CategoryFacet`` holds, per category subtree and for the whole catalog, how many
+listing rows have each brand, price band and stock flag. Writes to
+``ProductListing`` push +1/-1 deltas through :func:`apply_deltas`; the
+periodic :func:`rebuild_facets` recomputes everything from scratch to
+correct any drift. Reading the counts is a single indexed query.
+"""
+
+from collections import Counter
+from collections.abc import Iterable
+from collections.abc import Mapping
+from decimal import Decimal
+
+from django.db import connection
+from django.db import transaction
+
+from .cache import invalidate_catalog_responses
+from .models import CategoryFacet
+from .models import ProductListing
+from .tree import path_ids
+
+Facet = CategoryFacet.Facet
+
+# Límites superiores de cada banda de precio; la última banda es abierta.
+PRICE_BAND_LIMITS = (25, 50, 100, 200)
+
+FACET_ROW_FIELDS = (
+    "category_id",
+    "tree_path",
+    "brand_id",
+    "brand_name",
+    "price",
+    "in_stock",
+)
+
+
+def price_band(price: Decimal) -> str:
+    lower = 0
+    for upper in PRICE_BAND_LIMITS:
+        if price < upper:
+            return f"{lower}-{upper}"
+        lower = upper
+    return f"{lower}+"
+
+
+def price_band_range(band: str) -> tuple[int, int | None]:
+    """Inverse of :func:`price_band`: ``"25-50"`` -> ``(25, 50)``."""
+    if band.endswith("+"):
+        return int(band[:-1]), None
+    lower, upper = band.split("-")
+    return int(lower), int(upper)
+
+
+def facet_values(row: Mapping) -> list[tuple[str, str, str]]:
+    """``(facet, value, label)`` triples a listing row contributes to."""
+    values = [
+        (Facet.PRICE_BAND, price_band(row["price"]), ""),
+        (Facet.IN_STOCK, "true" if row["in_stock"] else "false", ""),
+    ]
+    if row["brand_id"]:
+        values.append((Facet.BRAND, str(row["brand_id"]), row["brand_name"]))
+    return values
+
+
+def facet_categories(row: Mapping) -> list[int | None]:
+    """
+    Categories whose counts include ``row``: its category and every ancestor,
+    plus ``None`` for the whole catalog.
+    """
+    return [*(path_ids(row["tree_path"]) or [row["category_id"]]), None]
+
+
+def listing_row(listing: ProductListing) -> dict:
+    return {field: getattr(listing, field) for field in FACET_ROW_FIELDS}
+
+
+def count_rows(rows: Iterable[Mapping], sign: int = 1, counts=None, labels=None):
+    counts = Counter() if counts is None else counts
+    labels = {} if labels is None else labels
+    for row in rows:
+        for facet, value, label in facet_values(row):
+            for category_id in facet_categories(row):
+                key = (category_id, facet, value)
+                counts[key] += sign
+                if label and sign > 0:
+                    labels[key] = label
+    return counts, labels
+
+
+def apply_deltas(removed: Iterable[Mapping], added: Iterable[Mapping]) -> None:
+    """Move the counts of ``removed`` rows to ``added`` rows in one statement."""
+    counts, labels = count_rows(removed, sign=-1)
+    count_rows(added, counts=counts, labels=labels)
+    # Orden fijo de claves para que escrituras concurrentes no se bloqueen mutuamente.
+    keys = sorted(
+        (key for key, delta in counts.items() if delta),
+        key=lambda key: (key[0] is None, key[0] or 0, key[1], key[2]),
+    )
+    if not keys:
+        return
+    rows = [(*key, labels.get(key, ""), counts[key]) for key in keys]
+    table = CategoryFacet._meta.db_table  # noqa: SLF001
+    placeholders = ", ".join(["(%s, %s, %s, %s, %s)"] * len(rows))
+    sql = (
+        f"INSERT INTO {table} (category_id, facet, value, label, count) "  # noqa: S608
+        f"VALUES {placeholders} "
+        "ON CONFLICT ON CONSTRAINT catalog_facet_unique DO UPDATE SET "
+        f"count = {table}.count + EXCLUDED.count, "
+        f"label = COALESCE(NULLIF(EXCLUDED.label, ''), {table}.label)"
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [param for row in rows for param in row])
+
+
+def rebuild_facets(chunk_size: int = 5000) -> int:
+    """Recompute every facet count from ``ProductListing``."""
+    rows = ProductListing.objects.values(*FACET_ROW_FIELDS).order_by()
+    # El cursor de servidor, dentro de una transacción (ver apps.utils.db_pool).
+    with transaction.atomic():
+        counts, labels = count_rows(rows.iterator(chunk_size=chunk_size))
+    facets = [
+        CategoryFacet(
+            category_id=category_id,
+            facet=facet,
+            value=value,
+            label=labels.get((category_id, facet, value), ""),
+            count=count,
+        )
+        for (category_id, facet, value), count in counts.items()
+        if count
+    ]
+    with transaction.atomic():
+        CategoryFacet.objects.all().delete()
+        CategoryFacet.objects.bulk_create(facets, batch_size=chunk_size)
+    invalidate_catalog_responses()
+    return len(facets)
+
+
+def facet_rows(category_id: int | None):
+    return (
+        CategoryFacet.objects.filter(category_id=category_id, count__gt=0)
+        .order_by("facet", "-count", "value")
+        .values_list("facet", "value", "label", "count")
+    )
+
+
+def group_facets(rows: Iterable[tuple]) -> dict[str, list[dict]]:
+    facets: dict[str, list[dict]] = {facet: [] for facet in Facet.values}
+    for facet, value, label, count in rows:
+        facets[facet].append({"value": value, "label": label, "count": count})
+    return facets
+
+
+def facet_counts(category_id: int | None = None) -> dict[str, list[dict]]:
+    """Non-zero counts for ``category_id`` grouped by facet."""
+    return group_facets(facet_rows(category_id))
+
+
+async def afacet_counts(category_id: int | None = None) -> dict[str, list[dict]]:
+    """Async twin of :func:`facet_counts`."""
+    return group_facets([row async for row in facet_rows(category_id)])
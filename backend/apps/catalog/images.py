@@ -0,0 +1,132 @@
+"""
+Responsive variants of product images.
+
+Originals are stored under their content hash, ``products/<sha256>.<ext>``,
+so an image uploaded twice is stored once. :func:`generate_variants` then
+writes every width in ``IMAGE_VARIANT_WIDTHS`` in every format in
+``IMAGE_VARIANT_FORMATS`` to ``products/variants/<sha256>/``, never wider
+than the original and without EXIF, ICC or any other metadata. A variant
+that is already in storage is not generated again, so reprocessing is
+idempotent and identical uploads share their variants too.
+
+Every name depends only on the content, so nginx can serve them with a long
+``Cache-Control``.
+"""
+
+import hashlib
+from io import BytesIO
+from pathlib import PurePosixPath
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import Storage
+from django.db.models.fields.files import FieldFile
+from PIL import Image
+from PIL import ImageOps
+
+ORIGINALS_DIR = "products"
+VARIANTS_DIR = "products/variants"
+EXTENSIONS = {"jpeg": "jpg", "webp": "webp"}
+
+
+def content_hash(file) -> str:
+    digest = hashlib.sha256()
+    for chunk in file.chunks():
+        digest.update(chunk)
+    return digest.hexdigest()
+
+
+def store_original(image: FieldFile) -> str:
+    """
+    Save a pending upload of ``image`` under its content hash, reusing the
+    stored file when the same content was uploaded before. Returns the hash.
+    """
+    digest = content_hash(image.file)
+    suffix = PurePosixPath(image.name).suffix.lower()
+    name = f"{ORIGINALS_DIR}/{digest}{suffix}"
+    if not image.storage.exists(name):
+        name = image.storage.save(name, image.file)
+    image.name = name
+    # Ya está en el storage: que FileField.pre_save no lo vuelva a guardar.
+    image._committed = True  # noqa: SLF001
+    return digest
+
+
+def variant_widths(width: int) -> list[int]:
+    """Configured widths, capped at the original width: nothing is upscaled."""
+    return sorted({min(target, width) for target in settings.IMAGE_VARIANT_WIDTHS})
+
+
+def variant_name(digest: str, width: int, image_format: str) -> str:
+    return f"{VARIANTS_DIR}/{digest}/{width}.{EXTENSIONS[image_format]}"
+
+
+def _open(storage: Storage, name: str) -> Image.Image:
+    with storage.open(name) as file, Image.open(file) as original:
+        # Aplica la orientación EXIF antes de descartar los metadatos.
+        image = ImageOps.exif_transpose(original)
+        has_alpha = "A" in image.getbands() or "transparency" in image.info
+        return image.convert("RGBA" if has_alpha else "RGB")
+
+
+def _encode(image: Image.Image, width: int, image_format: str) -> ContentFile:
+    height = max(1, round(image.height * width / image.width))
+    resized = image.resize((width, height), Image.Resampling.LANCZOS)
+    if image_format == "jpeg" and resized.mode == "RGBA":
+        background = Image.new("RGB", resized.size, "white")
+        background.paste(resized, mask=resized.getchannel("A"))
+        resized = background
+    buffer = BytesIO()
+    # Sin exif= ni icc_profile=: Pillow no escribe ningún metadato.
+    resized.save(
+        buffer,
+        format=image_format.upper(),
+        quality=settings.IMAGE_VARIANT_QUALITY,
+        optimize=True,
+        **({"progressive": True} if image_format == "jpeg" else {}),
+    )
+    return ContentFile(buffer.getvalue())
+
+
+def generate_variants(
+    storage: Storage,
+    name: str,
+    digest: str,
+) -> tuple[int, int, list[dict]]:
+    """
+    Write the missing variants of the original stored at ``name``.
+
+    Returns the original ``(width, height)`` and one
+    ``{"format", "width", "url"}`` entry per variant, smallest first.
+    """
+    image = _open(storage, name)
+    variants = []
+    for width in variant_widths(image.width):
+        for image_format in settings.IMAGE_VARIANT_FORMATS:
+            target = variant_name(digest, width, image_format)
+            if not storage.exists(target):
+                target = storage.save(target, _encode(image, width, image_format))
+            variants.append(
+                {"format": image_format, "width": width, "url": storage.url(target)},
+            )
+    return image.width, image.height, variants
+
+
+def srcset(variants: list[dict], image_format: str) -> str:
+    """``srcset`` attribute for the variants in ``image_format``."""
+    return ", ".join(
+        f"{variant['url']} {variant['width']}w"
+        for variant in variants
+        if variant["format"] == image_format
+    )
+
+
+def src(variants: list[dict], width: int, image_format: str = "jpeg") -> str:
+    """URL of the smallest variant at least ``width`` wide, else the largest."""
+    candidates = [v for v in variants if v["format"] == image_format]
+    if not candidates:
+        return ""
+    wide_enough = [v for v in candidates if v["width"] >= width]
+    if wide_enough:
+        return min(wide_enough, key=lambda v: v["width"])["url"]
+    return max(candidates, key=lambda v: v["width"])["url"]
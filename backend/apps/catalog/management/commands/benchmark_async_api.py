@@ -0,0 +1,69 @@
+import asyncio
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+
+from apps.catalog.models import Product
+from apps.users.tokens import ClaimsAccessToken
+from apps.utils.benchmark import http_load
+from apps.utils.benchmark import summarize
+
+
+class Command(BaseCommand):
+    help = (
+        "Load a running ASGI server with the sync DRF endpoints and their async "
+        "twins (same server, same worker count) and report requests per second "
+        "and p50/p99 latency of each."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--url", default="http://localhost:5000")
+        parser.add_argument("--requests", type=int, default=2000)
+        parser.add_argument("--concurrency", type=int, default=32)
+        parser.add_argument(
+            "--email",
+            help="User for the current-user endpoints; the first superuser by default.",
+        )
+
+    def handle(self, *args, **options):
+        users = get_user_model().objects.filter(is_active=True)
+        if options["email"]:
+            user = users.filter(email=options["email"]).first()
+        else:
+            user = users.filter(is_superuser=True).order_by("pk").first()
+        product = Product.objects.filter(is_active=True).order_by("pk").first()
+        if user is None or product is None:
+            msg = "Needs an active user and an active product."
+            raise CommandError(msg)
+        auth = {"Authorization": f"Bearer {ClaimsAccessToken.for_user(user)}"}
+
+        cases = [
+            ("product list", "/api/products/", "/api/async/products/", None),
+            (
+                "product detail",
+                f"/api/products/{product.slug}/",
+                f"/api/async/products/{product.slug}/",
+                None,
+            ),
+            ("current user", "/api/auth/users/me/", "/api/async/users/me/", auth),
+        ]
+        for label, sync_path, async_path, headers in cases:
+            for kind, path in (("sync", sync_path), ("async", async_path)):
+                url = f"{options['url']}{path}"
+                # Calienta cachés y conexiones antes de medir.
+                asyncio.run(http_load(url, options["concurrency"], 4, headers))
+                timings, elapsed, errors = asyncio.run(
+                    http_load(
+                        url,
+                        options["requests"],
+                        options["concurrency"],
+                        headers,
+                    ),
+                )
+                stats = summarize(timings)
+                self.stdout.write(
+                    f"{label} ({kind}): {len(timings) / elapsed:.0f} req/s, "
+                    f"p50={stats['p50_ms']:.2f}ms p99={stats['p99_ms']:.2f}ms, "
+                    f"errors={errors}",
+                )
@@ -0,0 +1,157 @@
+import random
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from apps.catalog.api.views import AutocompleteViewSet
+from apps.catalog.api.views import ProductViewSet
+from apps.catalog.autocomplete import rebuild as rebuild_autocomplete
+from apps.catalog.models import Brand
+from apps.catalog.models import Category
+from apps.catalog.models import Product
+from apps.catalog.models import ProductImage
+from apps.catalog.services import refresh_listings
+from apps.catalog.tree import rebuild_paths
+from apps.utils.benchmark import format_summary
+from apps.utils.benchmark import measure
+from apps.utils.benchmark import request_factory
+
+BENCH_PREFIX = "bench-"
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed a synthetic catalog and report query count and p50/p95/p99 latency "
+        "of the product list and autocomplete endpoints."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--products", type=int, default=100_000)
+        parser.add_argument("--runs", type=int, default=200)
+        parser.add_argument("--depth", type=int, default=500, help="Page to benchmark.")
+        parser.add_argument(
+            "--flush",
+            action="store_true",
+            help="Delete the synthetic catalog and exit.",
+        )
+
+    def handle(self, *args, **options):
+        if options["flush"]:
+            self.flush()
+            return
+        self.seed(options["products"])
+
+        view = ProductViewSet.as_view({"get": "list"})
+        factory = request_factory()
+
+        def get(url):
+            response = view(factory.get(url))
+            response.render()
+            return response
+
+        categories = Category.objects.filter(slug__startswith=BENCH_PREFIX)
+        category = categories.filter(parent__isnull=False).first()
+        root = categories.filter(parent__isnull=True).first()
+        deep_url = self.walk(get, "/api/products/", options["depth"])
+
+        cases = {
+            "first page": "/api/products/",
+            f"page {options['depth']} (cursor)": deep_url,
+            "category filter": f"/api/products/?category={category.pk}",
+            "category subtree": f"/api/products/?category={root.pk}",
+            "in stock, price band": (
+                "/api/products/?in_stock=true&min_price=10&max_price=50"
+            ),
+        }
+        for label, url in cases.items():
+            timings, queries = measure(lambda url=url: get(url), options["runs"])
+            self.stdout.write(format_summary(label, timings, queries))
+
+        rebuild_autocomplete()
+        suggest = AutocompleteViewSet.as_view({"get": "list"})
+        for prefix in ("p", "product 12"):
+            timings, queries = measure(
+                lambda prefix=prefix: suggest(
+                    factory.get("/api/autocomplete/", {"q": prefix}),
+                ).render(),
+                options["runs"],
+            )
+            self.stdout.write(
+                format_summary(f"autocomplete {prefix!r}", timings, queries),
+            )
+
+    def walk(self, get, url, depth):
+        for _ in range(depth - 1):
+            next_url = get(url).data["next"]
+            if next_url is None:
+                break
+            url = next_url
+        return url
+
+    def seed(self, total):
+        existing = Product.objects.filter(slug__startswith=BENCH_PREFIX).count()
+        if existing >= total:
+            self.stdout.write(f"Reusing {existing} synthetic products.")
+            return
+
+        rng = random.Random(42)  # noqa: S311
+        brands = list(Brand.objects.filter(slug__startswith=BENCH_PREFIX))
+        leaves = list(
+            Category.objects.filter(
+                slug__startswith=BENCH_PREFIX,
+                parent__isnull=False,
+            ),
+        )
+        if not brands or not leaves:
+            with transaction.atomic():
+                brands = Brand.objects.bulk_create(
+                    Brand(name=f"Brand {i}", slug=f"{BENCH_PREFIX}brand-{i}")
+                    for i in range(50)
+                )
+                roots = Category.objects.bulk_create(
+                    Category(name=f"Root {i}", slug=f"{BENCH_PREFIX}root-{i}")
+                    for i in range(10)
+                )
+                leaves = Category.objects.bulk_create(
+                    Category(
+                        name=f"Leaf {i}",
+                        slug=f"{BENCH_PREFIX}leaf-{i}",
+                        parent=root,
+                    )
+                    for i, root in enumerate(roots * 5)
+                )
+                # bulk_create no pasa por Category.save.
+                rebuild_paths()
+
+        batch_size = 5000
+        for start in range(existing, total, batch_size):
+            with transaction.atomic():
+                products = Product.objects.bulk_create(
+                    Product(
+                        name=f"Product {i}",
+                        slug=f"{BENCH_PREFIX}product-{i}",
+                        category=rng.choice(leaves),
+                        brand=rng.choice(brands),
+                        price=Decimal(rng.randint(100, 20000)) / 100,
+                        stock=rng.choice([0, 5, 20, 100]),
+                    )
+                    for i in range(start, min(start + batch_size, total))
+                )
+                ProductImage.objects.bulk_create(
+                    ProductImage(
+                        product=product,
+                        image=f"products/{product.slug}.jpg",
+                        is_primary=True,
+                    )
+                    for product in products
+                )
+                refresh_listings(product.pk for product in products)
+            self.stdout.write(f"Seeded {min(start + batch_size, total)}/{total}")
+
+    def flush(self):
+        products = Product.objects.filter(slug__startswith=BENCH_PREFIX)
+        deleted, _ = products.delete()
+        Category.objects.filter(slug__startswith=BENCH_PREFIX).delete()
+        Brand.objects.filter(slug__startswith=BENCH_PREFIX).delete()
+        self.stdout.write(f"Deleted {deleted} synthetic rows.")
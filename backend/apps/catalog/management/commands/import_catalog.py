@@ -0,0 +1,84 @@
+from pathlib import Path
+
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+
+from apps.catalog.imports import run_import
+from apps.catalog.models import CatalogImport
+from apps.catalog.tasks import import_catalog_task
+
+FORMATS = {
+    ".csv": CatalogImport.Format.CSV,
+    ".jsonl": CatalogImport.Format.JSONL,
+    ".ndjson": CatalogImport.Format.JSONL,
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Import products from a CSV or JSONL file with columns slug, name, "
+        "description, price, stock, category, brand and is_active. Categories and "
+        "brands are given by slug; rows are upserted by product slug."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", nargs="?", help="CSV or JSONL file to import.")
+        parser.add_argument("--format", choices=CatalogImport.Format.values)
+        parser.add_argument("--chunk-size", type=int, default=5000)
+        parser.add_argument(
+            "--resume",
+            type=int,
+            metavar="IMPORT_ID",
+            help="Continue a failed import where it stopped.",
+        )
+        parser.add_argument(
+            "--async",
+            action="store_true",
+            dest="in_background",
+            help="Queue the import in Celery instead of running it here.",
+        )
+
+    def handle(self, *args, **options):
+        if options["resume"]:
+            job = CatalogImport.objects.filter(pk=options["resume"]).first()
+            if job is None or job.status == CatalogImport.Status.DONE:
+                msg = f"There is no unfinished import {options['resume']}."
+                raise CommandError(msg)
+        elif options["path"]:
+            job = self.create_job(Path(options["path"]), options["format"])
+        else:
+            msg = "Give a file to import or --resume IMPORT_ID."
+            raise CommandError(msg)
+
+        if options["in_background"]:
+            import_catalog_task.delay(job.pk, options["chunk_size"])
+            self.stdout.write(f"Queued import {job.pk}.")
+            return
+        self.stdout.write(f"Import {job.pk}: starting at row {job.rows_read + 1}.")
+        run_import(job, options["chunk_size"], progress=self.report)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Import {job.pk}: {job.rows_written} products written, "
+                f"{job.error_count} rows rejected.",
+            ),
+        )
+        for error in job.errors[:20]:
+            self.stdout.write(f"  row {error['row']}: {error['errors']}")
+
+    def create_job(self, path: Path, file_format: str | None) -> CatalogImport:
+        file_format = file_format or FORMATS.get(path.suffix.lower())
+        if file_format is None:
+            msg = f"Cannot tell the format of {path.name}; use --format."
+            raise CommandError(msg)
+        # Se copia al storage para que un worker o --resume lo vuelvan a leer.
+        with path.open("rb") as file:
+            source = default_storage.save(f"imports/{path.name}", File(file))
+        return CatalogImport.objects.create(source=source, format=file_format)
+
+    def report(self, job: CatalogImport, rows_per_second: float):
+        self.stdout.write(
+            f"  {job.rows_read} rows read, {job.error_count} rejected, "
+            f"{rows_per_second:,.0f} rows/s",
+        )
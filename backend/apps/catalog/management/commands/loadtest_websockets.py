@@ -0,0 +1,110 @@
+import asyncio
+import json
+import time
+
+import websockets
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+
+from apps.users.tokens import ClaimsAccessToken
+from apps.utils.benchmark import summarize
+from apps.utils.broadcast import group_send
+
+# Grupos públicos (ver config.websocket): uno recibe, el otro nunca.
+ACTIVE_GROUP = "stock.0"
+IDLE_GROUP = "stock.1"
+
+
+class Command(BaseCommand):
+    help = (
+        "Open thousands of idle and active WebSocket connections against a "
+        "running server, broadcast to the active ones through Redis and report "
+        "delivery and p50/p95/p99 fan-out latency."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--url", default="ws://localhost:5000/ws/")
+        parser.add_argument(
+            "--email",
+            help="User the sockets authenticate as; the first superuser by default.",
+        )
+        parser.add_argument("--idle", type=int, default=2000)
+        parser.add_argument("--active", type=int, default=500)
+        parser.add_argument("--messages", type=int, default=100)
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=0.02,
+            help="Seconds between broadcasts.",
+        )
+
+    def handle(self, *args, **options):
+        users = get_user_model().objects.filter(is_active=True)
+        if options["email"]:
+            user = users.filter(email=options["email"]).first()
+        else:
+            user = users.filter(is_superuser=True).order_by("pk").first()
+        if user is None:
+            msg = "No active user to authenticate the sockets as."
+            raise CommandError(msg)
+        options["url"] = f"{options['url']}?token={ClaimsAccessToken.for_user(user)}"
+        asyncio.run(self.run(**options))
+
+    async def run(self, url, idle, active, messages, interval, **options):
+        start = time.perf_counter()
+        sockets = await asyncio.gather(
+            *(self.open(url, IDLE_GROUP) for _ in range(idle)),
+            *(self.open(url, ACTIVE_GROUP) for _ in range(active)),
+        )
+        idle_sockets, active_sockets = sockets[:idle], sockets[idle:]
+        self.stdout.write(
+            f"{len(sockets)} sockets connected and subscribed in "
+            f"{time.perf_counter() - start:.2f}s",
+        )
+
+        latencies: list[float] = []
+        receivers = [
+            asyncio.create_task(self.receive(socket, messages, latencies))
+            for socket in active_sockets
+        ]
+        for sequence in range(messages):
+            # Publicar es síncrono: un solo PUBLISH a Redis.
+            group_send(
+                (ACTIVE_GROUP, {"type": "load", "seq": sequence, "sent": time.time()}),
+            )
+            await asyncio.sleep(interval)
+        await asyncio.wait(receivers, timeout=5)
+
+        expected = messages * active
+        stats = summarize(latencies)
+        self.stdout.write(
+            f"delivered {len(latencies)}/{expected} messages, fan-out latency "
+            f"p50={stats['p50_ms']:.2f}ms p95={stats['p95_ms']:.2f}ms "
+            f"p99={stats['p99_ms']:.2f}ms max={stats['max_ms']:.2f}ms",
+        )
+        alive = sum(socket.state is websockets.State.OPEN for socket in idle_sockets)
+        self.stdout.write(f"idle sockets still open: {alive}/{idle}")
+        await asyncio.gather(
+            *(socket.close() for socket in sockets),
+            return_exceptions=True,
+        )
+
+    async def open(self, url, group):
+        socket = await websockets.connect(url, open_timeout=30, ping_interval=None)
+        await socket.send(json.dumps({"action": "subscribe", "group": group}))
+        reply = json.loads(await socket.recv())
+        if reply["type"] != "subscribed":
+            msg = f"Could not subscribe to {group}: {reply}"
+            raise RuntimeError(msg)
+        return socket
+
+    async def receive(self, socket, messages, latencies):
+        received = 0
+        while received < messages:
+            message = json.loads(await socket.recv())
+            if message["type"] == "ping":
+                await socket.send("pong")
+                continue
+            latencies.append(time.time() - message["sent"])
+            received += 1
@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from apps.catalog.models import ProductImage
+from apps.catalog.tasks import generate_image_variants_task
+
+
+class Command(BaseCommand):
+    help = (
+        "Queue variant generation for product images that have none yet, or for "
+        "every image with --all. Variants already in storage are reused."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--all",
+            action="store_true",
+            help="Reprocess images that already have variants.",
+        )
+
+    def handle(self, *args, **options):
+        images = ProductImage.objects.exclude(image="")
+        if not options["all"]:
+            images = images.filter(variants=[])
+        queued = 0
+        # Una sola tarea por contenido: process_image actualiza los duplicados.
+        seen = set()
+        # El cursor de servidor, dentro de una transacción (ver apps.utils.db_pool).
+        with transaction.atomic():
+            for pk, digest in images.values_list("pk", "content_hash").iterator():
+                if digest and digest in seen:
+                    continue
+                seen.add(digest)
+                generate_image_variants_task.delay(pk)
+                queued += 1
+        self.stdout.write(self.style.SUCCESS(f"Queued {queued} images."))
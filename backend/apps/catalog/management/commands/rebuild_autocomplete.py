@@ -0,0 +1,21 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.catalog.autocomplete import rebuild
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild the Redis autocomplete index of products, brands and "
+        "categories and swap it in."
+    )
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        indexed = rebuild()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Indexed {indexed} names in {time.perf_counter() - start:.2f}s.",
+            ),
+        )
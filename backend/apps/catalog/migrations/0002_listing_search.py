@@ -0,0 +1,49 @@
+# Generated by Django 5.1.8 on 2026-10-18 08:37
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.contrib.postgres.operations import TrigramExtension
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations
+from django.db.models import Value
+from django.db.models.functions import Replace
+
+
+def populate_search_vectors(apps, schema_editor):
+    ProductListing = apps.get_model('catalog', 'ProductListing')
+    ProductListing.objects.update(
+        search_vector=(
+            SearchVector('name', weight='A', config='spanish')
+            + SearchVector('brand_name', weight='B', config='spanish')
+            + SearchVector(
+                Replace(Replace('category_path', Value('/'), Value(' ')), Value('-'), Value(' ')),
+                weight='C',
+                config='spanish',
+            )
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0001_initial'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddField(
+            model_name='productlisting',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='productlisting',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='catalog_listing_search_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='productlisting',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['name'], name='catalog_listing_name_trgm_idx', opclasses=['gin_trgm_ops']),
+        ),
+        migrations.RunPython(populate_search_vectors, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.1.8 on 2026-10-18 08:40
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0002_listing_search'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CategoryFacet',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('facet', models.CharField(choices=[('brand', 'Brand'), ('price_band', 'Price band'), ('in_stock', 'In stock')], max_length=20)),
+                ('value', models.CharField(max_length=64)),
+                ('label', models.CharField(blank=True, max_length=255)),
+                ('count', models.IntegerField(default=0)),
+                ('category', models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='catalog.category')),
+            ],
+            options={
+                'verbose_name': 'Category facet',
+                'verbose_name_plural': 'Category facets',
+                'constraints': [models.UniqueConstraint(fields=('category', 'facet', 'value'), name='catalog_facet_unique', nulls_distinct=False)],
+            },
+        ),
+    ]
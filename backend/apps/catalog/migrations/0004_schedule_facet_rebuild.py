@@ -0,0 +1,36 @@
+from django.db import migrations
+
+TASK_NAME = 'Rebuild catalog facet counts'
+
+
+def create_periodic_task(apps, schema_editor):
+    CrontabSchedule = apps.get_model('django_celery_beat', 'CrontabSchedule')
+    PeriodicTask = apps.get_model('django_celery_beat', 'PeriodicTask')
+    schedule, _ = CrontabSchedule.objects.get_or_create(
+        minute='15',
+        hour='*',
+        day_of_week='*',
+        day_of_month='*',
+        month_of_year='*',
+    )
+    PeriodicTask.objects.update_or_create(
+        name=TASK_NAME,
+        defaults={'task': 'apps.catalog.tasks.rebuild_facets_task', 'crontab': schedule},
+    )
+
+
+def delete_periodic_task(apps, schema_editor):
+    PeriodicTask = apps.get_model('django_celery_beat', 'PeriodicTask')
+    PeriodicTask.objects.filter(name=TASK_NAME).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0003_category_facets'),
+        ('django_celery_beat', '0019_alter_periodictasks_options'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_periodic_task, delete_periodic_task),
+    ]
@@ -0,0 +1,58 @@
+# Generated by Django 5.1.8 on 2026-10-18 08:42
+
+from django.db import migrations, models
+from django.db.models import OuterRef
+from django.db.models import Subquery
+
+
+def populate_paths(apps, schema_editor):
+    Category = apps.get_model('catalog', 'Category')
+    ProductListing = apps.get_model('catalog', 'ProductListing')
+    parent_paths = {None: ''}
+    level = list(Category.objects.filter(parent__isnull=True))
+    while level:
+        for category in level:
+            category.path = f'{parent_paths[category.parent_id]}{category.pk}/'
+            category.depth = category.path.count('/') - 1
+            parent_paths[category.pk] = category.path
+        Category.objects.bulk_update(level, ['path', 'depth'], batch_size=1000)
+        level = list(Category.objects.filter(parent_id__in=[c.pk for c in level]))
+    ProductListing.objects.update(
+        tree_path=Subquery(
+            Category.objects.filter(pk=OuterRef('category_id')).values('path')[:1],
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0004_schedule_facet_rebuild'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='category',
+            name='depth',
+            field=models.PositiveSmallIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='category',
+            name='path',
+            field=models.CharField(default='', editable=False, max_length=255),
+        ),
+        migrations.AddField(
+            model_name='productlisting',
+            name='tree_path',
+            field=models.CharField(default='', max_length=255),
+        ),
+        migrations.AddIndex(
+            model_name='category',
+            index=models.Index(fields=['path'], name='catalog_category_path_idx', opclasses=['varchar_pattern_ops']),
+        ),
+        migrations.AddIndex(
+            model_name='productlisting',
+            index=models.Index(fields=['tree_path'], name='catalog_listing_tree_idx', opclasses=['varchar_pattern_ops']),
+        ),
+        migrations.RunPython(populate_paths, migrations.RunPython.noop),
+    ]
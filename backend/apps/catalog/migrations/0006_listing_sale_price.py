@@ -0,0 +1,18 @@
+# Generated by Django 5.1.8 on 2026-10-18 08:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0005_category_tree'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='productlisting',
+            name='sale_price',
+            field=models.DecimalField(decimal_places=2, max_digits=10, null=True),
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.1.8 on 2026-10-18 09:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0006_listing_sale_price'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='productimage',
+            name='content_hash',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=64, verbose_name='content hash'),
+        ),
+        migrations.AddField(
+            model_name='productimage',
+            name='height',
+            field=models.PositiveIntegerField(editable=False, null=True, verbose_name='height'),
+        ),
+        migrations.AddField(
+            model_name='productimage',
+            name='variants',
+            field=models.JSONField(default=list, editable=False, verbose_name='variants'),
+        ),
+        migrations.AddField(
+            model_name='productimage',
+            name='width',
+            field=models.PositiveIntegerField(editable=False, null=True, verbose_name='width'),
+        ),
+        migrations.AddField(
+            model_name='productlisting',
+            name='image_srcset',
+            field=models.TextField(blank=True),
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.1.8 on 2026-10-18 09:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0007_image_variants'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CatalogImport',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('source', models.CharField(max_length=255, verbose_name='source')),
+                ('format', models.CharField(choices=[('csv', 'CSV'), ('jsonl', 'JSON Lines')], max_length=5, verbose_name='format')),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('running', 'Running'), ('failed', 'Failed'), ('done', 'Done')], default='pending', max_length=7, verbose_name='status')),
+                ('rows_read', models.PositiveIntegerField(default=0, verbose_name='rows read')),
+                ('rows_staged', models.PositiveIntegerField(default=0, verbose_name='rows staged')),
+                ('rows_written', models.PositiveIntegerField(default=0, verbose_name='rows written')),
+                ('errors', models.JSONField(blank=True, default=list, verbose_name='errors')),
+                ('error_count', models.PositiveIntegerField(default=0, verbose_name='error count')),
+                ('failure', models.TextField(blank=True, verbose_name='failure')),
+                ('finished_at', models.DateTimeField(blank=True, null=True, verbose_name='finished at')),
+            ],
+            options={
+                'verbose_name': 'Catalog import',
+                'verbose_name_plural': 'Catalog imports',
+                'ordering': ['-created_at', '-id'],
+                'abstract': False,
+                'indexes': [models.Index(fields=['created_at', 'id'], name='catalog_catalogimport_keyset')],
+            },
+        ),
+    ]
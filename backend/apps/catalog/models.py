@@ -0,0 +1,335 @@
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
+from django.core.exceptions import ValidationError
+from django.db import models
+from django.db import transaction
+from django.db.models import F
+from django.db.models import Value
+from django.db.models.functions import Concat
+from django.db.models.functions import Substr
+from django.utils.translation import gettext_lazy as _
+
+from apps.abstract.models import AuditDates
+
+from .images import store_original
+
+
+class Category(AuditDates):
+    """
+    Nodo del árbol de categorías guardado como ruta materializada.
+
+    ``path`` contiene los ids desde la raíz, p. ej. ``"3/12/40/"``, de modo que
+    el subárbol es un ``LIKE 'ruta%'`` indexado y los ancestros salen de la
+    propia ruta. Ver ``apps.catalog.tree``.
+    """
+
+    name = models.CharField(_("name"), max_length=255)
+    slug = models.SlugField(_("slug"), max_length=255, unique=True)
+    parent = models.ForeignKey(
+        "self",
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="children",
+    )
+    path = models.CharField(max_length=255, editable=False, default="")
+    depth = models.PositiveSmallIntegerField(editable=False, default=0)
+
+    class Meta(AuditDates.Meta):
+        verbose_name = _("Category")
+        verbose_name_plural = _("Categories")
+        indexes = [
+            *AuditDates.Meta.indexes,
+            models.Index(
+                fields=["path"],
+                name="catalog_category_path_idx",
+                opclasses=["varchar_pattern_ops"],
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return self.name
+
+    def clean(self):
+        super().clean()
+        if self.pk and self.parent_id and self.is_ancestor_of(self.parent):
+            raise ValidationError(
+                {"parent": _("A category cannot be moved below itself.")},
+            )
+
+    def is_ancestor_of(self, other: "Category") -> bool:
+        return bool(self.path) and other.path.startswith(self.path)
+
+    def save(self, *args, **kwargs):
+        with transaction.atomic():
+            previous = None
+            if not self._state.adding:
+                previous = Category.objects.filter(pk=self.pk).values("path").first()
+            parent_path = self.parent.path if self.parent_id else ""
+            if (
+                previous
+                and previous["path"]
+                and parent_path.startswith(previous["path"])
+            ):
+                msg = "A category cannot be moved below itself."
+                raise ValueError(msg)
+            super().save(*args, **kwargs)
+
+            path = f"{parent_path}{self.pk}/"
+            depth = path.count("/") - 1
+            if previous is None or not previous["path"]:
+                Category.objects.filter(pk=self.pk).update(path=path, depth=depth)
+            elif previous["path"] != path:
+                # Mueve todo el subárbol con un único UPDATE.
+                old_path = previous["path"]
+                Category.objects.filter(path__startswith=old_path).update(
+                    path=Concat(Value(path), Substr("path", len(old_path) + 1)),
+                    depth=F("depth") + (depth - (old_path.count("/") - 1)),
+                )
+            self.path = path
+            self.depth = depth
+
+
+class Brand(AuditDates):
+    name = models.CharField(_("name"), max_length=255)
+    slug = models.SlugField(_("slug"), max_length=255, unique=True)
+
+    class Meta(AuditDates.Meta):
+        verbose_name = _("Brand")
+        verbose_name_plural = _("Brands")
+
+    def __str__(self) -> str:
+        return self.name
+
+
+class Product(AuditDates):
+    category = models.ForeignKey(
+        Category,
+        on_delete=models.PROTECT,
+        related_name="products",
+    )
+    brand = models.ForeignKey(
+        Brand,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="products",
+    )
+    name = models.CharField(_("name"), max_length=255)
+    slug = models.SlugField(_("slug"), max_length=255, unique=True)
+    description = models.TextField(_("description"), blank=True)
+    price = models.DecimalField(_("price"), max_digits=10, decimal_places=2)
+    stock = models.PositiveIntegerField(_("stock"), default=0)
+    is_active = models.BooleanField(_("active"), default=True)
+
+    class Meta(AuditDates.Meta):
+        verbose_name = _("Product")
+        verbose_name_plural = _("Products")
+
+    def __str__(self) -> str:
+        return self.name
+
+
+class ProductImage(AuditDates):
+    """
+    Imagen de producto.
+
+    El original se guarda con el hash de su contenido como nombre y
+    ``generate_image_variants_task`` rellena ``variants`` con las versiones
+    redimensionadas (ver ``apps.catalog.images``).
+    """
+
+    product = models.ForeignKey(
+        Product,
+        on_delete=models.CASCADE,
+        related_name="images",
+    )
+    image = models.ImageField(_("image"), upload_to="products/")
+    alt_text = models.CharField(_("alt text"), max_length=255, blank=True)
+    is_primary = models.BooleanField(_("primary"), default=False)
+    position = models.PositiveSmallIntegerField(_("position"), default=0)
+    content_hash = models.CharField(
+        _("content hash"),
+        max_length=64,
+        blank=True,
+        db_index=True,
+        editable=False,
+    )
+    width = models.PositiveIntegerField(_("width"), null=True, editable=False)
+    height = models.PositiveIntegerField(_("height"), null=True, editable=False)
+    # [{"format": "webp", "width": 640, "url": "..."}, ...] de menor a mayor
+    variants = models.JSONField(_("variants"), default=list, editable=False)
+
+    class Meta(AuditDates.Meta):
+        verbose_name = _("Product image")
+        verbose_name_plural = _("Product images")
+        ordering = ["position", "id"]
+
+    def __str__(self) -> str:
+        return self.image.name
+
+    def save(self, *args, **kwargs):
+        if self.image and not self.image._committed:  # noqa: SLF001
+            self.content_hash = store_original(self.image)
+            self.width = self.height = None
+            self.variants = []
+            if kwargs.get("update_fields") is not None:
+                kwargs["update_fields"] = {
+                    *kwargs["update_fields"],
+                    "content_hash",
+                    "width",
+                    "height",
+                    "variants",
+                }
+        super().save(*args, **kwargs)
+
+
+class ProductListing(AuditDates):
+    """
+    Fila desnormalizada que alimenta los listados del catálogo.
+
+    Se reconstruye desde ``apps.catalog.services.refresh_listings`` cada vez
+    que cambia un producto, su imagen principal, su marca o su categoría, de
+    modo que una página del listado es una sola consulta indexada sin joins.
+    """
+
+    product = models.OneToOneField(
+        Product,
+        on_delete=models.CASCADE,
+        related_name="listing",
+    )
+    category = models.ForeignKey(
+        Category,
+        on_delete=models.CASCADE,
+        related_name="+",
+    )
+    brand = models.ForeignKey(
+        Brand,
+        on_delete=models.SET_NULL,
+        null=True,
+        related_name="+",
+    )
+    name = models.CharField(max_length=255)
+    slug = models.SlugField(max_length=255)
+    brand_name = models.CharField(max_length=255, blank=True)
+    category_path = models.CharField(max_length=1024)
+    # Copia de Category.path para filtrar subárboles sin join
+    tree_path = models.CharField(max_length=255, default="")
+    price = models.DecimalField(max_digits=10, decimal_places=2)
+    # Precio con la mejor promoción de rebaja vigente; nulo si no hay rebaja
+    sale_price = models.DecimalField(max_digits=10, decimal_places=2, null=True)
+    in_stock = models.BooleanField(default=False)
+    image_url = models.CharField(max_length=1024, blank=True)
+    image_srcset = models.TextField(blank=True)
+    # Mantenido por refresh_listings con la configuración "spanish"
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    class Meta(AuditDates.Meta):
+        verbose_name = _("Product listing")
+        verbose_name_plural = _("Product listings")
+        indexes = [
+            *AuditDates.Meta.indexes,
+            models.Index(
+                fields=["category", "created_at", "id"],
+                name="catalog_listing_category_idx",
+            ),
+            models.Index(
+                fields=["tree_path"],
+                name="catalog_listing_tree_idx",
+                opclasses=["varchar_pattern_ops"],
+            ),
+            GinIndex(fields=["search_vector"], name="catalog_listing_search_idx"),
+            GinIndex(
+                fields=["name"],
+                name="catalog_listing_name_trgm_idx",
+                opclasses=["gin_trgm_ops"],
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return self.name
+
+
+class CategoryFacet(models.Model):
+    """
+    Conteo precalculado de un valor de faceta dentro de una categoría.
+
+    ``category`` nulo guarda los conteos de todo el catálogo. Se mantiene con
+    deltas desde ``refresh_listings`` y se reconstruye periódicamente con
+    ``rebuild_facets_task``.
+    """
+
+    class Facet(models.TextChoices):
+        BRAND = "brand", _("Brand")
+        PRICE_BAND = "price_band", _("Price band")
+        IN_STOCK = "in_stock", _("In stock")
+
+    category = models.ForeignKey(
+        Category,
+        on_delete=models.CASCADE,
+        null=True,
+        related_name="+",
+    )
+    facet = models.CharField(max_length=20, choices=Facet.choices)
+    value = models.CharField(max_length=64)
+    label = models.CharField(max_length=255, blank=True)
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        verbose_name = _("Category facet")
+        verbose_name_plural = _("Category facets")
+        constraints = [
+            models.UniqueConstraint(
+                fields=["category", "facet", "value"],
+                name="catalog_facet_unique",
+                nulls_distinct=False,
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.facet}={self.value} ({self.count})"
+
+
+class CatalogImport(AuditDates):
+    """
+    Importación masiva de productos desde CSV o JSONL.
+
+    Las filas válidas se copian por lotes a una tabla de staging y
+    ``rows_read`` avanza con cada lote confirmado, de modo que una importación
+    fallida se reanuda donde se quedó. Ver ``apps.catalog.imports``.
+    """
+
+    class Format(models.TextChoices):
+        CSV = "csv", "CSV"
+        JSONL = "jsonl", "JSON Lines"
+
+    class Status(models.TextChoices):
+        PENDING = "pending", _("Pending")
+        RUNNING = "running", _("Running")
+        FAILED = "failed", _("Failed")
+        DONE = "done", _("Done")
+
+    # Nombre del fichero en el storage por defecto
+    source = models.CharField(_("source"), max_length=255)
+    format = models.CharField(_("format"), max_length=5, choices=Format.choices)
+    status = models.CharField(
+        _("status"),
+        max_length=7,
+        choices=Status.choices,
+        default=Status.PENDING,
+    )
+    rows_read = models.PositiveIntegerField(_("rows read"), default=0)
+    rows_staged = models.PositiveIntegerField(_("rows staged"), default=0)
+    rows_written = models.PositiveIntegerField(_("rows written"), default=0)
+    # [{"line": 12, "errors": {"price": "..."}}, ...] hasta MAX_REPORTED_ERRORS
+    errors = models.JSONField(_("errors"), default=list, blank=True)
+    error_count = models.PositiveIntegerField(_("error count"), default=0)
+    failure = models.TextField(_("failure"), blank=True)
+    finished_at = models.DateTimeField(_("finished at"), null=True, blank=True)
+
+    class Meta(AuditDates.Meta):
+        verbose_name = _("Catalog import")
+        verbose_name_plural = _("Catalog imports")
+
+    def __str__(self) -> str:
+        return f"{self.source} ({self.status})"
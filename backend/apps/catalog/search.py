@@ -0,0 +1,90 @@
+"""
+Ranked product search over ``ProductListing``.
+
+Matches run against the stored, GIN-indexed ``search_vector`` (Spanish
+stemming, prefix matching on every term) with a ``pg_trgm`` word-similarity
+fallback on the name for typos. Ranking and highlighting happen in the same
+SQL statement.
+"""
+
+import re
+
+from django.contrib.postgres.search import SearchHeadline
+from django.contrib.postgres.search import SearchQuery
+from django.contrib.postgres.search import SearchRank
+from django.contrib.postgres.search import SearchVector
+from django.contrib.postgres.search import TrigramWordSimilarity
+from django.db.models import F
+from django.db.models import Q
+from django.db.models import Value
+from django.db.models.functions import Greatest
+from django.db.models.functions import Replace
+
+from .models import ProductListing
+
+SEARCH_CONFIG = "spanish"
+SEARCH_MAX_TERMS = 8
+
+_TERM = re.compile(r"\w+")
+
+# Peso A para el nombre, B para la marca y C para la ruta de categorías.
+LISTING_SEARCH_VECTOR = (
+    SearchVector("name", weight="A", config=SEARCH_CONFIG)
+    + SearchVector("brand_name", weight="B", config=SEARCH_CONFIG)
+    + SearchVector(
+        Replace(
+            Replace("category_path", Value("/"), Value(" ")),
+            Value("-"),
+            Value(" "),
+        ),
+        weight="C",
+        config=SEARCH_CONFIG,
+    )
+)
+
+
+def update_search_vectors(listings) -> int:
+    """Recompute ``search_vector`` for the ``listings`` queryset in one UPDATE."""
+    return listings.update(search_vector=LISTING_SEARCH_VECTOR)
+
+
+def prefix_query(text: str) -> SearchQuery | None:
+    """``to_tsquery`` that AND-s every term of ``text`` as a prefix (``term:*``)."""
+    terms = _TERM.findall(text.lower())[:SEARCH_MAX_TERMS]
+    if not terms:
+        return None
+    return SearchQuery(
+        " & ".join(f"{term}:*" for term in terms),
+        search_type="raw",
+        config=SEARCH_CONFIG,
+    )
+
+
+def search_listings(text: str, limit: int):
+    """
+    Best ``limit`` listings for ``text``, annotated with ``rank`` and
+    ``headline``.
+    """
+    query = prefix_query(text)
+    if query is None:
+        return ProductListing.objects.none()
+    text = " ".join(_TERM.findall(text))
+    return (
+        ProductListing.objects.defer("search_vector")
+        .filter(Q(search_vector=query) | Q(name__trigram_word_similar=text))
+        .annotate(
+            rank=Greatest(
+                SearchRank(F("search_vector"), query),
+                TrigramWordSimilarity(text, "name") * Value(0.1),
+            ),
+            headline=SearchHeadline(
+                "name",
+                query,
+                config=SEARCH_CONFIG,
+                start_sel="<mark>",
+                stop_sel="</mark>",
+                highlight_all=True,
+            ),
+        )
+        .order_by("-rank", "-id")[:limit]
+    )
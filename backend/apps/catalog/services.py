@@ -0,0 +1,240 @@
+"""Keeps the denormalized ``ProductListing`` table in sync with the catalog."""
+
+from collections.abc import Iterable
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.db.models import Exists
+from django.db.models import OuterRef
+from django.db.models import Q
+from django.db.models import Subquery
+from django.utils import timezone
+
+from apps.pricing.engine import Item
+from apps.pricing.engine import RuleSet
+from apps.pricing.engine import load_rules
+from apps.utils.broadcast import group_send
+from apps.utils.broadcast import stock_group
+
+from . import autocomplete
+from .cache import invalidate_catalog_responses
+from .facets import FACET_ROW_FIELDS
+from .facets import apply_deltas
+from .facets import listing_row
+from .images import content_hash
+from .images import generate_variants
+from .images import src
+from .images import srcset
+from .models import Category
+from .models import Product
+from .models import ProductImage
+from .models import ProductListing
+from .search import update_search_vectors
+from .tree import path_ids
+
+LISTING_UPDATE_FIELDS = [
+    "category",
+    "brand",
+    "name",
+    "slug",
+    "brand_name",
+    "category_path",
+    "tree_path",
+    "price",
+    "sale_price",
+    "in_stock",
+    "image_url",
+    "image_srcset",
+    "updated_at",
+]
+
+
+def category_paths(category_ids: Iterable[int]) -> dict[int, tuple[str, str]]:
+    """
+    Map each of ``category_ids`` to its slug path and its materialized id
+    path, e.g. ``("suplementos/proteina", "3/12/")``.
+
+    One query for the categories and their ancestors. The paths end up in
+    the listing rows and facet counts, so they come from the table and not
+    from the cached tree, which can lag behind a move or a rename.
+    """
+    category_ids = set(category_ids)
+    rows = list(
+        Category.objects.filter(
+            Exists(
+                Category.objects.filter(
+                    pk__in=category_ids,
+                    path__startswith=OuterRef("path"),
+                ),
+            ),
+        ).values_list("pk", "slug", "path"),
+    )
+    slugs = {pk: slug for pk, slug, _ in rows}
+    return {
+        pk: ("/".join(slugs[ancestor] for ancestor in path_ids(path)), path)
+        for pk, _, path in rows
+        if pk in category_ids
+    }
+
+
+def listing_queryset():
+    primary = ProductImage.objects.filter(product=OuterRef("pk")).order_by(
+        "-is_primary",
+        "position",
+        "id",
+    )
+    return (
+        Product.objects.filter(is_active=True)
+        .select_related("brand")
+        .annotate(
+            primary_image=Subquery(primary.values("image")[:1]),
+            primary_variants=Subquery(primary.values("variants")[:1]),
+        )
+        .order_by()
+    )
+
+
+def build_listing(
+    product: Product,
+    paths: dict[int, tuple[str, str]],
+    rules: RuleSet,
+) -> ProductListing:
+    category_path, tree_path = paths[product.category_id]
+    sale_price, sale = rules.sale_price(
+        Item(product.pk, product.price, tree_path, product.brand_id),
+        timezone.now(),
+    )
+    return ProductListing(
+        product_id=product.pk,
+        category_id=product.category_id,
+        brand_id=product.brand_id,
+        name=product.name,
+        slug=product.slug,
+        brand_name=product.brand.name if product.brand else "",
+        category_path=category_path,
+        tree_path=tree_path,
+        price=product.price,
+        sale_price=sale_price if sale else None,
+        in_stock=product.stock > 0,
+        image_url=listing_image_url(product),
+        image_srcset=srcset(product.primary_variants or [], "webp"),
+    )
+
+
+def listing_image_url(product: Product) -> str:
+    """A variant sized for listing cards, or the original until there is one."""
+    if not product.primary_image:
+        return ""
+    return src(
+        product.primary_variants or [],
+        settings.IMAGE_LISTING_WIDTH,
+    ) or default_storage.url(product.primary_image)
+
+
+def refresh_listings(
+    product_ids: Iterable[int] | None = None,
+    *,
+    chunk_size: int = 2000,
+) -> int:
+    """
+    Upsert the listing rows of ``product_ids`` (every product when ``None``).
+
+    Inactive or deleted products lose their row. Facet counts follow the
+    changes. Returns the number of rows written.
+    """
+    products = listing_queryset()
+    stale = ProductListing.objects.exclude(product__is_active=True)
+    if product_ids is not None:
+        product_ids = list(product_ids)
+        products = products.filter(pk__in=product_ids)
+        stale = ProductListing.objects.filter(product_id__in=product_ids).exclude(
+            product__is_active=True,
+        )
+    with transaction.atomic():
+        removed = list(stale.values("product_id", *FACET_ROW_FIELDS))
+        stale.delete()
+        apply_deltas(removed=removed, added=[])
+    autocomplete.update(
+        autocomplete.PRODUCT,
+        removed=[row["product_id"] for row in removed],
+    )
+
+    rules = load_rules()
+    written = 0
+    # Por pk y sin cursor: cada lote escribe en su propia transacción.
+    products = products.order_by("pk")
+    last = 0
+    while batch := list(products.filter(pk__gt=last)[:chunk_size]):
+        last = batch[-1].pk
+        paths = category_paths(product.category_id for product in batch)
+        # Filas y recuentos de facetas, juntos o ninguno.
+        with transaction.atomic():
+            written += _upsert(
+                [build_listing(product, paths, rules) for product in batch],
+            )
+    if written or removed:
+        invalidate_catalog_responses()
+    return written
+
+
+def _upsert(batch: list[ProductListing]) -> int:
+    product_ids = [row.product_id for row in batch]
+    previous = list(
+        ProductListing.objects.filter(product_id__in=product_ids).values(
+            *FACET_ROW_FIELDS,
+        ),
+    )
+    ProductListing.objects.bulk_create(
+        batch,
+        update_conflicts=True,
+        unique_fields=["product"],
+        update_fields=LISTING_UPDATE_FIELDS,
+    )
+    update_search_vectors(ProductListing.objects.filter(product_id__in=product_ids))
+    apply_deltas(removed=previous, added=[listing_row(row) for row in batch])
+    autocomplete.update(
+        autocomplete.PRODUCT,
+        [(row.product_id, row.slug, row.name) for row in batch],
+    )
+    return len(batch)
+
+
+def process_image(image: ProductImage) -> int:
+    """
+    Generate the variants of ``image`` and record them on every image with
+    the same content; returns how many rows were updated.
+
+    Images stored before content hashing are hashed in place.
+    """
+    storage = image.image.storage
+    digest = image.content_hash
+    if not digest:
+        with storage.open(image.image.name) as file:
+            digest = content_hash(file)
+    width, height, variants = generate_variants(storage, image.image.name, digest)
+    images = ProductImage.objects.filter(Q(pk=image.pk) | Q(content_hash=digest))
+    product_ids = set(images.values_list("product_id", flat=True))
+    updated = images.update(
+        content_hash=digest,
+        width=width,
+        height=height,
+        variants=variants,
+        updated_at=timezone.now(),
+    )
+    refresh_listings(product_ids)
+    return updated
+
+
+def broadcast_stock(product_ids: Iterable[int]) -> None:
+    """Publish the current stock of ``product_ids`` to their WebSocket groups."""
+    rows = Product.objects.filter(pk__in=list(product_ids)).values_list("pk", "stock")
+    group_send(
+        *(
+            (
+                stock_group(pk),
+                {"type": "stock", "product": pk, "stock": stock, "in_stock": stock > 0},
+            )
+            for pk, stock in rows.order_by()
+        ),
+    )
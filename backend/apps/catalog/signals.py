@@ -0,0 +1,100 @@
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import post_delete
+from django.db.models.signals import post_save
+from django.db.models.signals import pre_delete
+from django.dispatch import receiver
+
+from . import autocomplete
+from .cache import invalidate_catalog_responses
+from .facets import FACET_ROW_FIELDS
+from .facets import apply_deltas
+from .models import Brand
+from .models import Category
+from .models import Product
+from .models import ProductImage
+from .models import ProductListing
+from .services import broadcast_stock
+from .services import refresh_listings
+from .tasks import generate_image_variants_task
+from .tasks import refresh_listings_task
+from .tree import invalidate_category_tree
+
+
+@receiver(post_save, sender=Product)
+def product_saved(sender, instance, **kwargs):
+    transaction.on_commit(partial(refresh_listings, [instance.pk]))
+    transaction.on_commit(partial(broadcast_stock, [instance.pk]))
+
+
+@receiver(pre_delete, sender=Product)
+def product_deleting(sender, instance, **kwargs):
+    # El CASCADE borra la fila del listado sin señales: guarda sus facetas.
+    instance._listing_row = (  # noqa: SLF001
+        ProductListing.objects.filter(product_id=instance.pk)
+        .values(*FACET_ROW_FIELDS)
+        .first()
+    )
+
+
+@receiver(post_delete, sender=Product)
+def product_deleted(sender, instance, **kwargs):
+    row = getattr(instance, "_listing_row", None)
+    if row is not None:
+        apply_deltas(removed=[row], added=[])
+        invalidate_catalog_responses()
+    autocomplete.update(autocomplete.PRODUCT, removed=[instance.pk])
+
+
+@receiver(post_save, sender=ProductImage)
+@receiver(post_delete, sender=ProductImage)
+def product_image_changed(sender, instance, **kwargs):
+    transaction.on_commit(partial(refresh_listings, [instance.product_id]))
+
+
+@receiver(post_save, sender=ProductImage)
+def product_image_saved(sender, instance, **kwargs):
+    # Solo las subidas nuevas: ProductImage.save() vacía variants al guardarlas.
+    if instance.content_hash and not instance.variants:
+        transaction.on_commit(
+            partial(generate_image_variants_task.delay, instance.pk),
+        )
+
+
+@receiver(post_save, sender=Category)
+def category_saved(sender, instance, created, **kwargs):
+    transaction.on_commit(invalidate_category_tree)
+    autocomplete.update(
+        autocomplete.CATEGORY,
+        [(instance.pk, instance.slug, instance.name)],
+    )
+    # Renaming or moving a category changes the path of every product below
+    # it, which can be a large set: rebuild those rows in the background.
+    if not created:
+        transaction.on_commit(
+            partial(refresh_listings_task.delay, category_id=instance.pk),
+        )
+
+
+@receiver(post_delete, sender=Category)
+def category_deleted(sender, instance, **kwargs):
+    transaction.on_commit(invalidate_category_tree)
+    autocomplete.update(autocomplete.CATEGORY, removed=[instance.pk])
+
+
+@receiver(post_save, sender=Brand)
+def brand_saved(sender, instance, created, **kwargs):
+    autocomplete.update(
+        autocomplete.BRAND,
+        [(instance.pk, instance.slug, instance.name)],
+    )
+    if not created:
+        transaction.on_commit(
+            partial(refresh_listings_task.delay, brand_id=instance.pk),
+        )
+
+
+@receiver(post_delete, sender=Brand)
+def brand_deleted(sender, instance, **kwargs):
+    autocomplete.update(autocomplete.BRAND, removed=[instance.pk])
@@ -0,0 +1,52 @@
+from celery import shared_task
+
+from .facets import rebuild_facets
+from .imports import run_import
+from .models import CatalogImport
+from .models import Category
+from .models import Product
+from .models import ProductImage
+from .services import process_image
+from .services import refresh_listings
+from .tree import subtree
+
+
+@shared_task()
+def refresh_listings_task(category_id=None, brand_id=None, product_ids=None):
+    """
+    Rebuild the listing rows of some products, a category subtree, a brand,
+    or everything.
+    """
+    if product_ids is not None:
+        return refresh_listings(product_ids)
+    if category_id is None and brand_id is None:
+        return refresh_listings()
+
+    products = Product.objects.all()
+    if category_id is not None:
+        category = Category.objects.get(pk=category_id)
+        products = products.filter(category__in=subtree(category))
+    if brand_id is not None:
+        products = products.filter(brand_id=brand_id)
+    return refresh_listings(products.values_list("pk", flat=True))
+
+
+@shared_task()
+def rebuild_facets_task():
+    """Recompute every ``CategoryFacet`` count; scheduled through celery beat."""
+    return rebuild_facets()
+
+
+@shared_task()
+def generate_image_variants_task(image_id):
+    """Resize an uploaded product image into its responsive variants."""
+    image = ProductImage.objects.filter(pk=image_id).first()
+    if image is None:
+        return 0
+    return process_image(image)
+
+
+@shared_task()
+def import_catalog_task(import_id, chunk_size=5000):
+    """Run or resume a ``CatalogImport``; progress is saved on the row."""
+    return run_import(CatalogImport.objects.get(pk=import_id), chunk_size).status
@@ -0,0 +1,109 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from apps.catalog.services import refresh_listings
+from apps.catalog.tests.factories import CategoryFactory
+from apps.catalog.tests.factories import ProductFactory
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def api_client() -> APIClient:
+    return APIClient()
+
+
+@pytest.fixture
+def catalog():
+    root = CategoryFactory()
+    child = CategoryFactory(parent=root)
+    products = [
+        *ProductFactory.create_batch(3, category=child, price="30.00"),
+        *ProductFactory.create_batch(2, category=root, price="80.00"),
+    ]
+    refresh_listings()
+    return root, child, products
+
+
+class TestAsyncProductViews:
+    @pytest.mark.parametrize(
+        "query",
+        [
+            "",
+            "page_size=2",
+            "page_size=2&count=exact",
+            "category={child}",
+            "category={root}&price_band=25-50",
+        ],
+    )
+    def test_list_matches_the_sync_view(self, api_client, catalog, query):
+        root, child, _ = catalog
+        query = query.format(root=root.pk, child=child.pk)
+
+        sync = api_client.get(f"{reverse('api:product-list')}?{query}")
+        response = api_client.get(f"{reverse('api:async-product-list')}?{query}")
+
+        assert response.status_code == status.HTTP_200_OK
+        data, expected = response.json(), sync.json()
+        # Los enlaces apuntan a cada ruta; el cursor es el mismo.
+        for link in ("next", "previous"):
+            if expected[link]:
+                expected[link] = expected[link].replace(
+                    "/products/",
+                    "/async/products/",
+                )
+        assert data == expected
+
+    def test_cursor_pages(self, api_client, catalog):
+        url = reverse("api:async-product-list")
+        first = api_client.get(url, {"page_size": 3}).json()
+        second = api_client.get(first["next"]).json()
+
+        ids = [row["id"] for row in first["results"] + second["results"]]
+        assert ids == [product.pk for product in reversed(catalog[2])]
+        assert second["next"] is None
+
+    def test_list_runs_outside_a_transaction_and_caches_the_body(
+        self,
+        api_client,
+        catalog,
+    ):
+        url = reverse("api:async-product-list")
+
+        with CaptureQueriesContext(connection) as ctx:
+            miss = api_client.get(url)
+        with CaptureQueriesContext(connection) as hit_ctx:
+            hit = api_client.get(url)
+
+        assert not any("SAVEPOINT" in q["sql"] for q in ctx.captured_queries)
+        assert miss["X-Cache"] == "MISS"
+        assert hit["X-Cache"] == "HIT"
+        assert hit.content == miss.content
+        assert hit_ctx.captured_queries == []
+
+    def test_bad_parameters(self, api_client, catalog):
+        response = api_client.get(reverse("api:async-product-list"), {"category": "x"})
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.json() == {"detail": "category must be an integer id."}
+
+    def test_detail_matches_the_sync_view(self, api_client, catalog):
+        product = catalog[2][0]
+
+        response = api_client.get(
+            reverse("api:async-product-detail", args=[product.slug]),
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.content == (
+            api_client.get(reverse("api:product-detail", args=[product.slug])).content
+        )
+        missing = api_client.get(reverse("api:async-product-detail", args=["nope"]))
+        assert missing.status_code == status.HTTP_404_NOT_FOUND
+        assert missing.content == (
+            api_client.get(reverse("api:product-detail", args=["nope"])).content
+        )
@@ -0,0 +1,176 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from apps.catalog.services import refresh_listings
+from apps.catalog.tests.factories import CategoryFactory
+from apps.catalog.tests.factories import ProductFactory
+from apps.catalog.tests.factories import ProductImageFactory
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def api_client() -> APIClient:
+    return APIClient()
+
+
+class TestProductViewSet:
+    def test_list_reads_listing_rows_without_joins(self, api_client):
+        products = ProductFactory.create_batch(5)
+        for product in products:
+            ProductImageFactory(product=product)
+        refresh_listings()
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = api_client.get(reverse("api:product-list"))
+
+        # ATOMIC_REQUESTS adds a SAVEPOINT/RELEASE pair inside the test transaction.
+        statements = [
+            q["sql"] for q in ctx.captured_queries if "SAVEPOINT" not in q["sql"]
+        ]
+        # One query for the listing page and one for the precomputed facets.
+        assert len(statements) == 2  # noqa: PLR2004
+        assert not any("JOIN" in sql for sql in statements)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [row["id"] for row in response.data["results"]] == [
+            p.pk for p in reversed(products)
+        ]
+        assert set(response.data["results"][0]) == {
+            "id",
+            "name",
+            "slug",
+            "brand_name",
+            "category_path",
+            "price",
+            "sale_price",
+            "in_stock",
+            "image_url",
+            "image_srcset",
+        }
+
+    def test_list_filters(self, api_client):
+        cheap = ProductFactory(price="5.00", stock=0)
+        expensive = ProductFactory(price="50.00", category=cheap.category)
+        ProductFactory(price="50.00")
+        refresh_listings()
+
+        url = reverse("api:product-list")
+        response = api_client.get(url, {"category": cheap.category_id})
+        assert {row["id"] for row in response.data["results"]} == {
+            cheap.pk,
+            expensive.pk,
+        }
+
+        response = api_client.get(
+            url,
+            {"category": cheap.category_id, "in_stock": "true", "min_price": "10"},
+        )
+        assert [row["id"] for row in response.data["results"]] == [expensive.pk]
+
+        response = api_client.get(url, {"min_price": "cheap"})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+        response = api_client.get(url, {"category": "shoes"})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_category_filter_includes_subtree(self, api_client):
+        root = CategoryFactory()
+        child = CategoryFactory(parent=root)
+        in_child = ProductFactory(category=child)
+        in_root = ProductFactory(category=root)
+        ProductFactory()
+        refresh_listings()
+
+        url = reverse("api:product-list")
+        response = api_client.get(url, {"category": root.pk})
+        assert {row["id"] for row in response.data["results"]} == {
+            in_child.pk,
+            in_root.pk,
+        }
+
+        response = api_client.get(url, {"category": child.pk + 1000})
+        assert response.data["results"] == []
+
+    def test_retrieve(self, api_client):
+        product = ProductFactory()
+        ProductImageFactory(product=product)
+
+        response = api_client.get(
+            reverse("api:product-detail", kwargs={"slug": product.slug}),
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["category"]["id"] == product.category_id
+        assert len(response.data["images"]) == 1
+
+    def test_search(self, api_client):
+        product = ProductFactory(name="Creatina monohidratada")
+        ProductFactory(name="Mezclador de batidos")
+        refresh_listings()
+
+        response = api_client.get(reverse("api:product-search"), {"q": "creatina"})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [row["id"] for row in response.data["results"]] == [product.pk]
+        assert "headline" in response.data["results"][0]
+
+    def test_list_returns_facets_within_two_queries(self, api_client):
+        product = ProductFactory(price="30.00")
+        ProductFactory(price="80.00", category=product.category)
+        refresh_listings()
+        # El árbol de categorías se sirve desde la caché.
+        api_client.get(reverse("api:category-list"))
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = api_client.get(
+                reverse("api:product-list"),
+                {"category": product.category_id, "price_band": "25-50"},
+            )
+
+        statements = [
+            q["sql"] for q in ctx.captured_queries if "SAVEPOINT" not in q["sql"]
+        ]
+        assert len(statements) <= 2  # noqa: PLR2004
+        assert [row["id"] for row in response.data["results"]] == [product.pk]
+        assert {band["value"] for band in response.data["facets"]["price_band"]} == {
+            "25-50",
+            "50-100",
+        }
+
+
+class TestCategoryViewSet:
+    def test_list_returns_nested_tree(self, api_client):
+        root = CategoryFactory()
+        child = CategoryFactory(parent=root)
+
+        response = api_client.get(reverse("api:category-list"))
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [node["id"] for node in response.data] == [root.pk]
+        assert [node["id"] for node in response.data[0]["children"]] == [child.pk]
+
+    def test_retrieve_includes_breadcrumbs_and_children(self, api_client):
+        root = CategoryFactory()
+        child = CategoryFactory(parent=root)
+        leaf = CategoryFactory(parent=child)
+
+        response = api_client.get(
+            reverse("api:category-detail", kwargs={"slug": child.slug}),
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [node["id"] for node in response.data["breadcrumbs"]] == [
+            root.pk,
+            child.pk,
+        ]
+        assert [node["id"] for node in response.data["children"]] == [leaf.pk]
+
+        response = api_client.get(
+            reverse("api:category-detail", kwargs={"slug": "missing"}),
+        )
+        assert response.status_code == status.HTTP_404_NOT_FOUND
@@ -0,0 +1,49 @@
+from decimal import Decimal
+
+from factory import Faker
+from factory import LazyAttribute
+from factory import Sequence
+from factory import SubFactory
+from factory.django import DjangoModelFactory
+
+from apps.catalog.models import Brand
+from apps.catalog.models import Category
+from apps.catalog.models import Product
+from apps.catalog.models import ProductImage
+
+
+class CategoryFactory(DjangoModelFactory[Category]):
+    name = Faker("word")
+    slug = Sequence(lambda n: f"category-{n}")
+
+    class Meta:
+        model = Category
+
+
+class BrandFactory(DjangoModelFactory[Brand]):
+    name = Faker("company")
+    slug = Sequence(lambda n: f"brand-{n}")
+
+    class Meta:
+        model = Brand
+
+
+class ProductFactory(DjangoModelFactory[Product]):
+    category = SubFactory(CategoryFactory)
+    brand = SubFactory(BrandFactory)
+    name = Faker("sentence", nb_words=3)
+    slug = Sequence(lambda n: f"product-{n}")
+    price = Decimal("19.90")
+    stock = 10
+
+    class Meta:
+        model = Product
+
+
+class ProductImageFactory(DjangoModelFactory[ProductImage]):
+    product = SubFactory(ProductFactory)
+    image = LazyAttribute(lambda o: f"products/{o.product.slug}.jpg")
+    is_primary = True
+
+    class Meta:
+        model = ProductImage
@@ -0,0 +1,115 @@
+import pytest
+import redis
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from apps.catalog import autocomplete
+from apps.catalog.autocomplete import members
+from apps.catalog.autocomplete import normalize
+from apps.catalog.autocomplete import rebuild
+from apps.catalog.autocomplete import suggest
+from apps.catalog.services import refresh_listings
+from apps.catalog.tests.factories import BrandFactory
+from apps.catalog.tests.factories import CategoryFactory
+from apps.catalog.tests.factories import ProductFactory
+
+
+def names(results):
+    return [(row["kind"], row["name"]) for row in results]
+
+
+def test_members_index_every_word_suffix():
+    assert normalize("  Camión  ROJO ") == "camion rojo"
+    assert [member.split("\0")[0] for member in members("brand", 1, "b", "Él Tú")] == [
+        "el tu",
+        "tu",
+    ]
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("redis_client")
+class TestSuggest:
+    @pytest.fixture
+    def catalog(self):
+        category = CategoryFactory(name="Camisetas")
+        brand = BrandFactory(name="Camper")
+        product = ProductFactory(name="Camiseta Roja", category=category, brand=brand)
+        ProductFactory(name="Pantalón", category=category, brand=brand)
+        refresh_listings()
+        return category, brand, product
+
+    def test_prefixes_of_any_word(self, catalog):
+        assert rebuild() == 4  # noqa: PLR2004
+
+        assert names(suggest("CAM")) == [
+            ("category", "Camisetas"),
+            ("brand", "Camper"),
+            ("product", "Camiseta Roja"),
+        ]
+        assert names(suggest("roj")) == [("product", "Camiseta Roja")]
+        assert names(suggest("pantalon")) == [("product", "Pantalón")]
+        assert suggest("cam", limit=1) == [
+            {
+                "kind": "category",
+                "id": catalog[0].pk,
+                "slug": catalog[0].slug,
+                "name": "Camisetas",
+            },
+        ]
+        assert suggest(" ") == []
+
+    def test_catalog_writes_update_the_index(
+        self,
+        catalog,
+        django_capture_on_commit_callbacks,
+    ):
+        category, brand, product = catalog
+        rebuild()
+
+        with django_capture_on_commit_callbacks(execute=True):
+            product.name = "Polo Azul"
+            product.save()
+            brand.delete()
+            CategoryFactory(name="Calcetines")
+
+        assert names(suggest("ca")) == [
+            ("category", "Calcetines"),
+            ("category", "Camisetas"),
+        ]
+        assert names(suggest("azul")) == [("product", "Polo Azul")]
+
+    def test_falls_back_to_sql_until_the_index_is_built(self, catalog):
+        with CaptureQueriesContext(connection) as ctx:
+            results = suggest("cami")
+
+        assert names(results) == [
+            ("category", "Camisetas"),
+            ("product", "Camiseta Roja"),
+        ]
+        assert ctx.captured_queries
+
+    def test_falls_back_to_sql_without_redis(self, catalog, monkeypatch):
+        rebuild()
+        down = redis.Redis(port=1, socket_connect_timeout=0.1)
+        monkeypatch.setattr(autocomplete, "get_redis", lambda: down)
+
+        results = names(suggest("camp"))
+
+        # La búsqueda SQL también encuentra los productos de la marca.
+        assert results[0] == ("brand", "Camper")
+        assert sorted(results[1:]) == [
+            ("product", "Camiseta Roja"),
+            ("product", "Pantalón"),
+        ]
+
+    def test_endpoint_does_not_touch_postgres(self, catalog):
+        rebuild()
+        client = APIClient()
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = client.get(reverse("api:autocomplete-list"), {"q": "cam"})
+
+        assert len(response.data["results"]) == 3  # noqa: PLR2004
+        assert ctx.captured_queries == []
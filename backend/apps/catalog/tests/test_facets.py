@@ -0,0 +1,97 @@
+from decimal import Decimal
+
+import pytest
+
+from apps.catalog.cache import CATALOG
+from apps.catalog.facets import facet_counts
+from apps.catalog.facets import price_band
+from apps.catalog.facets import price_band_range
+from apps.catalog.facets import rebuild_facets
+from apps.catalog.models import CategoryFacet
+from apps.catalog.services import refresh_listings
+from apps.catalog.tests.factories import ProductFactory
+from apps.utils.response_cache import versions
+
+pytestmark = pytest.mark.django_db
+
+
+def counts(category_id=None):
+    return {
+        (row.facet, row.value): row.count
+        for row in CategoryFacet.objects.filter(category_id=category_id)
+        if row.count
+    }
+
+
+@pytest.mark.parametrize(
+    ("price", "band"),
+    [
+        ("0", "0-25"),
+        ("24.99", "0-25"),
+        ("25", "25-50"),
+        ("199", "100-200"),
+        ("900", "200+"),
+    ],
+)
+def test_price_band_round_trip(price, band):
+    assert price_band(Decimal(price)) == band
+    lower, upper = price_band_range(band)
+    assert lower <= Decimal(price)
+    assert upper is None or Decimal(price) < upper
+
+
+class TestFacetCounts:
+    def test_incremental_updates_match_rebuild(self):
+        first = ProductFactory(price="10.00", stock=0)
+        second = ProductFactory(
+            price="30.00",
+            category=first.category,
+            brand=first.brand,
+        )
+        refresh_listings()
+
+        first.price = Decimal("60.00")
+        first.stock = 4
+        first.save()
+        second.is_active = False
+        second.save()
+        refresh_listings([first.pk, second.pk])
+
+        incremental = counts(first.category_id), counts()
+        rebuild_facets()
+        assert (counts(first.category_id), counts()) == incremental
+        assert incremental[0] == {
+            ("brand", str(first.brand_id)): 1,
+            ("price_band", "50-100"): 1,
+            ("in_stock", "true"): 1,
+        }
+
+    def test_deleting_a_product_moves_counts_and_bumps_the_catalog(
+        self,
+        django_capture_on_commit_callbacks,
+    ):
+        kept = ProductFactory(price="10.00")
+        deleted = ProductFactory(price="10.00", category=kept.category)
+        refresh_listings()
+        [before] = versions((CATALOG,))
+
+        with django_capture_on_commit_callbacks(execute=True):
+            deleted.delete()
+
+        assert versions((CATALOG,)) != [before]
+        assert counts(kept.category_id)[("price_band", "0-25")] == 1
+        incremental = counts(kept.category_id), counts()
+        rebuild_facets()
+        assert (counts(kept.category_id), counts()) == incremental
+
+    def test_facet_counts_groups_by_facet(self):
+        product = ProductFactory(price="10.00")
+        refresh_listings()
+
+        facets = facet_counts(product.category_id)
+
+        assert facets["brand"] == [
+            {"value": str(product.brand_id), "label": product.brand.name, "count": 1},
+        ]
+        assert facets["price_band"] == [{"value": "0-25", "label": "", "count": 1}]
+        assert facets["in_stock"] == [{"value": "true", "label": "", "count": 1}]
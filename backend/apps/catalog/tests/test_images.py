@@ -0,0 +1,121 @@
+from io import BytesIO
+
+import pytest
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from PIL import Image
+
+from apps.catalog.images import src
+from apps.catalog.images import srcset
+from apps.catalog.models import ProductImage
+from apps.catalog.models import ProductListing
+from apps.catalog.tasks import generate_image_variants_task
+from apps.catalog.tests.factories import ProductFactory
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def _variant_settings(settings):
+    settings.IMAGE_VARIANT_WIDTHS = [320, 640, 1280]
+    settings.IMAGE_VARIANT_FORMATS = ["webp", "jpeg"]
+
+
+def upload(size=(800, 600), color="red", name="photo.jpg"):
+    exif = Image.Exif()
+    exif[0x010F] = "Camera maker"
+    buffer = BytesIO()
+    Image.new("RGB", size, color).save(buffer, format="JPEG", exif=exif)
+    return SimpleUploadedFile(name, buffer.getvalue(), content_type="image/jpeg")
+
+
+def add_image(product, file, capture):
+    with capture(execute=True):
+        return ProductImage.objects.create(product=product, image=file, is_primary=True)
+
+
+class TestUpload:
+    def test_generates_variants_without_metadata(
+        self,
+        django_capture_on_commit_callbacks,
+    ):
+        product = ProductFactory()
+
+        image = add_image(product, upload(), django_capture_on_commit_callbacks)
+
+        image.refresh_from_db()
+        assert image.image.name == f"products/{image.content_hash}.jpg"
+        assert (image.width, image.height) == (800, 600)
+        assert [(v["format"], v["width"]) for v in image.variants] == [
+            ("webp", 320),
+            ("jpeg", 320),
+            ("webp", 640),
+            ("jpeg", 640),
+            ("webp", 800),
+            ("jpeg", 800),
+        ]
+        name = f"products/variants/{image.content_hash}/640.jpg"
+        with default_storage.open(name) as file, Image.open(file) as variant:
+            assert variant.size == (640, 480)
+            assert not variant.getexif()
+
+        listing = ProductListing.objects.get(product=product)
+        assert listing.image_url == default_storage.url(name)
+        assert listing.image_srcset == srcset(image.variants, "webp")
+
+    def test_identical_uploads_are_stored_once(
+        self,
+        django_capture_on_commit_callbacks,
+    ):
+        first = add_image(
+            ProductFactory(),
+            upload(),
+            django_capture_on_commit_callbacks,
+        )
+        second = add_image(
+            ProductFactory(),
+            upload(),
+            django_capture_on_commit_callbacks,
+        )
+        other = add_image(
+            ProductFactory(),
+            upload(color="blue"),
+            django_capture_on_commit_callbacks,
+        )
+
+        assert first.image.name == second.image.name != other.image.name
+        first.refresh_from_db()
+        second.refresh_from_db()
+        assert first.variants == second.variants
+        _, files = default_storage.listdir("products")
+        assert len(files) == 2  # noqa: PLR2004
+
+    def test_reprocessing_keeps_existing_variants(
+        self,
+        django_capture_on_commit_callbacks,
+    ):
+        image = add_image(
+            ProductFactory(),
+            upload(),
+            django_capture_on_commit_callbacks,
+        )
+        name = f"products/variants/{image.content_hash}/320.webp"
+        modified = default_storage.get_modified_time(name)
+
+        assert generate_image_variants_task(image.pk) == 1
+
+        assert default_storage.get_modified_time(name) == modified
+        _, files = default_storage.listdir(f"products/variants/{image.content_hash}")
+        assert len(files) == 6  # noqa: PLR2004
+
+
+def test_src_picks_smallest_wide_enough_variant():
+    variants = [
+        {"format": "jpeg", "width": width, "url": f"/{width}.jpg"}
+        for width in (320, 640, 1280)
+    ]
+
+    assert src(variants, 500) == "/640.jpg"
+    assert src(variants, 2000) == "/1280.jpg"
+    assert src(variants, 500, "webp") == ""
+    assert srcset(variants, "jpeg") == "/320.jpg 320w, /640.jpg 640w, /1280.jpg 1280w"
@@ -0,0 +1,155 @@
+import json
+from decimal import Decimal
+
+import pytest
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+
+from apps.catalog.imports import run_import
+from apps.catalog.models import CatalogImport
+from apps.catalog.models import Product
+from apps.catalog.models import ProductListing
+from apps.catalog.tests.factories import BrandFactory
+from apps.catalog.tests.factories import CategoryFactory
+from apps.catalog.tests.factories import ProductFactory
+
+pytestmark = pytest.mark.django_db
+
+Status = CatalogImport.Status
+
+
+@pytest.fixture
+def category():
+    return CategoryFactory(slug="proteina")
+
+
+@pytest.fixture
+def brand():
+    return BrandFactory(slug="acme")
+
+
+def make_job(content: str, file_format=CatalogImport.Format.CSV) -> CatalogImport:
+    source = default_storage.save(f"imports/file.{file_format}", ContentFile(content))
+    return CatalogImport.objects.create(source=source, format=file_format)
+
+
+CSV_HEADER = "slug,name,description,price,stock,category,brand,is_active\n"
+
+
+class TestRunImport:
+    def test_upserts_products(
+        self,
+        category,
+        brand,
+        django_capture_on_commit_callbacks,
+    ):
+        existing = ProductFactory(slug="whey", name="Old name", price="1.00")
+        unchanged = ProductFactory(
+            slug="bar",
+            name="Bar",
+            description="",
+            price="2.50",
+            stock=3,
+            category=category,
+            brand=None,
+        )
+        job = make_job(
+            CSV_HEADER
+            + "whey,Whey,Vanilla,29.90,5,proteina,acme,\n"
+            + "bar,Bar,,2.50,3,proteina,,true\n"
+            + "new,New,,9.99,0,proteina,,no\n"
+            # Si un slug se repite gana la última fila.
+            + "new,Newer,,10.99,1,proteina,,no\n",
+        )
+
+        with django_capture_on_commit_callbacks(execute=True):
+            run_import(job, chunk_size=2)
+
+        job.refresh_from_db()
+        assert job.status == Status.DONE
+        assert (job.rows_read, job.rows_staged, job.error_count) == (4, 4, 0)
+        # "bar" no cambia y no se reescribe.
+        assert job.rows_written == 2  # noqa: PLR2004
+        existing.refresh_from_db()
+        assert (existing.name, existing.price, existing.brand) == (
+            "Whey",
+            Decimal("29.90"),
+            brand,
+        )
+        new = Product.objects.get(slug="new")
+        assert (new.name, new.stock, new.is_active) == ("Newer", 1, False)
+        assert Product.objects.get(pk=unchanged.pk).updated_at == unchanged.updated_at
+        assert ProductListing.objects.filter(product=existing, price="29.90").exists()
+
+    def test_rejects_invalid_rows(self, category):
+        job = make_job(
+            "\n".join(
+                [
+                    json.dumps(
+                        {
+                            "slug": "ok",
+                            "name": "Ok",
+                            "price": 1,
+                            "category": "proteina",
+                        },
+                    ),
+                    json.dumps(
+                        {
+                            "slug": "bad slug",
+                            "name": "",
+                            "price": "-1",
+                            "stock": "x",
+                            "category": "nope",
+                            "brand": "nope",
+                        },
+                    ),
+                    "{not json",
+                ],
+            ),
+            CatalogImport.Format.JSONL,
+        )
+
+        run_import(job)
+
+        assert job.error_count == 2  # noqa: PLR2004
+        assert job.errors[0]["row"] == 2  # noqa: PLR2004
+        assert set(job.errors[0]["errors"]) == {
+            "slug",
+            "name",
+            "price",
+            "stock",
+            "category",
+            "brand",
+        }
+        assert job.errors[1] == {"row": 3, "errors": {"row": "Not a JSON object."}}
+        assert list(Product.objects.values_list("slug", flat=True)) == ["ok"]
+
+    def test_resumes_after_a_failure(self, category):
+        rows = "".join(f"p-{n},P {n},,1.00,1,proteina,,\n" for n in range(5))
+        job = make_job(CSV_HEADER + rows)
+
+        def fail_after_first_chunk(job, rows_per_second):
+            msg = "worker lost"
+            raise RuntimeError(msg)
+
+        with pytest.raises(RuntimeError):
+            run_import(job, chunk_size=2, progress=fail_after_first_chunk)
+        job.refresh_from_db()
+        assert (job.status, job.rows_read, job.failure) == (
+            Status.FAILED,
+            2,
+            "RuntimeError: worker lost",
+        )
+        assert not Product.objects.exists()
+
+        seen = []
+        run_import(
+            job,
+            chunk_size=2,
+            progress=lambda job, rate: seen.append(job.rows_read),
+        )
+
+        assert seen == [4, 5]
+        assert job.status == Status.DONE
+        assert job.rows_written == 5  # noqa: PLR2004
+        assert Product.objects.count() == 5  # noqa: PLR2004
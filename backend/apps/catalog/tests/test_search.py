@@ -0,0 +1,61 @@
+import pytest
+
+from apps.catalog.search import prefix_query
+from apps.catalog.search import search_listings
+from apps.catalog.services import refresh_listings
+from apps.catalog.tests.factories import BrandFactory
+from apps.catalog.tests.factories import CategoryFactory
+from apps.catalog.tests.factories import ProductFactory
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def catalog():
+    supplements = CategoryFactory(slug="suplementos")
+    products = {
+        "creatine": ProductFactory(
+            name="Creatina monohidratada",
+            category=CategoryFactory(slug="rendimiento", parent=supplements),
+        ),
+        "whey": ProductFactory(
+            name="Proteina whey chocolate",
+            brand=BrandFactory(name="Optimum"),
+            category=CategoryFactory(slug="proteinas", parent=supplements),
+        ),
+        "shaker": ProductFactory(name="Mezclador de batidos"),
+    }
+    refresh_listings()
+    return products
+
+
+class TestSearchListings:
+    def test_prefix_matches_ranked(self, catalog):
+        results = list(search_listings("creat", limit=10))
+
+        assert [r.product_id for r in results] == [catalog["creatine"].pk]
+        assert results[0].rank > 0
+        assert "<mark>Creatina</mark>" in results[0].headline
+
+    def test_spanish_stemming(self, catalog):
+        results = search_listings("proteinas", limit=10)
+
+        assert catalog["whey"].pk in [r.product_id for r in results]
+
+    def test_matches_brand_and_category(self, catalog):
+        assert [r.product_id for r in search_listings("optimum", limit=10)] == [
+            catalog["whey"].pk,
+        ]
+        assert {r.product_id for r in search_listings("suplementos", limit=10)} == {
+            catalog["creatine"].pk,
+            catalog["whey"].pk,
+        }
+
+    def test_trigram_fallback_for_typos(self, catalog):
+        results = search_listings("mezclaor", limit=10)
+
+        assert [r.product_id for r in results] == [catalog["shaker"].pk]
+
+    def test_blank_query(self, catalog):
+        assert prefix_query(" !? ") is None
+        assert not search_listings("", limit=10).exists()
@@ -0,0 +1,94 @@
+import pytest
+
+from apps.catalog import services
+from apps.catalog.facets import rebuild_facets
+from apps.catalog.models import CategoryFacet
+from apps.catalog.models import ProductListing
+from apps.catalog.services import refresh_listings
+from apps.catalog.tests.factories import CategoryFactory
+from apps.catalog.tests.factories import ProductFactory
+from apps.catalog.tests.factories import ProductImageFactory
+
+pytestmark = pytest.mark.django_db
+
+
+class TestRefreshListings:
+    def test_builds_denormalized_row(self):
+        parent = CategoryFactory(slug="suplementos")
+        category = CategoryFactory(slug="proteina", parent=parent)
+        product = ProductFactory(category=category, stock=0)
+        ProductImageFactory(product=product, is_primary=False, position=0)
+        primary = ProductImageFactory(product=product, is_primary=True, position=1)
+
+        assert refresh_listings([product.pk]) == 1
+
+        listing = ProductListing.objects.get(product=product)
+        assert listing.name == product.name
+        assert listing.brand_name == product.brand.name
+        assert listing.category_path == "suplementos/proteina"
+        assert listing.price == product.price
+        assert listing.in_stock is False
+        assert listing.image_url.endswith(primary.image.name)
+
+    def test_updates_existing_row(self):
+        product = ProductFactory(stock=0)
+        refresh_listings([product.pk])
+
+        product.stock = 3
+        product.save()
+        refresh_listings([product.pk])
+
+        assert ProductListing.objects.get(product=product).in_stock is True
+
+    def test_inactive_product_loses_row(self):
+        product = ProductFactory()
+        refresh_listings([product.pk])
+
+        product.is_active = False
+        product.save()
+        refresh_listings([product.pk])
+
+        assert not ProductListing.objects.filter(product=product).exists()
+
+    def test_refreshes_everything_in_chunks(self):
+        products = ProductFactory.create_batch(3)
+        ProductListing.objects.all().delete()
+
+        assert refresh_listings(chunk_size=2) == 3  # noqa: PLR2004
+        assert set(ProductListing.objects.values_list("product_id", flat=True)) == {
+            product.pk for product in products
+        }
+
+    @pytest.mark.django_db(transaction=True)
+    def test_failed_batch_rolls_back_its_rows(self, monkeypatch):
+        ProductFactory.create_batch(3)
+        ProductListing.objects.all().delete()
+        CategoryFacet.objects.all().delete()
+        apply_deltas = services.apply_deltas
+        calls = []
+
+        def fail_on_second_batch(**deltas):
+            calls.append(deltas)
+            # Primera llamada: las filas obsoletas; luego, una por lote.
+            if len(calls) == 3:  # noqa: PLR2004
+                raise RuntimeError
+            apply_deltas(**deltas)
+
+        monkeypatch.setattr(services, "apply_deltas", fail_on_second_batch)
+        with pytest.raises(RuntimeError):
+            refresh_listings(chunk_size=2)
+
+        assert ProductListing.objects.count() == 2  # noqa: PLR2004
+        incremental = set(
+            CategoryFacet.objects.values_list("category_id", "facet", "value", "count"),
+        )
+        rebuild_facets()
+        assert incremental == set(
+            CategoryFacet.objects.values_list("category_id", "facet", "value", "count"),
+        )
+
+    def test_on_commit_refresh(self, django_capture_on_commit_callbacks):
+        with django_capture_on_commit_callbacks(execute=True):
+            product = ProductFactory()
+
+        assert ProductListing.objects.filter(product=product).exists()
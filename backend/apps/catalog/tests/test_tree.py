@@ -0,0 +1,150 @@
+import pytest
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+
+from apps.catalog.facets import rebuild_facets
+from apps.catalog.models import Category
+from apps.catalog.models import CategoryFacet
+from apps.catalog.models import ProductListing
+from apps.catalog.services import refresh_listings
+from apps.catalog.tasks import refresh_listings_task
+from apps.catalog.tests.factories import CategoryFactory
+from apps.catalog.tests.factories import ProductFactory
+from apps.catalog.tree import CATEGORY_TREE_CACHE_KEY
+from apps.catalog.tree import ancestors
+from apps.catalog.tree import breadcrumbs
+from apps.catalog.tree import category_nodes
+from apps.catalog.tree import rebuild_paths
+from apps.catalog.tree import subtree
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def tree():
+    root = CategoryFactory()
+    child = CategoryFactory(parent=root)
+    leaf = CategoryFactory(parent=child)
+    other = CategoryFactory()
+    return root, child, leaf, other
+
+
+class TestCategoryPath:
+    def test_path_and_depth_on_create(self, tree):
+        root, child, leaf, _ = tree
+
+        assert root.path == f"{root.pk}/"
+        assert leaf.path == f"{root.pk}/{child.pk}/{leaf.pk}/"
+        assert leaf.depth == 2  # noqa: PLR2004
+        leaf.refresh_from_db()
+        assert leaf.path == f"{root.pk}/{child.pk}/{leaf.pk}/"
+
+    def test_queries_are_single_statements(self, tree, django_assert_num_queries):
+        root, child, leaf, other = tree
+
+        with django_assert_num_queries(3):
+            assert set(subtree(root)) == {root, child, leaf}
+            assert list(ancestors(leaf)) == [root, child]
+            assert list(breadcrumbs(leaf)) == [root, child, leaf]
+
+    def test_move_rewrites_descendants(self, tree):
+        root, child, leaf, other = tree
+
+        child.parent = other
+        child.save()
+
+        leaf.refresh_from_db()
+        assert leaf.path == f"{other.pk}/{child.pk}/{leaf.pk}/"
+        assert leaf.depth == 2  # noqa: PLR2004
+        assert set(subtree(root)) == {root}
+
+        child.parent = None
+        child.save()
+        leaf.refresh_from_db()
+        assert leaf.path == f"{child.pk}/{leaf.pk}/"
+        assert leaf.depth == 1
+
+    def test_cannot_move_below_itself(self, tree):
+        root, _, leaf, _ = tree
+
+        root.parent = leaf
+        with pytest.raises(ValidationError):
+            root.full_clean()
+        with pytest.raises(ValueError, match="below itself"):
+            root.save()
+
+    def test_rebuild_paths_after_bulk_create(self, tree):
+        root, child, leaf, _ = tree
+        Category.objects.update(path="", depth=0)
+
+        rebuild_paths()
+
+        assert Category.objects.get(pk=leaf.pk).path == leaf.path
+
+
+class TestCategoryTreeCache:
+    def test_cached_blob_is_served_without_queries(
+        self,
+        tree,
+        django_assert_num_queries,
+    ):
+        root, child, *_ = tree
+        category_nodes()
+
+        with django_assert_num_queries(0):
+            nodes = category_nodes()
+
+        assert nodes[child.pk]["parent_id"] == root.pk
+
+    def test_writes_invalidate_blob(self, tree, django_capture_on_commit_callbacks):
+        root, *_ = tree
+        category_nodes()
+
+        with django_capture_on_commit_callbacks(execute=True):
+            root.name = "Renamed"
+            root.save()
+
+        assert cache.get(CATEGORY_TREE_CACHE_KEY) is None
+        assert category_nodes()[root.pk]["name"] == "Renamed"
+
+
+class TestListingsFollowTree:
+    def test_move_updates_listing_paths_and_ancestor_facets(self, tree):
+        root, child, leaf, other = tree
+        product = ProductFactory(category=leaf)
+        refresh_listings()
+        assert CategoryFacet.objects.filter(category=root, count__gt=0).exists()
+
+        child.parent = other
+        child.save()
+        refresh_listings_task(child.pk)
+
+        listing = ProductListing.objects.get(product=product)
+        assert listing.tree_path == f"{other.pk}/{child.pk}/{leaf.pk}/"
+        incremental = set(
+            CategoryFacet.objects.filter(count__gt=0).values_list(
+                "category_id",
+                "facet",
+                "value",
+                "count",
+            ),
+        )
+        assert not any(row[0] == root.pk for row in incremental)
+        rebuild_facets()
+        assert incremental == set(
+            CategoryFacet.objects.values_list("category_id", "facet", "value", "count"),
+        )
+
+    def test_refresh_ignores_a_stale_tree_blob(self, tree):
+        root, child, leaf, other = tree
+        product = ProductFactory(category=leaf)
+        category_nodes()
+
+        # Sin confirmar: el árbol cacheado aún tiene la ruta anterior.
+        child.parent = other
+        child.save()
+        refresh_listings([product.pk])
+
+        listing = ProductListing.objects.get(product=product)
+        assert listing.tree_path == f"{other.pk}/{child.pk}/{leaf.pk}/"
+        assert listing.category_path == f"{other.slug}/{child.slug}/{leaf.slug}"
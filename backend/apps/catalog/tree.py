@@ -0,0 +1,101 @@
+"""
+Category tree queries and the cached tree blob.
+
+Every query here is a single indexed lookup on the materialized
+``Category.path``. The whole tree is also kept in the default cache as one
+JSON blob, rebuilt on the first read after any category write.
+"""
+
+import json
+
+from django.core.cache import cache
+
+from .cache import invalidate_catalog_responses
+from .models import Category
+
+CATEGORY_TREE_CACHE_KEY = "catalog:category-tree"
+CATEGORY_TREE_TIMEOUT = 60 * 60 * 24
+
+NODE_FIELDS = ("id", "name", "slug", "parent_id", "path", "depth")
+
+
+def path_ids(path: str) -> list[int]:
+    """``"3/12/40/"`` -> ``[3, 12, 40]``."""
+    return [int(pk) for pk in path.split("/") if pk]
+
+
+def subtree(category: Category):
+    """``category`` and all its descendants."""
+    return Category.objects.filter(path__startswith=category.path)
+
+
+def ancestors(category: Category):
+    """Ancestors of ``category`` from the root down, excluding itself."""
+    return Category.objects.filter(pk__in=path_ids(category.path)[:-1]).order_by(
+        "depth",
+    )
+
+
+def breadcrumbs(category: Category):
+    """Ancestors of ``category`` from the root down, including itself."""
+    return Category.objects.filter(pk__in=path_ids(category.path)).order_by("depth")
+
+
+def rebuild_paths() -> int:
+    """
+    Recompute ``path`` and ``depth`` for every category level by level.
+
+    Only needed after writes that skip ``Category.save``, e.g. ``bulk_create``.
+    """
+    updated = 0
+    level = list(Category.objects.filter(parent__isnull=True))
+    parent_paths = {None: ""}
+    while level:
+        for category in level:
+            category.path = f"{parent_paths[category.parent_id]}{category.pk}/"
+            category.depth = category.path.count("/") - 1
+            parent_paths[category.pk] = category.path
+        Category.objects.bulk_update(level, ["path", "depth"])
+        updated += len(level)
+        level = list(Category.objects.filter(parent_id__in=[c.pk for c in level]))
+    invalidate_category_tree()
+    return updated
+
+
+def category_nodes() -> dict[int, dict]:
+    """Every category as a plain dict keyed by id, served from the cache."""
+    blob = cache.get(CATEGORY_TREE_CACHE_KEY)
+    if blob is None:
+        rows = Category.objects.order_by("path").values(*NODE_FIELDS)
+        blob = json.dumps(list(rows))
+        cache.set(CATEGORY_TREE_CACHE_KEY, blob, CATEGORY_TREE_TIMEOUT)
+    return {node["id"]: node for node in json.loads(blob)}
+
+
+async def acategory_nodes() -> dict[int, dict]:
+    """Async twin of :func:`category_nodes`."""
+    blob = await cache.aget(CATEGORY_TREE_CACHE_KEY)
+    if blob is None:
+        rows = Category.objects.order_by("path").values(*NODE_FIELDS)
+        blob = json.dumps([row async for row in rows])
+        await cache.aset(CATEGORY_TREE_CACHE_KEY, blob, CATEGORY_TREE_TIMEOUT)
+    return {node["id"]: node for node in json.loads(blob)}
+
+
+def invalidate_category_tree() -> None:
+    cache.delete(CATEGORY_TREE_CACHE_KEY)
+    invalidate_catalog_responses()
+
+
+def nested_tree(nodes: dict[int, dict]) -> list[dict]:
+    """Roots of ``nodes`` with their descendants under ``children``."""
+    tree = {pk: {**node, "children": []} for pk, node in nodes.items()}
+    roots = []
+    for node in sorted(tree.values(), key=lambda node: node["path"]):
+        parent = tree.get(node["parent_id"])
+        (parent["children"] if parent else roots).append(node)
+    return roots
+
+
+def node_breadcrumbs(nodes: dict[int, dict], pk: int) -> list[dict]:
+    return [nodes[ancestor] for ancestor in path_ids(nodes[pk]["path"])]
@@ -1,7 +1,9 @@
 import pytest
+from django.core.cache import cache
 
 from apps.users.models import User
 from apps.users.tests.factories import UserFactory
+from apps.utils.redis import get_redis
 
 
 @pytest.fixture(autouse=True)
@@ -9,6 +11,21 @@ def _media_storage(settings, tmpdir) -> None:
     settings.MEDIA_ROOT = tmpdir.strpath
 
 
+@pytest.fixture(autouse=True)
+def _clear_cache():
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def redis_client():
+    """The shared Redis client, emptied before and after the test."""
+    client = get_redis()
+    client.flushdb()
+    yield client
+    client.flushdb()
+
+
 @pytest.fixture
 def user(db) -> User:
     return UserFactory()
@@ -0,0 +1,15 @@
+from django.contrib import admin
+
+from . import models
+
+
+class ReservationAdmin(admin.ModelAdmin):
+    list_display = ("token", "product", "quantity", "status", "expires_at")
+    list_filter = ("status",)
+    list_select_related = ("product",)
+    search_fields = ("token",)
+    raw_id_fields = ("product",)
+    list_per_page = 25
+
+
+admin.site.register(models.Reservation, ReservationAdmin)
@@ -0,0 +1,38 @@
+# Generated by Django 5.1.8 on 2026-10-18 08:46
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('catalog', '0005_category_tree'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Reservation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('token', models.UUIDField(db_index=True, default=uuid.uuid4)),
+                ('quantity', models.PositiveIntegerField(verbose_name='quantity')),
+                ('status', models.CharField(choices=[('active', 'Active'), ('confirmed', 'Confirmed'), ('released', 'Released'), ('expired', 'Expired')], default='active', max_length=10, verbose_name='status')),
+                ('expires_at', models.DateTimeField(verbose_name='expires at')),
+                ('product', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='reservations', to='catalog.product')),
+            ],
+            options={
+                'verbose_name': 'Reservation',
+                'verbose_name_plural': 'Reservations',
+                'ordering': ['-created_at', '-id'],
+                'abstract': False,
+                'indexes': [models.Index(fields=['created_at', 'id'], name='inventory_reservation_keyset'), models.Index(condition=models.Q(('status', 'active')), fields=['expires_at'], name='inventory_reservation_due_idx')],
+                'constraints': [models.CheckConstraint(condition=models.Q(('quantity__gt', 0)), name='inventory_reservation_quantity_positive')],
+            },
+        ),
+    ]
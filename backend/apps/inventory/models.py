@@ -0,0 +1,60 @@
+import uuid
+
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+from apps.abstract.models import AuditDates
+from apps.catalog.models import Product
+
+
+class Reservation(AuditDates):
+    """
+    Unidades de un producto apartadas para un checkout.
+
+    El stock ya se descontó de ``Product.stock`` al crear la reserva; al
+    liberarla o expirar se devuelve. Todas las líneas de un mismo checkout
+    comparten ``token``. Ver ``apps.inventory.services``.
+    """
+
+    class Status(models.TextChoices):
+        ACTIVE = "active", _("Active")
+        CONFIRMED = "confirmed", _("Confirmed")
+        RELEASED = "released", _("Released")
+        EXPIRED = "expired", _("Expired")
+
+    token = models.UUIDField(default=uuid.uuid4, db_index=True)
+    product = models.ForeignKey(
+        Product,
+        on_delete=models.CASCADE,
+        related_name="reservations",
+    )
+    quantity = models.PositiveIntegerField(_("quantity"))
+    status = models.CharField(
+        _("status"),
+        max_length=10,
+        choices=Status.choices,
+        default=Status.ACTIVE,
+    )
+    expires_at = models.DateTimeField(_("expires at"))
+
+    class Meta(AuditDates.Meta):
+        verbose_name = _("Reservation")
+        verbose_name_plural = _("Reservations")
+        indexes = [
+            *AuditDates.Meta.indexes,
+            # Solo las reservas activas interesan al barrido de expiración.
+            models.Index(
+                fields=["expires_at"],
+                name="inventory_reservation_due_idx",
+                condition=models.Q(status="active"),
+            ),
+        ]
+        constraints = [
+            models.CheckConstraint(
+                condition=models.Q(quantity__gt=0),
+                name="inventory_reservation_quantity_positive",
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.quantity} x {self.product_id} ({self.status})"
@@ -0,0 +1,191 @@
+"""
+Stock reservations for checkout.
+
+Stock is taken with a conditional ``UPDATE ... SET stock = stock - n WHERE
+stock >= n``: the database checks and decrements in one statement, so
+concurrent checkouts can neither oversell nor need a read-modify-write under
+``SELECT ... FOR UPDATE``. All lines of a cart are reserved in one
+transaction and always in ascending product id order, so two checkouts that
+share products wait on each other instead of deadlocking.
+
+A reservation holds its stock until :func:`confirm` turns it into a sale,
+:func:`release` gives it back, or :func:`expire_reservations` (run by celery
+beat) returns it once ``expires_at`` has passed.
+"""
+
+import uuid
+from collections import Counter
+from collections.abc import Iterable
+from datetime import timedelta
+from functools import partial
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.db.models.functions import Now
+from django.utils import timezone
+
+from apps.catalog.models import Product
+from apps.catalog.services import broadcast_stock
+from apps.catalog.tasks import refresh_listings_task
+
+from .models import Reservation
+
+Status = Reservation.Status
+
+
+class InsufficientStockError(Exception):
+    def __init__(self, product_id: int, requested: int):
+        self.product_id = product_id
+        self.requested = requested
+        super().__init__(
+            f"Not enough stock for product {product_id} (requested {requested}).",
+        )
+
+
+class ReservationExpiredError(Exception):
+    pass
+
+
+def merge_lines(lines: Iterable[tuple[int, int]]) -> list[tuple[int, int]]:
+    """
+    ``(product_id, quantity)`` pairs with repeated products summed, sorted by
+    product id: the order every reservation locks rows in.
+    """
+    quantities: Counter[int] = Counter()
+    for product_id, quantity in lines:
+        if quantity <= 0:
+            msg = f"Quantity must be positive, got {quantity}."
+            raise ValueError(msg)
+        quantities[product_id] += quantity
+    return sorted(quantities.items())
+
+
+@transaction.atomic
+def reserve(
+    lines: Iterable[tuple[int, int]],
+    token: uuid.UUID | None = None,
+    ttl: timedelta | None = None,
+) -> list[Reservation]:
+    """
+    Take stock for every ``(product_id, quantity)`` line or for none of them.
+
+    Raises :class:`InsufficientStockError` for the first line that cannot be
+    served; the decrements already made are rolled back with the savepoint.
+    """
+    lines = merge_lines(lines)
+    token = token or uuid.uuid4()
+    expires_at = timezone.now() + (ttl or settings.INVENTORY_RESERVATION_TTL)
+    for product_id, quantity in lines:
+        taken = Product.objects.filter(
+            pk=product_id,
+            is_active=True,
+            stock__gte=quantity,
+        ).update(stock=F("stock") - quantity, updated_at=Now())
+        if not taken:
+            raise InsufficientStockError(product_id, quantity)
+
+    reservations = Reservation.objects.bulk_create(
+        Reservation(
+            token=token,
+            product_id=product_id,
+            quantity=quantity,
+            expires_at=expires_at,
+        )
+        for product_id, quantity in lines
+    )
+    product_ids = [product_id for product_id, _ in lines]
+    transaction.on_commit(partial(broadcast_stock, product_ids))
+    sold_out = list(
+        Product.objects.filter(
+            pk__in=product_ids,
+            stock=0,
+        ).values_list("pk", flat=True),
+    )
+    if sold_out:
+        transaction.on_commit(
+            partial(refresh_listings_task.delay, product_ids=sold_out),
+        )
+    return reservations
+
+
+@transaction.atomic
+def confirm(token: uuid.UUID) -> list[Reservation]:
+    """
+    Turn the active reservations under ``token`` into a sale.
+
+    The stock was already taken by :func:`reserve`, so this only flips the
+    status. Raises :class:`ReservationExpiredError` when there is nothing
+    left to confirm or the reservations are past ``expires_at``.
+    """
+    reservations = list(
+        Reservation.objects.select_for_update()
+        .filter(token=token, status=Status.ACTIVE)
+        .order_by("product_id"),
+    )
+    if not reservations or any(
+        reservation.expires_at <= timezone.now() for reservation in reservations
+    ):
+        msg = f"Reservation {token} has expired."
+        raise ReservationExpiredError(msg)
+    Reservation.objects.filter(pk__in=[r.pk for r in reservations]).update(
+        status=Status.CONFIRMED,
+        updated_at=timezone.now(),
+    )
+    for reservation in reservations:
+        reservation.status = Status.CONFIRMED
+    return reservations
+
+
+@transaction.atomic
+def release(token: uuid.UUID) -> int:
+    """Give back the stock of the active reservations under ``token``."""
+    reservations = list(
+        Reservation.objects.select_for_update()
+        .filter(token=token, status=Status.ACTIVE)
+        .order_by("product_id"),
+    )
+    return _return_stock(reservations, Status.RELEASED)
+
+
+def expire_reservations(batch_size: int = 500) -> int:
+    """
+    Return the stock of every active reservation past ``expires_at``.
+
+    Works in short transactions of ``batch_size`` rows and skips rows locked
+    by a concurrent :func:`confirm` or :func:`release`.
+    """
+    expired = 0
+    while True:
+        with transaction.atomic():
+            reservations = list(
+                Reservation.objects.select_for_update(skip_locked=True)
+                .filter(status=Status.ACTIVE, expires_at__lte=timezone.now())
+                .order_by("product_id", "pk")[:batch_size],
+            )
+            if not reservations:
+                return expired
+            expired += _return_stock(reservations, Status.EXPIRED)
+
+
+def _return_stock(reservations: list[Reservation], status: str) -> int:
+    if not reservations:
+        return 0
+    Reservation.objects.filter(pk__in=[r.pk for r in reservations]).update(
+        status=status,
+        updated_at=timezone.now(),
+    )
+    quantities: Counter[int] = Counter()
+    for reservation in reservations:
+        quantities[reservation.product_id] += reservation.quantity
+    # Mismo orden de bloqueo que reserve().
+    for product_id, quantity in sorted(quantities.items()):
+        Product.objects.filter(pk=product_id).update(
+            stock=F("stock") + quantity,
+            updated_at=Now(),
+        )
+    transaction.on_commit(
+        partial(refresh_listings_task.delay, product_ids=sorted(quantities)),
+    )
+    transaction.on_commit(partial(broadcast_stock, sorted(quantities)))
+    return len(reservations)
@@ -0,0 +1,9 @@
+from celery import shared_task
+
+from .services import expire_reservations
+
+
+@shared_task()
+def expire_reservations_task():
+    """Return the stock of expired reservations; scheduled through celery beat."""
+    return expire_reservations()
@@ -0,0 +1,18 @@
+from datetime import timedelta
+
+from django.utils import timezone
+from factory import LazyFunction
+from factory import SubFactory
+from factory.django import DjangoModelFactory
+
+from apps.catalog.tests.factories import ProductFactory
+from apps.inventory.models import Reservation
+
+
+class ReservationFactory(DjangoModelFactory[Reservation]):
+    product = SubFactory(ProductFactory)
+    quantity = 1
+    expires_at = LazyFunction(lambda: timezone.now() + timedelta(minutes=15))
+
+    class Meta:
+        model = Reservation
@@ -0,0 +1,62 @@
+"""
+Stress tests: many threads, each on its own database connection, checking
+out against the same products at once.
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from django.db import connection
+
+from apps.catalog.tests.factories import ProductFactory
+from apps.inventory.models import Reservation
+from apps.inventory.services import InsufficientStockError
+from apps.inventory.services import reserve
+
+pytestmark = pytest.mark.django_db(transaction=True)
+
+THREADS = 24
+
+
+def run_concurrently(checkouts):
+    """Run every checkout on its own thread, released together by a barrier."""
+    barrier = threading.Barrier(len(checkouts))
+
+    def run(lines):
+        barrier.wait()
+        try:
+            reserve(lines)
+        except InsufficientStockError:
+            return False
+        finally:
+            connection.close()
+        return True
+
+    with ThreadPoolExecutor(max_workers=len(checkouts)) as pool:
+        return list(pool.map(run, checkouts))
+
+
+def test_single_sku_never_oversells():
+    product = ProductFactory(stock=10)
+
+    results = run_concurrently([[(product.pk, 1)]] * THREADS)
+
+    product.refresh_from_db()
+    assert results.count(True) == 10  # noqa: PLR2004
+    assert product.stock == 0
+    assert Reservation.objects.filter(product=product).count() == 10  # noqa: PLR2004
+
+
+def test_overlapping_carts_do_not_deadlock():
+    first = ProductFactory(stock=THREADS)
+    second = ProductFactory(stock=THREADS)
+    forwards = [(first.pk, 1), (second.pk, 1)]
+    backwards = [(second.pk, 1), (first.pk, 1)]
+
+    results = run_concurrently([forwards, backwards] * (THREADS // 2))
+
+    first.refresh_from_db()
+    second.refresh_from_db()
+    assert all(results)
+    assert (first.stock, second.stock) == (0, 0)
@@ -0,0 +1,122 @@
+from datetime import timedelta
+
+import pytest
+
+from apps.catalog.models import Product
+from apps.catalog.models import ProductListing
+from apps.catalog.tests.factories import ProductFactory
+from apps.inventory.models import Reservation
+from apps.inventory.services import InsufficientStockError
+from apps.inventory.services import ReservationExpiredError
+from apps.inventory.services import confirm
+from apps.inventory.services import expire_reservations
+from apps.inventory.services import merge_lines
+from apps.inventory.services import release
+from apps.inventory.services import reserve
+
+pytestmark = pytest.mark.django_db
+
+Status = Reservation.Status
+
+
+def stock(product):
+    product.refresh_from_db(fields=["stock"])
+    return product.stock
+
+
+def test_merge_lines_sums_and_sorts():
+    assert merge_lines([(9, 1), (3, 2), (9, 4)]) == [(3, 2), (9, 5)]
+    with pytest.raises(ValueError, match="positive"):
+        merge_lines([(3, 0)])
+
+
+class TestReserve:
+    def test_takes_stock_for_every_line(self):
+        first = ProductFactory(stock=5)
+        second = ProductFactory(stock=2)
+
+        reservations = reserve([(second.pk, 2), (first.pk, 1), (first.pk, 1)])
+
+        assert [(r.product_id, r.quantity) for r in reservations] == [
+            (first.pk, 2),
+            (second.pk, 2),
+        ]
+        assert len({r.token for r in reservations}) == 1
+        assert (stock(first), stock(second)) == (3, 0)
+
+    def test_is_all_or_nothing(self):
+        first = ProductFactory(stock=5)
+        second = ProductFactory(stock=1)
+
+        with pytest.raises(InsufficientStockError) as exc_info:
+            reserve([(first.pk, 2), (second.pk, 3)])
+
+        assert exc_info.value.product_id == second.pk
+        assert (stock(first), stock(second)) == (5, 1)
+        assert not Reservation.objects.exists()
+
+    def test_rejects_inactive_products(self):
+        product = ProductFactory(stock=5, is_active=False)
+
+        with pytest.raises(InsufficientStockError):
+            reserve([(product.pk, 1)])
+
+    def test_selling_out_refreshes_listing(self, django_capture_on_commit_callbacks):
+        product = ProductFactory(stock=1)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            reserve([(product.pk, 1)])
+
+        assert not ProductListing.objects.get(product=product).in_stock
+
+
+def test_stock_changes_touch_updated_at():
+    product = ProductFactory(stock=5)
+    long_ago = product.updated_at - timedelta(days=1)
+    Product.objects.filter(pk=product.pk).update(updated_at=long_ago)
+
+    reservations = reserve([(product.pk, 2)])
+    product.refresh_from_db()
+    assert product.updated_at > long_ago
+
+    Product.objects.filter(pk=product.pk).update(updated_at=long_ago)
+    release(reservations[0].token)
+    product.refresh_from_db()
+    assert (product.stock, product.updated_at > long_ago) == (5, True)
+
+
+class TestReservationLifecycle:
+    def test_confirm_keeps_stock_taken(self):
+        product = ProductFactory(stock=3)
+        token = reserve([(product.pk, 2)])[0].token
+
+        confirm(token)
+
+        assert Reservation.objects.get(token=token).status == Status.CONFIRMED
+        assert stock(product) == 1
+        assert release(token) == 0
+        assert stock(product) == 1
+
+    def test_release_returns_stock(self):
+        product = ProductFactory(stock=3)
+        token = reserve([(product.pk, 2)])[0].token
+
+        assert release(token) == 1
+
+        assert stock(product) == 3  # noqa: PLR2004
+        with pytest.raises(ReservationExpiredError):
+            confirm(token)
+
+    def test_expired_reservations_return_stock(self):
+        product = ProductFactory(stock=3)
+        expired = reserve([(product.pk, 2)], ttl=timedelta(seconds=-1))[0].token
+        live = reserve([(product.pk, 1)])[0].token
+
+        with pytest.raises(ReservationExpiredError):
+            confirm(expired)
+        assert expire_reservations(batch_size=1) == 1
+
+        assert stock(product) == 2  # noqa: PLR2004
+        assert Reservation.objects.get(token=expired).status == Status.EXPIRED
+        assert Reservation.objects.get(token=live).status == Status.ACTIVE
+        assert expire_reservations() == 0
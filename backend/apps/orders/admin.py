@@ -0,0 +1,33 @@
+from django.contrib import admin
+
+from apps.utils.exports import CSV
+from apps.utils.exports import NDJSON
+from apps.utils.exports import export_action
+
+from . import models
+from .exports import ORDER_EXPORT_COLUMNS
+
+
+class OrderLineInline(admin.TabularInline):
+    model = models.OrderLine
+    extra = 0
+    raw_id_fields = ("product",)
+    readonly_fields = ("product_name", "unit_price", "quantity", "line_total")
+
+
+class OrderAdmin(admin.ModelAdmin):
+    list_display = ("id", "user", "status", "total", "created_at")
+    list_filter = ("status",)
+    list_select_related = ("user",)
+    search_fields = ("id", "user__email")
+    raw_id_fields = ("user",)
+    readonly_fields = ("total", "reservation_token")
+    inlines = [OrderLineInline]
+    list_per_page = 25
+    actions = [
+        export_action(ORDER_EXPORT_COLUMNS, CSV, "orders"),
+        export_action(ORDER_EXPORT_COLUMNS, NDJSON, "orders"),
+    ]
+
+
+admin.site.register(models.Order, OrderAdmin)
@@ -0,0 +1,49 @@
+from rest_framework import serializers
+
+from apps.cart.services import MAX_QUANTITY
+from apps.orders.models import Order
+from apps.orders.models import OrderLine
+
+
+class OrderLineSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = OrderLine
+        fields = (
+            "product",
+            "product_name",
+            "list_price",
+            "unit_price",
+            "quantity",
+            "discount",
+            "line_total",
+        )
+
+
+class OrderSerializer(serializers.ModelSerializer):
+    lines = OrderLineSerializer(many=True, read_only=True)
+
+    class Meta:
+        model = Order
+        fields = (
+            "id",
+            "status",
+            "subtotal",
+            "coupon_code",
+            "discount",
+            "total",
+            "lines",
+            "created_at",
+        )
+        read_only_fields = fields
+
+
+class PlaceOrderLineSerializer(serializers.Serializer):
+    product_id = serializers.IntegerField(min_value=1)
+    quantity = serializers.IntegerField(min_value=1, max_value=MAX_QUANTITY)
+
+
+class PlaceOrderSerializer(serializers.Serializer):
+    """Explicit lines to order; without them the user's cart is ordered."""
+
+    lines = PlaceOrderLineSerializer(many=True, required=False, allow_empty=False)
+    coupon = serializers.CharField(max_length=50, required=False, default="")
@@ -0,0 +1,100 @@
+from drf_spectacular.utils import OpenApiParameter
+from drf_spectacular.utils import OpenApiTypes
+from drf_spectacular.utils import extend_schema
+from rest_framework import mixins
+from rest_framework import status
+from rest_framework.exceptions import APIException
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.viewsets import GenericViewSet
+
+from apps.inventory.services import InsufficientStockError
+from apps.orders.exports import ORDER_EXPORT_COLUMNS
+from apps.orders.idempotency import IDEMPOTENCY_HEADER
+from apps.orders.idempotency import idempotent
+from apps.orders.models import Order
+from apps.orders.services import EmptyCartError
+from apps.orders.services import place_order
+from apps.pricing.engine import InvalidCouponError
+from apps.utils.conditional import conditional
+from apps.utils.exports import ExportViewSet
+
+from .serializers import OrderSerializer
+from .serializers import PlaceOrderSerializer
+
+
+class OutOfStock(APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = "Not enough stock."
+    default_code = "out_of_stock"
+
+
+class OrderViewSet(
+    mixins.CreateModelMixin,
+    mixins.ListModelMixin,
+    mixins.RetrieveModelMixin,
+    GenericViewSet,
+):
+    """
+    The authenticated user's orders.
+
+    Placing an order requires an ``Idempotency-Key`` header; repeating the
+    request with the same key returns the original response.
+    """
+
+    serializer_class = OrderSerializer
+    permission_classes = [IsAuthenticated]
+    queryset = Order.objects.none()
+
+    def get_queryset(self):
+        return Order.objects.filter(user=self.request.user).prefetch_related("lines")
+
+    @conditional()
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
+    @conditional()
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
+
+    @extend_schema(
+        request=PlaceOrderSerializer,
+        parameters=[
+            OpenApiParameter(
+                IDEMPOTENCY_HEADER,
+                str,
+                OpenApiParameter.HEADER,
+                required=True,
+            ),
+        ],
+    )
+    @idempotent
+    def create(self, request, *args, **kwargs):
+        serializer = PlaceOrderSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        lines = serializer.validated_data.get("lines")
+        try:
+            order = place_order(
+                request.user,
+                None
+                if lines is None
+                else {line["product_id"]: line["quantity"] for line in lines},
+                coupon=serializer.validated_data["coupon"],
+            )
+        except EmptyCartError as exc:
+            raise ValidationError({"lines": str(exc)}) from exc
+        except InvalidCouponError as exc:
+            raise ValidationError({"coupon": str(exc)}) from exc
+        except InsufficientStockError as exc:
+            raise OutOfStock(
+                {"detail": str(exc), "product_id": exc.product_id},
+            ) from exc
+        return Response(OrderSerializer(order).data, status=status.HTTP_201_CREATED)
+
+
+@extend_schema(responses={(200, "text/csv"): OpenApiTypes.STR})
+class OrderExportViewSet(ExportViewSet):
+    queryset = Order.objects.order_by("pk")
+    export_columns = ORDER_EXPORT_COLUMNS
+    export_name = "orders"
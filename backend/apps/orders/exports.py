@@ -0,0 +1,10 @@
+ORDER_EXPORT_COLUMNS = {
+    "id": "pk",
+    "user_email": "user__email",
+    "status": "status",
+    "subtotal": "subtotal",
+    "coupon_code": "coupon_code",
+    "discount": "discount",
+    "total": "total",
+    "created_at": "created_at",
+}
@@ -0,0 +1,88 @@
+"""
+``Idempotency-Key`` support for unsafe API requests.
+
+The first request with a given key inserts an ``IdempotencyKey`` row inside
+the request transaction (``ATOMIC_REQUESTS``) and stores its response there.
+A retry with the same key gets the stored response back unchanged instead
+of running the view again. A concurrent duplicate blocks on the unique
+index until the first request commits, and then replays its response. If
+the first request fails, its row is rolled back with everything else, so
+the retry runs for real.
+"""
+
+import hashlib
+from datetime import timedelta
+from functools import wraps
+
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+
+from .models import IdempotencyKey
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+REPLAYED_HEADER = "Idempotent-Replayed"
+KEY_MAX_LENGTH = 255
+
+
+def request_fingerprint(request) -> str:
+    digest = hashlib.sha256()
+    for part in (request.method, request.path, request.body):
+        digest.update(part if isinstance(part, bytes) else part.encode())
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def idempotent(method):
+    """
+    Decorate a viewset action so it requires ``Idempotency-Key`` and replays
+    its first successful response for repeated keys of the same user.
+    """
+
+    @wraps(method)
+    def wrapper(self, request, *args, **kwargs):
+        key = request.headers.get(IDEMPOTENCY_HEADER, "").strip()
+        if not key or len(key) > KEY_MAX_LENGTH:
+            msg = f"Send a key of 1 to {KEY_MAX_LENGTH} characters."
+            raise ValidationError({IDEMPOTENCY_HEADER: msg})
+        # Se lee antes de que la vista consuma el stream del cuerpo.
+        fingerprint = request_fingerprint(request)
+        record, created = IdempotencyKey.objects.get_or_create(
+            user=request.user,
+            key=key,
+            defaults={"fingerprint": fingerprint},
+        )
+        if not created:
+            if record.fingerprint != fingerprint:
+                return Response(
+                    {"detail": "Idempotency-Key was already used for another request."},
+                    status=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                )
+            response = Response(record.response, status=record.status_code)
+            response[REPLAYED_HEADER] = "true"
+            return response
+
+        response = method(self, request, *args, **kwargs)
+        record.status_code = response.status_code
+        record.response = response.data
+        record.save(update_fields=["status_code", "response"])
+        return response
+
+    return wrapper
+
+
+def prune_idempotency_keys(max_age: timedelta, batch_size: int = 5000) -> int:
+    """Delete keys older than ``max_age`` in batches; returns how many."""
+    cutoff = timezone.now() - max_age
+    deleted = 0
+    while True:
+        pks = list(
+            IdempotencyKey.objects.filter(created_at__lt=cutoff).values_list(
+                "pk",
+                flat=True,
+            )[:batch_size],
+        )
+        if not pks:
+            return deleted
+        deleted += IdempotencyKey.objects.filter(pk__in=pks).delete()[0]
@@ -0,0 +1,47 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0002_schedule_idempotency_pruning'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='order',
+            name='subtotal',
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=12, verbose_name='subtotal'),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='order',
+            name='coupon_code',
+            field=models.CharField(blank=True, max_length=50, verbose_name='coupon code'),
+        ),
+        migrations.AddField(
+            model_name='order',
+            name='discount',
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=12, verbose_name='coupon discount'),
+        ),
+        migrations.AddField(
+            model_name='orderline',
+            name='list_price',
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=10, verbose_name='list price'),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='orderline',
+            name='discount',
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=12, verbose_name='discount'),
+        ),
+        # Pedidos anteriores: sin descuentos, subtotal = total.
+        migrations.RunSQL(
+            'UPDATE orders_order SET subtotal = total',
+            migrations.RunSQL.noop,
+        ),
+        migrations.RunSQL(
+            'UPDATE orders_orderline SET list_price = unit_price',
+            migrations.RunSQL.noop,
+        ),
+    ]
@@ -0,0 +1,118 @@
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+from apps.abstract.models import AuditDates
+from apps.catalog.models import Product
+
+
+class Order(AuditDates):
+    class Status(models.TextChoices):
+        PLACED = "placed", _("Placed")
+        PAID = "paid", _("Paid")
+        SHIPPED = "shipped", _("Shipped")
+        DELIVERED = "delivered", _("Delivered")
+        CANCELLED = "cancelled", _("Cancelled")
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.PROTECT,
+        related_name="orders",
+    )
+    status = models.CharField(
+        _("status"),
+        max_length=10,
+        choices=Status.choices,
+        default=Status.PLACED,
+    )
+    subtotal = models.DecimalField(_("subtotal"), max_digits=12, decimal_places=2)
+    coupon_code = models.CharField(_("coupon code"), max_length=50, blank=True)
+    discount = models.DecimalField(
+        _("coupon discount"),
+        max_digits=12,
+        decimal_places=2,
+        default=0,
+    )
+    total = models.DecimalField(_("total"), max_digits=12, decimal_places=2)
+    # Reservas de inventario confirmadas por el pedido
+    reservation_token = models.UUIDField(editable=False)
+
+    class Meta(AuditDates.Meta):
+        verbose_name = _("Order")
+        verbose_name_plural = _("Orders")
+        indexes = [
+            *AuditDates.Meta.indexes,
+            models.Index(
+                fields=["user", "created_at", "id"],
+                name="orders_order_user_idx",
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"Order {self.pk}"
+
+
+class OrderLine(models.Model):
+    """Línea de un pedido con el nombre y los precios del producto congelados."""
+
+    order = models.ForeignKey(Order, on_delete=models.CASCADE, related_name="lines")
+    product = models.ForeignKey(
+        Product,
+        on_delete=models.SET_NULL,
+        null=True,
+        related_name="+",
+    )
+    product_name = models.CharField(_("product name"), max_length=255)
+    list_price = models.DecimalField(_("list price"), max_digits=10, decimal_places=2)
+    # Precio tras la rebaja; ``discount`` es el descuento por cantidad o NxM
+    unit_price = models.DecimalField(_("unit price"), max_digits=10, decimal_places=2)
+    quantity = models.PositiveIntegerField(_("quantity"))
+    discount = models.DecimalField(
+        _("discount"),
+        max_digits=12,
+        decimal_places=2,
+        default=0,
+    )
+    line_total = models.DecimalField(_("line total"), max_digits=12, decimal_places=2)
+
+    class Meta:
+        verbose_name = _("Order line")
+        verbose_name_plural = _("Order lines")
+        ordering = ["id"]
+
+    def __str__(self) -> str:
+        return f"{self.quantity} x {self.product_name}"
+
+
+class IdempotencyKey(models.Model):
+    """
+    Respuesta guardada de una petición con cabecera ``Idempotency-Key``.
+
+    Ver ``apps.orders.idempotency``.
+    """
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="+",
+    )
+    key = models.CharField(max_length=255)
+    # sha256 del método, la ruta y el cuerpo de la petición original
+    fingerprint = models.CharField(max_length=64)
+    status_code = models.PositiveSmallIntegerField(null=True)
+    response = models.JSONField(null=True, encoder=DjangoJSONEncoder)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    class Meta:
+        verbose_name = _("Idempotency key")
+        verbose_name_plural = _("Idempotency keys")
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "key"],
+                name="orders_idempotency_key_unique",
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return self.key
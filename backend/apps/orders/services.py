@@ -0,0 +1,101 @@
+"""
+Order placement.
+
+:func:`place_order` runs in the request transaction and does a fixed amount of
+work however large the cart is, apart from the per-line stock decrements:
+
+- the stock is taken with :func:`apps.inventory.services.reserve`;
+- the products are read once, while their rows are still locked, and
+  priced in one batch by :mod:`apps.pricing.engine`;
+- the order row is inserted;
+- every line is written with a single ``bulk_create``.
+
+Everything that can wait is queued with ``transaction.on_commit`` and runs
+only if the order commits. That covers the confirmation email, the
+listing refresh for products that sold out, and clearing the Redis cart.
+"""
+
+import uuid
+from functools import partial
+
+from django.db import transaction
+
+from apps.cart import services as cart
+from apps.catalog.models import Product
+from apps.inventory.services import confirm
+from apps.inventory.services import merge_lines
+from apps.inventory.services import reserve
+from apps.pricing.engine import Item
+from apps.pricing.engine import load_rules
+
+from .models import Order
+from .models import OrderLine
+from .tasks import send_order_confirmation_email
+
+
+class EmptyCartError(Exception):
+    pass
+
+
+@transaction.atomic
+def place_order(user, lines: dict[int, int] | None = None, coupon: str = "") -> Order:
+    """
+    Place an order for ``lines`` (``{product_id: quantity}``), or for the
+    user's cart when ``lines`` is omitted.
+
+    Raises :class:`EmptyCartError`,
+    :class:`~apps.inventory.services.InsufficientStockError` or
+    :class:`~apps.pricing.engine.InvalidCouponError`; in every case nothing
+    is written.
+    """
+    from_cart = lines is None
+    lines = dict(merge_lines((cart.get_items(user.pk) if from_cart else lines).items()))
+    if not lines:
+        msg = "There is nothing to order."
+        raise EmptyCartError(msg)
+
+    token = uuid.uuid4()
+    reserve(lines.items(), token=token)
+    confirm(token)
+    # Las filas siguen bloqueadas por el UPDATE de reserve(): el precio leído
+    # es el mismo que el stock descontado.
+    products = {
+        product.pk: product
+        for product in Product.objects.filter(pk__in=lines)
+        .select_related("category")
+        .only("pk", "name", "price", "brand_id", "category__path")
+    }
+    priced = load_rules().price(
+        {
+            pk: Item(pk, product.price, product.category.path, product.brand_id)
+            for pk, product in products.items()
+        },
+        lines,
+        coupon=coupon,
+    )
+    order = Order.objects.create(
+        user=user,
+        subtotal=priced.subtotal,
+        coupon_code=priced.coupon_code,
+        discount=priced.coupon_discount,
+        total=priced.total,
+        reservation_token=token,
+    )
+    OrderLine.objects.bulk_create(
+        OrderLine(
+            order=order,
+            product_id=line.product_id,
+            product_name=products[line.product_id].name,
+            list_price=line.list_price,
+            unit_price=line.unit_price,
+            quantity=line.quantity,
+            discount=line.discount,
+            line_total=line.line_total,
+        )
+        for line in priced.lines
+    )
+
+    transaction.on_commit(partial(send_order_confirmation_email.delay, order.pk))
+    if from_cart:
+        transaction.on_commit(partial(cart.clear, user.pk))
+    return order
@@ -0,0 +1,17 @@
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from apps.utils.broadcast import group_send_on_commit
+from apps.utils.broadcast import user_group
+
+from .models import Order
+
+
+@receiver(post_save, sender=Order)
+def order_saved(sender, instance, **kwargs):
+    group_send_on_commit(
+        (
+            user_group(instance.user_id),
+            {"type": "order", "order": instance.pk, "status": instance.status},
+        ),
+    )
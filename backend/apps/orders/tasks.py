@@ -0,0 +1,37 @@
+from celery import shared_task
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives
+from django.template.loader import render_to_string
+
+from .idempotency import prune_idempotency_keys
+from .models import Order
+
+
+@shared_task(bind=True, max_retries=3)
+def send_order_confirmation_email(self, order_id):
+    """Send the order confirmation; queued after the order commits."""
+    order = (
+        Order.objects.select_related("user").prefetch_related("lines").get(pk=order_id)
+    )
+    context = {"order": order, "first_name": order.user.first_name}
+    email = EmailMultiAlternatives(
+        subject=f"Order #{order.pk} confirmed - AllNutrition",
+        body=render_to_string("orders/confirmation_email.txt", context),
+        from_email=settings.DEFAULT_FROM_EMAIL,
+        to=[order.user.email],
+    )
+    email.attach_alternative(
+        render_to_string("orders/confirmation_email.html", context),
+        "text/html",
+    )
+    try:
+        email.send(fail_silently=False)
+    except Exception as exc:
+        raise self.retry(exc=exc, countdown=60 * (2**self.request.retries)) from exc
+    return order.pk
+
+
+@shared_task()
+def prune_idempotency_keys_task():
+    """Forget stored responses older than ``IDEMPOTENCY_KEY_TTL``."""
+    return prune_idempotency_keys(max_age=settings.IDEMPOTENCY_KEY_TTL)
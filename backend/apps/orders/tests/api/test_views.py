@@ -0,0 +1,103 @@
+import pytest
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from apps.catalog.tests.factories import ProductFactory
+from apps.orders.idempotency import REPLAYED_HEADER
+from apps.orders.models import IdempotencyKey
+from apps.orders.models import Order
+from apps.users.tests.factories import UserFactory
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def api_client(user) -> APIClient:
+    client = APIClient()
+    client.force_authenticate(user)
+    return client
+
+
+def place(client, lines, key="key-1"):
+    return client.post(
+        reverse("api:order-list"),
+        {"lines": lines},
+        format="json",
+        headers={"Idempotency-Key": key},
+    )
+
+
+class TestOrderViewSet:
+    def test_requires_idempotency_key(self, api_client):
+        product = ProductFactory()
+
+        response = api_client.post(
+            reverse("api:order-list"),
+            {"lines": [{"product_id": product.pk, "quantity": 1}]},
+            format="json",
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert not Order.objects.exists()
+
+    def test_replays_first_response(self, api_client):
+        product = ProductFactory(stock=5)
+        lines = [{"product_id": product.pk, "quantity": 2}]
+
+        first = place(api_client, lines)
+        second = place(api_client, lines)
+
+        assert first.status_code == status.HTTP_201_CREATED
+        assert second.status_code == status.HTTP_201_CREATED
+        assert second.json() == first.json()
+        assert second[REPLAYED_HEADER] == "true"
+        assert REPLAYED_HEADER not in first
+        assert Order.objects.count() == 1
+        product.refresh_from_db()
+        assert product.stock == 3  # noqa: PLR2004
+
+    def test_key_reused_for_another_body(self, api_client):
+        product = ProductFactory(stock=5)
+        place(api_client, [{"product_id": product.pk, "quantity": 1}])
+
+        response = place(api_client, [{"product_id": product.pk, "quantity": 2}])
+
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+    def test_keys_are_per_user(self, api_client):
+        product = ProductFactory(stock=5)
+        lines = [{"product_id": product.pk, "quantity": 1}]
+        other = APIClient()
+        other.force_authenticate(UserFactory())
+
+        place(api_client, lines)
+        response = place(other, lines)
+
+        assert REPLAYED_HEADER not in response
+        assert Order.objects.count() == 2  # noqa: PLR2004
+
+    def test_failures_are_not_stored(self, api_client):
+        product = ProductFactory(stock=1)
+        lines = [{"product_id": product.pk, "quantity": 2}]
+
+        response = place(api_client, lines)
+        assert response.status_code == status.HTTP_409_CONFLICT
+        assert response.json()["product_id"] == str(product.pk)
+        assert not IdempotencyKey.objects.exists()
+
+        product.stock = 2
+        product.save()
+        assert place(api_client, lines).status_code == status.HTTP_201_CREATED
+
+    def test_lists_own_orders(self, api_client):
+        product = ProductFactory(stock=5)
+        place(api_client, [{"product_id": product.pk, "quantity": 1}])
+        other = APIClient()
+        other.force_authenticate(UserFactory())
+        place(other, [{"product_id": product.pk, "quantity": 1}])
+
+        response = api_client.get(reverse("api:order-list"))
+
+        assert len(response.data["results"]) == 1
+        assert response.data["results"][0]["lines"][0]["quantity"] == 1
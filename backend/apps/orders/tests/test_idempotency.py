@@ -0,0 +1,61 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+import pytest
+from django.db import connection
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from apps.catalog.tests.factories import ProductFactory
+from apps.orders.idempotency import prune_idempotency_keys
+from apps.orders.models import IdempotencyKey
+from apps.orders.models import Order
+
+
+@pytest.mark.django_db(transaction=True)
+def test_concurrent_double_submit_places_one_order(user):
+    product = ProductFactory(stock=10)
+    submits = 6
+    barrier = threading.Barrier(submits)
+
+    def submit(_):
+        client = APIClient()
+        client.force_authenticate(user)
+        barrier.wait()
+        try:
+            return client.post(
+                reverse("api:order-list"),
+                {"lines": [{"product_id": product.pk, "quantity": 1}]},
+                format="json",
+                headers={"Idempotency-Key": "double-click"},
+            )
+        finally:
+            connection.close()
+
+    with ThreadPoolExecutor(max_workers=submits) as pool:
+        responses = list(pool.map(submit, range(submits)))
+
+    assert {response.status_code for response in responses} == {
+        status.HTTP_201_CREATED,
+    }
+    assert len({response.json()["id"] for response in responses}) == 1
+    assert Order.objects.count() == 1
+    product.refresh_from_db()
+    assert product.stock == 9  # noqa: PLR2004
+
+
+@pytest.mark.django_db
+def test_prune_idempotency_keys(user):
+    old, recent = (
+        IdempotencyKey.objects.create(user=user, key=key, fingerprint="x")
+        for key in ("old", "recent")
+    )
+    IdempotencyKey.objects.filter(pk=old.pk).update(
+        created_at=timezone.now() - timedelta(days=2),
+    )
+
+    assert prune_idempotency_keys(timedelta(days=1), batch_size=1) == 1
+    assert list(IdempotencyKey.objects.all()) == [recent]
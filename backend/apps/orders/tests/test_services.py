@@ -0,0 +1,81 @@
+from decimal import Decimal
+
+import pytest
+from django.core import mail
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from apps.cart import services as cart
+from apps.catalog.models import Product
+from apps.catalog.tests.factories import ProductFactory
+from apps.inventory.models import Reservation
+from apps.inventory.services import InsufficientStockError
+from apps.orders.models import Order
+from apps.orders.services import EmptyCartError
+from apps.orders.services import place_order
+
+pytestmark = pytest.mark.django_db
+
+
+class TestPlaceOrder:
+    def test_snapshots_prices_and_takes_stock(self, user):
+        first = ProductFactory(price="10.00", stock=5)
+        second = ProductFactory(price="2.50", stock=1)
+
+        with CaptureQueriesContext(connection) as ctx:
+            order = place_order(user, {second.pk: 1, first.pk: 3})
+
+        line_inserts = [
+            q["sql"] for q in ctx.captured_queries if "INSERT INTO" in q["sql"]
+        ]
+        assert sum('"orders_orderline"' in sql for sql in line_inserts) == 1
+
+        Product.objects.filter(pk=first.pk).update(price=Decimal("99.00"))
+        assert order.total == Decimal("32.50")
+        assert [
+            (line.product_id, line.unit_price, line.quantity)
+            for line in order.lines.all()
+        ] == [(first.pk, Decimal("10.00"), 3), (second.pk, Decimal("2.50"), 1)]
+        first.refresh_from_db()
+        second.refresh_from_db()
+        assert (first.stock, second.stock) == (2, 0)
+        assert set(
+            Reservation.objects.filter(token=order.reservation_token).values_list(
+                "status",
+                flat=True,
+            ),
+        ) == {Reservation.Status.CONFIRMED}
+
+    def test_out_of_stock_writes_nothing(self, user):
+        product = ProductFactory(stock=1)
+
+        with pytest.raises(InsufficientStockError):
+            place_order(user, {product.pk: 2})
+
+        assert not Order.objects.exists()
+        assert not Reservation.objects.exists()
+
+    def test_side_effects_run_after_commit(
+        self,
+        user,
+        redis_client,
+        django_capture_on_commit_callbacks,
+    ):
+        product = ProductFactory(stock=5)
+        cart.add_item(user.pk, product.pk, 2)
+
+        with django_capture_on_commit_callbacks() as callbacks:
+            order = place_order(user)
+            assert not mail.outbox
+
+        for callback in callbacks:
+            callback()
+        assert order.lines.get().quantity == 2  # noqa: PLR2004
+        assert len(mail.outbox) == 1
+        assert f"#{order.pk}" in mail.outbox[0].subject
+        assert cart.get_items(user.pk) == {}
+
+    @pytest.mark.usefixtures("redis_client")
+    def test_empty_cart(self, user):
+        with pytest.raises(EmptyCartError):
+            place_order(user)
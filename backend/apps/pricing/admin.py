@@ -0,0 +1,22 @@
+from django.contrib import admin
+
+from . import models
+
+
+class PromotionAdmin(admin.ModelAdmin):
+    list_display = (
+        "name",
+        "kind",
+        "code",
+        "value",
+        "starts_at",
+        "ends_at",
+        "is_active",
+    )
+    list_filter = ("kind", "is_active")
+    search_fields = ("name", "code")
+    raw_id_fields = ("product", "category", "brand")
+    list_per_page = 25
+
+
+admin.site.register(models.Promotion, PromotionAdmin)
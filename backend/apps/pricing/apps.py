@@ -0,0 +1,10 @@
+from django.apps import AppConfig
+from django.utils.translation import gettext_lazy as _
+
+
+class PricingConfig(AppConfig):
+    name = "apps.pricing"
+    verbose_name = _("Pricing")
+
+    def ready(self):
+        import apps.pricing.signals  # noqa: F401
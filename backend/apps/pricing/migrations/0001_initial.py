@@ -0,0 +1,47 @@
+# Generated by Django 5.1.8 on 2026-10-18 08:58
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('catalog', '0006_listing_sale_price'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Promotion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('name', models.CharField(max_length=255, verbose_name='name')),
+                ('kind', models.CharField(choices=[('sale', 'Sale price'), ('coupon', 'Coupon'), ('buy_x_get_y', 'Buy X get Y'), ('tiered', 'Tiered discount')], max_length=12, verbose_name='kind')),
+                ('discount_type', models.CharField(choices=[('percent', 'Percentage'), ('fixed', 'Fixed amount')], default='percent', max_length=8, verbose_name='discount type')),
+                ('value', models.DecimalField(decimal_places=2, max_digits=10, verbose_name='value')),
+                ('code', models.CharField(blank=True, max_length=50, verbose_name='coupon code')),
+                ('buy_quantity', models.PositiveSmallIntegerField(default=0, verbose_name='buy quantity')),
+                ('get_quantity', models.PositiveSmallIntegerField(default=0, verbose_name='get quantity')),
+                ('tiers', models.JSONField(blank=True, default=list, verbose_name='tiers')),
+                ('min_subtotal', models.DecimalField(decimal_places=2, default=0, max_digits=10, verbose_name='minimum subtotal')),
+                ('starts_at', models.DateTimeField(blank=True, null=True, verbose_name='starts at')),
+                ('ends_at', models.DateTimeField(blank=True, null=True, verbose_name='ends at')),
+                ('is_active', models.BooleanField(default=True, verbose_name='active')),
+                ('brand', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='catalog.brand')),
+                ('category', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='catalog.category')),
+                ('product', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='catalog.product')),
+            ],
+            options={
+                'verbose_name': 'Promotion',
+                'verbose_name_plural': 'Promotions',
+                'ordering': ['-created_at', '-id'],
+                'abstract': False,
+                'indexes': [models.Index(fields=['created_at', 'id'], name='pricing_promotion_keyset')],
+                'constraints': [models.UniqueConstraint(condition=models.Q(('code', ''), _negated=True), fields=('code',), name='pricing_promotion_code_unique')],
+            },
+        ),
+    ]
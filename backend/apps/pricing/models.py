@@ -0,0 +1,102 @@
+from django.core.exceptions import ValidationError
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+from apps.abstract.models import AuditDates
+from apps.catalog.models import Brand
+from apps.catalog.models import Category
+from apps.catalog.models import Product
+
+
+class Promotion(AuditDates):
+    """
+    Regla de precio o descuento.
+
+    El alcance lo fijan ``product``, ``category`` (incluye su subárbol) y
+    ``brand``; sin ninguno aplica a todo el catálogo. Las reglas se evalúan
+    en lote desde ``apps.pricing.engine``.
+    """
+
+    class Kind(models.TextChoices):
+        SALE = "sale", _("Sale price")
+        COUPON = "coupon", _("Coupon")
+        BUY_X_GET_Y = "buy_x_get_y", _("Buy X get Y")
+        TIERED = "tiered", _("Tiered discount")
+
+    class DiscountType(models.TextChoices):
+        PERCENT = "percent", _("Percentage")
+        FIXED = "fixed", _("Fixed amount")
+
+    name = models.CharField(_("name"), max_length=255)
+    kind = models.CharField(_("kind"), max_length=12, choices=Kind.choices)
+    discount_type = models.CharField(
+        _("discount type"),
+        max_length=8,
+        choices=DiscountType.choices,
+        default=DiscountType.PERCENT,
+    )
+    # Porcentaje o importe; en BUY_X_GET_Y es el porcentaje sobre las unidades
+    # de regalo (100 = gratis).
+    value = models.DecimalField(_("value"), max_digits=10, decimal_places=2)
+    code = models.CharField(_("coupon code"), max_length=50, blank=True)
+    product = models.ForeignKey(
+        Product,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="+",
+    )
+    category = models.ForeignKey(
+        Category,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="+",
+    )
+    brand = models.ForeignKey(
+        Brand,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="+",
+    )
+    buy_quantity = models.PositiveSmallIntegerField(_("buy quantity"), default=0)
+    get_quantity = models.PositiveSmallIntegerField(_("get quantity"), default=0)
+    # Pares [cantidad mínima, porcentaje], p. ej. [[3, 5], [10, 12]]
+    tiers = models.JSONField(_("tiers"), default=list, blank=True)
+    min_subtotal = models.DecimalField(
+        _("minimum subtotal"),
+        max_digits=10,
+        decimal_places=2,
+        default=0,
+    )
+    starts_at = models.DateTimeField(_("starts at"), null=True, blank=True)
+    ends_at = models.DateTimeField(_("ends at"), null=True, blank=True)
+    is_active = models.BooleanField(_("active"), default=True)
+
+    class Meta(AuditDates.Meta):
+        verbose_name = _("Promotion")
+        verbose_name_plural = _("Promotions")
+        constraints = [
+            models.UniqueConstraint(
+                fields=["code"],
+                condition=~models.Q(code=""),
+                name="pricing_promotion_code_unique",
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return self.name
+
+    def clean(self):
+        super().clean()
+        if (self.kind == self.Kind.COUPON) != bool(self.code):
+            raise ValidationError({"code": _("Only coupons have a code.")})
+        if self.kind == self.Kind.BUY_X_GET_Y and not (
+            self.buy_quantity and self.get_quantity
+        ):
+            raise ValidationError(
+                {"buy_quantity": _("Set how many units to buy and to get.")},
+            )
+        if self.kind == self.Kind.TIERED and not self.tiers:
+            raise ValidationError({"tiers": _("Add at least one tier.")})
@@ -0,0 +1,20 @@
+from django.db import transaction
+from django.db.models.signals import post_delete
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from apps.catalog.cache import invalidate_catalog_responses
+
+from .engine import bump_rules_version
+from .models import Promotion
+from .tasks import reprice_listings_task
+
+
+@receiver(post_save, sender=Promotion)
+@receiver(post_delete, sender=Promotion)
+def promotion_changed(sender, instance, **kwargs):
+    transaction.on_commit(bump_rules_version)
+    # El detalle de producto calcula sale_price con las reglas al vuelo.
+    invalidate_catalog_responses()
+    # Also for other kinds: a promotion may have just stopped being a sale.
+    transaction.on_commit(reprice_listings_task.delay)
@@ -0,0 +1,12 @@
+from celery import shared_task
+
+from .engine import reprice_listings
+
+
+@shared_task()
+def reprice_listings_task():
+    """
+    Write the current sale prices into ``ProductListing``; runs after sale
+    promotion changes and periodically so start and end dates take effect.
+    """
+    return reprice_listings()
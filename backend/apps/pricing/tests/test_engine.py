@@ -0,0 +1,158 @@
+from datetime import timedelta
+from decimal import Decimal
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from apps.catalog.models import ProductListing
+from apps.catalog.services import refresh_listings
+from apps.catalog.tests.factories import CategoryFactory
+from apps.catalog.tests.factories import ProductFactory
+from apps.pricing.engine import InvalidCouponError
+from apps.pricing.engine import Item
+from apps.pricing.engine import Rule
+from apps.pricing.engine import RuleSet
+from apps.pricing.engine import bump_rules_version
+from apps.pricing.engine import load_rules
+from apps.pricing.engine import reprice_listings
+from apps.pricing.models import Promotion
+
+Kind = Promotion.Kind
+DiscountType = Promotion.DiscountType
+
+NOW = timezone.now()
+
+
+def rule(pk, kind, value, **kwargs):
+    kwargs.setdefault("discount_type", DiscountType.PERCENT)
+    return Rule(id=pk, kind=kind, value=Decimal(value), **kwargs)
+
+
+def item(pk=1, price="100.00", tree_path="1/2/", brand_id=None):
+    return Item(pk, Decimal(price), tree_path, brand_id)
+
+
+class TestRuleSet:
+    def test_lowest_sale_price_wins(self):
+        rules = RuleSet(
+            [
+                rule(1, Kind.SALE, "10"),
+                rule(2, Kind.SALE, "25", category_id=2),
+                rule(3, Kind.SALE, "50", category_id=9),
+                rule(4, Kind.SALE, "30", starts_at=NOW + timedelta(days=1)),
+            ],
+        )
+
+        assert rules.sale_price(item(), NOW) == (Decimal("75.00"), rules.rules[1])
+
+    def test_fixed_discount_never_goes_negative(self):
+        rules = RuleSet([rule(1, Kind.SALE, "500", discount_type=DiscountType.FIXED)])
+
+        assert rules.sale_price(item(), NOW)[0] == Decimal(0)
+
+    def test_best_of_tiered_and_buy_x_get_y(self):
+        tiered = rule(1, Kind.TIERED, "0", tiers=((3, Decimal(5)), (10, Decimal(12))))
+        free = rule(2, Kind.BUY_X_GET_Y, "100", buy_quantity=2, get_quantity=1)
+        rules = RuleSet([tiered, free])
+
+        # 3 uds: 5 % de 300 = 15 frente a una unidad gratis = 100.
+        cart = rules.price({1: item()}, {1: 3}, now=NOW)
+        assert cart.lines[0].discount == Decimal("100.00")
+        assert cart.lines[0].promotion_ids == [2]
+
+        # 10 uds: 12 % de 1000 = 120 frente a tres gratis = 300.
+        rules = RuleSet([tiered])
+        cart = rules.price({1: item()}, {1: 10}, now=NOW)
+        assert cart.lines[0].discount == Decimal("120.00")
+        assert cart.subtotal == Decimal("880.00")
+
+    def test_line_discounts_apply_on_sale_price(self):
+        rules = RuleSet(
+            [
+                rule(1, Kind.SALE, "20"),
+                rule(2, Kind.TIERED, "0", tiers=((2, Decimal(10)),)),
+            ],
+        )
+
+        line = rules.price({1: item()}, {1: 2}, now=NOW).lines[0]
+
+        assert (line.list_price, line.unit_price) == (
+            Decimal("100.00"),
+            Decimal("80.00"),
+        )
+        assert line.discount == Decimal("16.00")
+        assert line.line_total == Decimal("144.00")
+
+    def test_coupon_on_eligible_lines_only(self):
+        rules = RuleSet(
+            [
+                rule(1, Kind.COUPON, "10", code="WELCOME", brand_id=7),
+                rule(
+                    2,
+                    Kind.COUPON,
+                    "15",
+                    code="BIG",
+                    discount_type=DiscountType.FIXED,
+                    min_subtotal=Decimal(500),
+                ),
+            ],
+        )
+        items = {1: item(1, brand_id=7), 2: item(2, "40.00")}
+
+        cart = rules.price(items, {1: 1, 2: 1}, coupon=" welcome ", now=NOW)
+
+        assert cart.coupon_code == "WELCOME"
+        assert cart.coupon_discount == Decimal("10.00")
+        assert cart.total == Decimal("130.00")
+        with pytest.raises(InvalidCouponError):
+            rules.price(items, {1: 1, 2: 1}, coupon="BIG", now=NOW)
+        with pytest.raises(InvalidCouponError):
+            rules.price({2: items[2]}, {2: 1}, coupon="WELCOME", now=NOW)
+        with pytest.raises(InvalidCouponError):
+            rules.price(items, {1: 1}, coupon="NOPE", now=NOW)
+
+
+@pytest.mark.django_db
+class TestLoadRules:
+    def test_cached_until_the_version_changes(self):
+        Promotion.objects.create(name="Sale", kind=Kind.SALE, value=10)
+        bump_rules_version()
+        assert len(load_rules().rules) == 1
+
+        with CaptureQueriesContext(connection) as ctx:
+            load_rules()
+        assert len(ctx.captured_queries) == 0
+
+        Promotion.objects.create(name="Other", kind=Kind.SALE, value=20)
+        assert [r.value for r in load_rules().rules] == [10]
+        bump_rules_version()
+        assert [r.value for r in load_rules().rules] == [10, 20]
+
+    def test_promotion_writes_bump_the_version(
+        self,
+        django_capture_on_commit_callbacks,
+    ):
+        load_rules()
+
+        with django_capture_on_commit_callbacks(execute=True):
+            Promotion.objects.create(name="Sale", kind=Kind.SALE, value=10)
+
+        assert len(load_rules().rules) == 1
+
+
+@pytest.mark.django_db
+def test_reprice_listings_writes_changed_rows_only():
+    category = CategoryFactory()
+    on_sale = ProductFactory(category=category, price="50.00")
+    ProductFactory(price="20.00")
+    refresh_listings()
+    assert not ProductListing.objects.exclude(sale_price=None).exists()
+
+    Promotion.objects.create(name="Sale", kind=Kind.SALE, value=20, category=category)
+    bump_rules_version()
+
+    assert reprice_listings(chunk_size=1) == 1
+    assert ProductListing.objects.get(product=on_sale).sale_price == Decimal("40.00")
+    assert reprice_listings() == 0
@@ -0,0 +1,12 @@
+from django.contrib import admin
+
+from . import models
+
+
+class FrequentlyBoughtTogetherAdmin(admin.ModelAdmin):
+    list_display = ("product", "neighbours", "computed_at")
+    raw_id_fields = ("product",)
+    list_per_page = 25
+
+
+admin.site.register(models.FrequentlyBoughtTogether, FrequentlyBoughtTogetherAdmin)
@@ -0,0 +1,129 @@
+import time
+
+import numpy as np
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+from django.utils import timezone
+
+from apps.catalog.api.views import ProductViewSet
+from apps.catalog.management.commands.benchmark_catalog import BENCH_PREFIX
+from apps.catalog.models import Product
+from apps.recommendations.services import COSINE
+from apps.recommendations.services import LIFT
+from apps.recommendations.services import RECOMMENDATIONS
+from apps.recommendations.services import co_occurrence
+from apps.recommendations.services import normalize
+from apps.recommendations.services import store_neighbours
+from apps.recommendations.services import top_neighbours
+from apps.utils.benchmark import format_summary
+from apps.utils.benchmark import measure
+from apps.utils.benchmark import request_factory
+from apps.utils.response_cache import bump
+
+
+class Command(BaseCommand):
+    help = (
+        "Time the recommendation job over synthetic order lines and report "
+        "p50/p95/p99 latency of the bought-together endpoint."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--lines", type=int, default=1_000_000)
+        parser.add_argument("--products", type=int, default=20_000)
+        parser.add_argument("--top", type=int, default=10)
+        parser.add_argument("--metric", choices=[COSINE, LIFT], default=COSINE)
+        parser.add_argument("--min-count", type=int, default=2)
+        parser.add_argument("--runs", type=int, default=200)
+
+    def handle(self, *args, **options):
+        # Los productos sintéticos de benchmark_catalog dan ids reales.
+        product_ids = np.fromiter(
+            Product.objects.filter(slug__startswith=BENCH_PREFIX)
+            .order_by("pk")
+            .values_list("pk", flat=True)[: options["products"]],
+            dtype=np.int64,
+        )
+        if len(product_ids) < options["products"]:
+            msg = (
+                f"Only {len(product_ids)} synthetic products; run "
+                f"benchmark_catalog --products {options['products']} first."
+            )
+            raise CommandError(msg)
+
+        orders, products = self.baskets(product_ids, options["lines"])
+        self.stdout.write(
+            f"{len(products)} lines, {orders[-1] + 1} orders, "
+            f"{len(np.unique(products))} distinct products",
+        )
+
+        start = time.perf_counter()
+        ids, counts = self.stage(
+            "co-occurrence",
+            lambda: co_occurrence(orders, products),
+        )
+        scores = self.stage(
+            f"normalize ({options['metric']})",
+            lambda: normalize(
+                counts,
+                orders[-1] + 1,
+                options["metric"],
+                options["min_count"],
+            ),
+        )
+        rows = self.stage(
+            f"top {options['top']}",
+            lambda: list(top_neighbours(ids, scores, options["top"])),
+        )
+        stored = self.stage("store", lambda: store_neighbours(rows, timezone.now()))
+        self.stdout.write(
+            f"total: {time.perf_counter() - start:.2f}s, "
+            f"{counts.nnz} co-occurring pairs, {stored} products stored",
+        )
+
+        view = ProductViewSet.as_view({"get": "bought_together"})
+        factory = request_factory()
+        slug = Product.objects.values_list("slug", flat=True).get(pk=ids[0])
+        url = f"/api/products/{slug}/bought-together/"
+
+        def get():
+            response = view(factory.get(url), slug=slug)
+            response.render()
+            return response
+
+        def get_uncached():
+            bump(RECOMMENDATIONS)
+            return get()
+
+        for label, func in {
+            "bought together (cache miss)": get_uncached,
+            "bought together (cache hit)": get,
+        }.items():
+            timings, queries = measure(func, options["runs"])
+            self.stdout.write(format_summary(label, timings, queries))
+
+    def baskets(self, product_ids, total):
+        """
+        Orders of 1 to 8 lines with a long-tailed product popularity; in a
+        third of the orders the second line is the "partner" of the first
+        (ids paired 0-1, 2-3, ...) so there are real pairs to find.
+        """
+        rng = np.random.default_rng(42)
+        sizes = rng.integers(1, 9, size=total // 4)
+        sizes = sizes[np.cumsum(sizes) <= total]
+        orders = np.repeat(np.arange(len(sizes)), sizes)
+        popularity = 1 / np.arange(1, len(product_ids) + 1) ** 0.8
+        products = rng.choice(
+            len(product_ids),
+            size=len(orders),
+            p=popularity / popularity.sum(),
+        )
+        starts = np.cumsum(sizes) - sizes
+        paired = starts[(sizes > 1) & (rng.random(len(sizes)) < 1 / 3)]
+        products[paired + 1] = np.minimum(products[paired] ^ 1, len(product_ids) - 1)
+        return orders, product_ids[products]
+
+    def stage(self, label, func):
+        start = time.perf_counter()
+        result = func()
+        self.stdout.write(f"{label}: {(time.perf_counter() - start) * 1000:.0f}ms")
+        return result
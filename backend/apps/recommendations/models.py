@@ -0,0 +1,33 @@
+from django.contrib.postgres.fields import ArrayField
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+from apps.catalog.models import Product
+
+
+class FrequentlyBoughtTogether(models.Model):
+    """
+    Productos que más se compran junto a ``product``, de mayor a menor
+    puntuación.
+
+    Lo reescribe entero ``apps.recommendations.services.compute_recommendations``;
+    servir las recomendaciones de un producto es leer una sola fila.
+    """
+
+    product = models.OneToOneField(
+        Product,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="+",
+    )
+    # Ids de producto; pueden apuntar a productos ya borrados o inactivos
+    neighbours = ArrayField(models.BigIntegerField())
+    scores = ArrayField(models.FloatField())
+    computed_at = models.DateTimeField()
+
+    class Meta:
+        verbose_name = _("Frequently bought together")
+        verbose_name_plural = _("Frequently bought together")
+
+    def __str__(self) -> str:
+        return f"Bought with {self.product_id}"
@@ -0,0 +1,209 @@
+"""
+Offline "frequently bought together" recommendations.
+
+:func:`compute_recommendations` runs from a nightly beat task:
+
+1. :func:`load_baskets` streams the ``(order_id, product_id)`` pairs of the
+   recent, non-cancelled order lines into two NumPy arrays.
+2. :func:`co_occurrence` builds the sparse orders-by-products matrix ``X`` and
+   multiplies ``X.T @ X``, so that cell ``(i, j)`` counts the orders with both
+   products and the diagonal counts the orders with each one.
+3. :func:`normalize` turns counts into cosine or lift scores, so that
+   best sellers do not show up as everybody's neighbour.
+4. :func:`top_neighbours` keeps the best ``RECOMMENDATIONS_TOP_N`` per product
+   and :func:`store_neighbours` replaces ``FrequentlyBoughtTogether`` with
+   ``COPY`` in one transaction.
+
+Serving a product's recommendations is then one primary-key read plus the
+listing rows of the neighbours; see :func:`bought_together`.
+"""
+
+from array import array
+from collections.abc import Iterable
+from collections.abc import Iterator
+from datetime import datetime
+from itertools import batched
+
+import numpy as np
+from django.conf import settings
+from django.db import connection
+from django.db import transaction
+from django.utils import timezone
+from scipy import sparse
+
+from apps.catalog.models import Product
+from apps.catalog.models import ProductListing
+from apps.orders.models import Order
+from apps.orders.models import OrderLine
+from apps.utils.db_router import use_replicas
+from apps.utils.response_cache import bump_on_commit
+
+from .models import FrequentlyBoughtTogether
+
+# Grupo de la caché de respuestas que se invalida al recalcular
+RECOMMENDATIONS = "recommendations"
+COSINE = "cosine"
+LIFT = "lift"
+
+Neighbours = tuple[int, list[int], list[float]]
+
+
+def load_baskets(
+    since: datetime,
+    chunk_size: int = 10_000,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Order and product ids of the non-cancelled order lines since ``since``."""
+    lines = (
+        OrderLine.objects.filter(order__created_at__gte=since, product__isnull=False)
+        .exclude(order__status=Order.Status.CANCELLED)
+        .order_by()
+        .values_list("order_id", "product_id")
+    )
+    orders = array("q")
+    products = array("q")
+    with transaction.atomic(using=lines.db):
+        for batch in batched(lines.iterator(chunk_size=chunk_size), chunk_size):
+            order_ids, product_ids = zip(*batch, strict=True)
+            orders.extend(order_ids)
+            products.extend(product_ids)
+    return np.frombuffer(orders, dtype=np.int64), np.frombuffer(
+        products,
+        dtype=np.int64,
+    )
+
+
+def co_occurrence(
+    orders: np.ndarray,
+    products: np.ndarray,
+) -> tuple[np.ndarray, sparse.csr_array]:
+    """
+    Product ids and the products-by-products matrix of orders shared by each
+    pair; the diagonal holds the orders of each product.
+    """
+    order_ids, rows = np.unique(orders, return_inverse=True)
+    product_ids, cols = np.unique(products, return_inverse=True)
+    baskets = sparse.csr_array(
+        (np.ones(len(rows), dtype=np.float32), (rows, cols)),
+        shape=(len(order_ids), len(product_ids)),
+    )
+    # Dos líneas del mismo producto en un pedido cuentan una vez.
+    baskets.sum_duplicates()
+    baskets.data[:] = 1
+    return product_ids, (baskets.T @ baskets).tocsr()
+
+
+def normalize(
+    counts: sparse.csr_array,
+    order_count: int,
+    metric: str = COSINE,
+    min_count: int = 1,
+) -> sparse.csr_array:
+    """
+    Score each pair from its co-occurrence count ``c`` and the order counts
+    ``a`` and ``b`` of both products:
+
+    - cosine: ``c / sqrt(a * b)``, in ``(0, 1]``;
+    - lift: ``c * orders / (a * b)``, above 1 when bought together more than
+      chance would predict.
+
+    Pairs seen in fewer than ``min_count`` orders are dropped.
+    """
+    totals = counts.diagonal()
+    pairs = counts.copy()
+    pairs.setdiag(0)
+    pairs.data[pairs.data < min_count] = 0
+    pairs.eliminate_zeros()
+    if metric == COSINE:
+        scale = sparse.diags_array(1 / np.sqrt(totals))
+        return (scale @ pairs @ scale).tocsr()
+    if metric == LIFT:
+        scale = sparse.diags_array(1 / totals)
+        return (scale @ pairs @ scale * order_count).tocsr()
+    msg = f"Unknown recommendation metric {metric!r}."
+    raise ValueError(msg)
+
+
+def top_neighbours(
+    product_ids: np.ndarray,
+    scores: sparse.csr_array,
+    top_n: int,
+) -> Iterator[Neighbours]:
+    """``(product_id, neighbour_ids, scores)`` of every product with neighbours."""
+    for row in range(scores.shape[0]):
+        start, end = scores.indptr[row], scores.indptr[row + 1]
+        if start == end:
+            continue
+        data = scores.data[start:end]
+        cols = scores.indices[start:end]
+        if end - start > top_n:
+            # Selección parcial en O(n); solo se ordenan los top_n.
+            best = np.argpartition(-data, top_n - 1)[:top_n]
+            data, cols = data[best], cols[best]
+        ids = product_ids[cols]
+        order = np.lexsort((ids, -data))
+        yield (
+            int(product_ids[row]),
+            ids[order].tolist(),
+            data[order].round(6).tolist(),
+        )
+
+
+def store_neighbours(rows: Iterable[Neighbours], computed_at: datetime) -> int:
+    """Replace the whole table with ``rows``; returns how many were stored."""
+    table = connection.ops.quote_name(FrequentlyBoughtTogether._meta.db_table)  # noqa: SLF001
+    # Productos borrados desde que se leyeron los pedidos.
+    existing = set(Product.objects.values_list("pk", flat=True))
+    stored = 0
+    with transaction.atomic(), connection.cursor() as cursor:
+        # DELETE y no TRUNCATE: las lecturas ven la tabla anterior hasta el commit.
+        cursor.execute(f"DELETE FROM {table}")  # noqa: S608
+        with cursor.copy(
+            f"COPY {table} (product_id, neighbours, scores, computed_at) FROM STDIN",
+        ) as copy:
+            for product_id, neighbours, scores in rows:
+                if product_id in existing:
+                    copy.write_row((product_id, neighbours, scores, computed_at))
+                    stored += 1
+    bump_on_commit(RECOMMENDATIONS)
+    return stored
+
+
+def compute_recommendations(now: datetime | None = None) -> int:
+    """Recompute every product's neighbours; returns how many were stored."""
+    now = now or timezone.now()
+    # Unos segundos de retraso no cambian el histórico de pedidos.
+    with use_replicas():
+        orders, products = load_baskets(now - settings.RECOMMENDATIONS_WINDOW)
+    if not len(orders):
+        return store_neighbours([], now)
+    product_ids, counts = co_occurrence(orders, products)
+    scores = normalize(
+        counts,
+        len(np.unique(orders)),
+        settings.RECOMMENDATIONS_METRIC,
+        settings.RECOMMENDATIONS_MIN_CO_OCCURRENCE,
+    )
+    return store_neighbours(
+        top_neighbours(product_ids, scores, settings.RECOMMENDATIONS_TOP_N),
+        now,
+    )
+
+
+def bought_together(product_slug: str) -> list[ProductListing]:
+    """Listing rows of the stored neighbours of a product, best first."""
+    neighbours = (
+        FrequentlyBoughtTogether.objects.filter(
+            product__slug=product_slug,
+            product__is_active=True,
+        )
+        .values_list("neighbours", flat=True)
+        .first()
+    )
+    if not neighbours:
+        return []
+    # Los productos inactivos no tienen fila en ProductListing.
+    listings = ProductListing.objects.defer("search_vector").in_bulk(
+        neighbours,
+        field_name="product_id",
+    )
+    return [listings[pk] for pk in neighbours if pk in listings]
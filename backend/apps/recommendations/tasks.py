@@ -0,0 +1,9 @@
+from celery import shared_task
+
+from .services import compute_recommendations
+
+
+@shared_task()
+def compute_recommendations_task():
+    """Nightly rebuild of the "frequently bought together" table."""
+    return compute_recommendations()
@@ -0,0 +1,157 @@
+import uuid
+from datetime import timedelta
+
+import numpy as np
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from apps.catalog.services import refresh_listings
+from apps.catalog.tests.factories import ProductFactory
+from apps.orders.models import Order
+from apps.orders.models import OrderLine
+from apps.recommendations.models import FrequentlyBoughtTogether
+from apps.recommendations.services import LIFT
+from apps.recommendations.services import RECOMMENDATIONS
+from apps.recommendations.services import co_occurrence
+from apps.recommendations.services import compute_recommendations
+from apps.recommendations.services import normalize
+from apps.recommendations.services import top_neighbours
+from apps.utils.response_cache import CACHE_HEADER
+from apps.utils.response_cache import bump
+
+# Pedidos 1-3: el 10 y el 20 van juntos dos veces; el 30 una vez con cada uno.
+ORDERS = np.array([1, 1, 1, 2, 2, 3, 3, 3])
+PRODUCTS = np.array([10, 20, 20, 10, 20, 10, 30, 30])
+
+
+def place_order(user, products, status=Order.Status.PLACED, created_at=None):
+    order = Order.objects.create(
+        user=user,
+        status=status,
+        subtotal=0,
+        total=0,
+        reservation_token=uuid.uuid4(),
+    )
+    OrderLine.objects.bulk_create(
+        OrderLine(
+            order=order,
+            product=product,
+            product_name=product.name,
+            list_price=product.price,
+            unit_price=product.price,
+            quantity=1,
+            line_total=product.price,
+        )
+        for product in products
+    )
+    if created_at:
+        Order.objects.filter(pk=order.pk).update(created_at=created_at)
+    return order
+
+
+class TestCoOccurrence:
+    def test_counts_orders_once_per_pair(self):
+        ids, counts = co_occurrence(ORDERS, PRODUCTS)
+
+        assert ids.tolist() == [10, 20, 30]
+        assert counts.toarray().tolist() == [[3, 2, 1], [2, 2, 0], [1, 0, 1]]
+
+    def test_cosine(self):
+        _, counts = co_occurrence(ORDERS, PRODUCTS)
+
+        scores = normalize(counts, order_count=3).toarray()
+
+        assert scores[0, 1] == pytest.approx(2 / np.sqrt(3 * 2))
+        assert scores[0, 2] == pytest.approx(1 / np.sqrt(3))
+        assert scores.diagonal().tolist() == [0, 0, 0]
+
+    def test_lift_and_min_count(self):
+        _, counts = co_occurrence(ORDERS, PRODUCTS)
+
+        scores = normalize(counts, order_count=3, metric=LIFT, min_count=2)
+
+        assert scores.toarray()[0, 1] == pytest.approx(2 * 3 / (3 * 2))
+        assert scores.nnz == 2  # noqa: PLR2004
+
+    def test_unknown_metric(self):
+        _, counts = co_occurrence(ORDERS, PRODUCTS)
+
+        with pytest.raises(ValueError, match="metric"):
+            normalize(counts, order_count=3, metric="jaccard")
+
+    def test_top_neighbours_are_sorted_and_truncated(self):
+        ids, counts = co_occurrence(ORDERS, PRODUCTS)
+        scores = normalize(counts, order_count=3)
+
+        rows = list(top_neighbours(ids, scores, top_n=1))
+
+        assert [(pk, neighbours) for pk, neighbours, _ in rows] == [
+            (10, [20]),
+            (20, [10]),
+            (30, [10]),
+        ]
+
+
+@pytest.mark.django_db
+class TestComputeRecommendations:
+    def test_stores_neighbours_of_recent_orders(self, user, settings):
+        settings.RECOMMENDATIONS_MIN_CO_OCCURRENCE = 1
+        shirt, tie, socks, hat = ProductFactory.create_batch(4)
+        place_order(user, [shirt, tie])
+        place_order(user, [shirt, tie, socks])
+        place_order(user, [shirt, hat], status=Order.Status.CANCELLED)
+        place_order(
+            user,
+            [socks, hat],
+            created_at=timezone.now() - settings.RECOMMENDATIONS_WINDOW,
+        )
+        FrequentlyBoughtTogether.objects.create(
+            product=hat,
+            neighbours=[shirt.pk],
+            scores=[1],
+            computed_at=timezone.now() - timedelta(days=1),
+        )
+
+        assert compute_recommendations() == 3  # noqa: PLR2004
+
+        stored = dict(
+            FrequentlyBoughtTogether.objects.values_list("product_id", "neighbours"),
+        )
+        assert stored == {
+            shirt.pk: [tie.pk, socks.pk],
+            tie.pk: [shirt.pk, socks.pk],
+            socks.pk: [shirt.pk, tie.pk],
+        }
+
+    def test_endpoint_serves_stored_neighbours(self):
+        shirt, tie, socks = ProductFactory.create_batch(3)
+        inactive = ProductFactory(is_active=False)
+        refresh_listings()
+        client = APIClient()
+        url = reverse("api:product-bought-together", args=[shirt.slug])
+        assert client.get(url).data == {"results": []}
+
+        FrequentlyBoughtTogether.objects.create(
+            product=shirt,
+            neighbours=[socks.pk, inactive.pk, tie.pk],
+            scores=[0.9, 0.8, 0.5],
+            computed_at=timezone.now(),
+        )
+        bump(RECOMMENDATIONS)
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = client.get(url)
+
+        assert response[CACHE_HEADER] == "MISS"
+        assert [row["slug"] for row in response.data["results"]] == [
+            socks.slug,
+            tie.slug,
+        ]
+        statements = [
+            q["sql"] for q in ctx.captured_queries if "SAVEPOINT" not in q["sql"]
+        ]
+        assert len(statements) == 2  # noqa: PLR2004
@@ -2,6 +2,13 @@ from django.contrib import admin
 from . import models
 
 from django.contrib.auth import get_user_model
+
+from apps.utils.exports import CSV
+from apps.utils.exports import NDJSON
+from apps.utils.exports import export_action
+
+from .exports import USER_EXPORT_COLUMNS
+
 User = get_user_model()
 
 class UserAdmin(admin.ModelAdmin):
@@ -9,5 +16,9 @@ class UserAdmin(admin.ModelAdmin):
     list_display_links = ('first_name', 'last_name', 'email')
     search_fields = ('first_name', 'last_name', 'email', 'is_staff', 'is_superuser', 'is_active', 'last_login')
     list_per_page = 25
+    actions = [
+        export_action(USER_EXPORT_COLUMNS, CSV, 'users'),
+        export_action(USER_EXPORT_COLUMNS, NDJSON, 'users'),
+    ]
 
 admin.site.register(models.User, UserAdmin)
\ No newline at end of file
@@ -0,0 +1,14 @@
+from asgiref.sync import sync_to_async
+
+from apps.users.serializers import UserCreateSerializer
+from apps.utils.async_views import AsyncReadView
+
+
+class AsyncCurrentUserView(AsyncReadView):
+    """Async ``GET api/auth/users/me/``: the same fields as djoser's."""
+
+    authentication_required = True
+
+    async def read(self, request):
+        # El usuario del token solo trae sus claims: el resto sale de la base.
+        return await sync_to_async(lambda: UserCreateSerializer(request.user).data)()
@@ -0,0 +1,29 @@
+from drf_spectacular.utils import OpenApiTypes
+from drf_spectacular.utils import extend_schema
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from rest_framework.viewsets import ViewSet
+
+from apps.users.exports import USER_EXPORT_COLUMNS
+from apps.users.hashers import hashing_totals
+from apps.users.hashers import worker_hashing_stats
+from apps.users.models import User
+from apps.utils.exports import ExportViewSet
+
+
+@extend_schema(responses={(200, "text/csv"): OpenApiTypes.STR})
+class UserExportViewSet(ExportViewSet):
+    queryset = User.objects.order_by("pk")
+    export_columns = USER_EXPORT_COLUMNS
+    export_name = "users"
+
+
+class PasswordHashingStatsViewSet(ViewSet):
+    """Queue and throughput of every worker's password hashing pool."""
+
+    permission_classes = [IsAdminUser]
+
+    @extend_schema(operation_id="password_hashing_stats", responses=OpenApiTypes.OBJECT)
+    def list(self, request):
+        workers = worker_hashing_stats()
+        return Response({**hashing_totals(workers), "workers": workers})
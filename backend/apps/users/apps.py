@@ -1,5 +1,3 @@
-import contextlib
-
 from django.apps import AppConfig
 from django.utils.translation import gettext_lazy as _
 
@@ -8,6 +6,7 @@ class UsersConfig(AppConfig):
     name = "apps.users"
     verbose_name = _("Users")
 
-    # def ready(self):
-        # with contextlib.suppress(ImportError):
-            # import apps.users.signals  # noqa: F401
+    def ready(self):
+        import apps.users.hashers
+        import apps.users.schema
+        import apps.users.signals  # noqa: F401
@@ -0,0 +1,145 @@
+"""
+Stateless JWT authentication from the access token's claims.
+
+``ClaimsAccessToken`` carries the user's id, email, ``is_active``,
+``is_staff`` and ``token_version``. :class:`ClaimsJWTAuthentication` builds
+the request user from them instead of loading the row: a ``User`` whose
+other fields are deferred, so a view that reads one (``first_name``,
+``is_superuser``, ``has_perm``...) loads the rest of the row in one query.
+
+Every change to a user's permissions, active flag or email bumps
+``User.token_version`` (:mod:`apps.users.signals`), which invalidates every
+token issued before: none can return or save back a stale claim. The
+current version of each user is cached, so the check costs a cache read
+rather than a query. Tokens without claims, issued before these ones, are
+still authenticated against the database.
+"""
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+from django.db import transaction
+from django.db.models import F
+from django.utils.translation import gettext_lazy as _
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+
+from .tokens import USER_CLAIMS
+from .tokens import VERSION_CLAIM
+from .tokens import ClaimsRefreshToken
+
+VERSION_KEY = "auth:version:{}"
+
+
+def version_timeout() -> int:
+    return int(jwt_settings.ACCESS_TOKEN_LIFETIME.total_seconds())
+
+
+def _versions():
+    # Del primario: una réplica con retraso aceptaría tokens revocados.
+    return get_user_model()._default_manager.using(DEFAULT_DB_ALIAS)  # noqa: SLF001
+
+
+def current_version(user_id) -> int | None:
+    """``token_version`` of the user, or ``None`` if it does not exist."""
+    key = VERSION_KEY.format(user_id)
+    version = cache.get(key)
+    if version is None:
+        version = (
+            _versions()
+            .filter(pk=user_id)
+            .values_list("token_version", flat=True)
+            .first()
+        )
+        # add: no pisa la versión que revoke_tokens acabe de guardar.
+        if version is not None:
+            cache.add(key, version, version_timeout())
+    return version
+
+
+async def acurrent_version(user_id) -> int | None:
+    key = VERSION_KEY.format(user_id)
+    version = await cache.aget(key)
+    if version is None:
+        version = (
+            await _versions()
+            .filter(pk=user_id)
+            .values_list("token_version", flat=True)
+            .afirst()
+        )
+        if version is not None:
+            await cache.aadd(key, version, version_timeout())
+    return version
+
+
+def revoke_tokens(user_ids) -> None:
+    """Invalidate every token issued so far to ``user_ids``."""
+    users = _versions().filter(pk__in=list(user_ids))
+    users.update(token_version=F("token_version") + 1)
+    versions = {
+        VERSION_KEY.format(pk): version
+        for pk, version in users.values_list("pk", "token_version")
+    }
+    transaction.on_commit(lambda: cache.set_many(versions, version_timeout()))
+
+
+def user_from_claims(token):
+    """The token's user, with every field but the claimed ones deferred."""
+    claims = {
+        "id": token[jwt_settings.USER_ID_CLAIM],
+        **{claim: token[claim] for claim in USER_CLAIMS},
+        "token_version": token[VERSION_CLAIM],
+    }
+    User = get_user_model()  # noqa: N806
+    # from_db espera los valores en el orden de los campos del modelo.
+    fields = [
+        field.attname
+        for field in User._meta.concrete_fields  # noqa: SLF001
+        if field.attname in claims
+    ]
+    return User.from_db(DEFAULT_DB_ALIAS, fields, [claims[name] for name in fields])
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    """``JWTAuthentication`` that trusts the claims of current tokens."""
+
+    def get_user(self, validated_token):
+        if VERSION_CLAIM not in validated_token:
+            return super().get_user(validated_token)
+        version = current_version(validated_token[jwt_settings.USER_ID_CLAIM])
+        return self.claims_user(validated_token, version)
+
+    async def aget_user(self, validated_token):
+        if VERSION_CLAIM not in validated_token:
+            return await sync_to_async(super().get_user)(validated_token)
+        version = await acurrent_version(
+            validated_token[jwt_settings.USER_ID_CLAIM],
+        )
+        return self.claims_user(validated_token, version)
+
+    def claims_user(self, validated_token, version: int | None):
+        if version is None:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+        if validated_token[VERSION_CLAIM] != version:
+            raise AuthenticationFailed(
+                _("Token has been revoked"),
+                code="token_revoked",
+            )
+        if jwt_settings.CHECK_USER_IS_ACTIVE and not validated_token["is_active"]:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        return user_from_claims(validated_token)
+
+
+class TokenStrategy:
+    """djoser's social login token strategy, issuing claims tokens."""
+
+    @classmethod
+    def obtain(cls, user):
+        refresh = ClaimsRefreshToken.for_user(user)
+        return {
+            "access": str(refresh.access_token),
+            "refresh": str(refresh),
+            "user": user,
+        }
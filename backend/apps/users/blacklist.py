@@ -0,0 +1,183 @@
+"""
+Bloom filter in Redis in front of simplejwt's refresh token blacklist.
+
+``BLACKLIST_AFTER_ROTATION`` blacklists every refresh token as it is used,
+and each refresh asks Postgres whether the presented token is blacklisted.
+Here each refresh asks the filter first and only goes to Postgres when it
+answers "maybe" (about 1% of the unblacklisted tokens, plus the blacklisted
+ones).
+
+- There is one filter per day of token expiry, a bitmap of
+  ``TOKEN_BLACKLIST_BLOOM_BITS`` bits probed at
+  ``TOKEN_BLACKLIST_BLOOM_HASHES`` positions. A filter expires once every
+  token in it has.
+- A blacklisted token enters the filter when its ``BlacklistedToken`` row is
+  saved, before the transaction commits: a rollback leaves a false positive,
+  never a false negative.
+- The filters are only trusted while ``READY_KEY`` exists. Without it
+  (Redis restarted, or a write to the filter failed) every check goes to
+  Postgres and a task rebuilds the filters from the table. A failed write
+  also bumps ``GENERATION_KEY``, now and when its transaction commits; a
+  rebuild that saw another generation when it started does not set
+  ``READY_KEY``, because its query may have missed that token.
+- Expired tokens are pruned from both tables in chunks every night
+  (:func:`prune_token_blacklist`).
+"""
+
+import hashlib
+from collections.abc import Iterable
+from datetime import UTC
+from datetime import datetime
+from datetime import timedelta
+from itertools import batched
+
+import redis
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+from rest_framework_simplejwt.token_blacklist.models import OutstandingToken
+
+from apps.utils.redis import get_redis
+
+FILTER_KEY = "auth:blacklist:{}"
+READY_KEY = "auth:blacklist:ready"
+GENERATION_KEY = "auth:blacklist:generation"
+REBUILD_LOCK = "auth:blacklist:rebuilding"
+
+
+def filter_key(expires_at: datetime) -> str:
+    return FILTER_KEY.format(expires_at.astimezone(UTC).strftime("%Y%m%d"))
+
+
+def offsets(jti: str) -> list[int]:
+    # Doble hash: k posiciones a partir de dos mitades de un solo digest.
+    digest = hashlib.blake2b(jti.encode(), digest_size=16).digest()
+    first = int.from_bytes(digest[:8])
+    step = int.from_bytes(digest[8:]) | 1
+    bits = settings.TOKEN_BLACKLIST_BLOOM_BITS
+    return [
+        (first + i * step) % bits for i in range(settings.TOKEN_BLACKLIST_BLOOM_HASHES)
+    ]
+
+
+def add(tokens: Iterable[tuple[str, datetime]]) -> bool:
+    """Put ``(jti, expires_at)`` pairs in their day's filter, if Redis can."""
+    pipe = get_redis().pipeline(transaction=False)
+    for jti, expires_at in tokens:
+        key = filter_key(expires_at)
+        fields = []
+        for offset in offsets(jti):
+            fields += ["SET", "u1", offset, 1]
+        pipe.execute_command("BITFIELD", key, *fields)
+        # El filtro vive hasta que caduca el último token de su día.
+        day_end = expires_at.astimezone(UTC).replace(
+            hour=0,
+            minute=0,
+            second=0,
+            microsecond=0,
+        ) + timedelta(days=1)
+        pipe.expireat(key, day_end + timedelta(minutes=5))
+    try:
+        pipe.execute()
+    except redis.RedisError:
+        # Un filtro incompleto no puede decir "no": que decida Postgres. Si
+        # tampoco se puede invalidar, el error deshace la transacción. Al
+        # confirmar se invalida otra vez: una reconstrucción empezada antes
+        # no veía aún esta fila.
+        invalidate()
+        transaction.on_commit(invalidate, robust=True)
+        return False
+    return True
+
+
+def invalidate() -> None:
+    """Stop trusting the filters, and any rebuild under way, until the next."""
+    client = get_redis()
+    client.delete(READY_KEY)
+    client.incr(GENERATION_KEY)
+
+
+def may_be_blacklisted(jti: str, expires_at: datetime) -> bool:
+    """``False`` only if the token is surely not blacklisted."""
+    fields = []
+    for offset in offsets(jti):
+        fields += ["GET", "u1", offset]
+    pipe = get_redis().pipeline(transaction=False)
+    pipe.exists(READY_KEY)
+    pipe.execute_command("BITFIELD", filter_key(expires_at), *fields)
+    try:
+        ready, bits = pipe.execute()
+    except redis.RedisError:
+        return True
+    if not ready:
+        schedule_rebuild()
+        return True
+    return all(bits)
+
+
+def schedule_rebuild() -> None:
+    from .tasks import rebuild_token_blacklist_filter_task
+
+    try:
+        queued = get_redis().set(REBUILD_LOCK, 1, nx=True, ex=600)
+    except redis.RedisError:
+        return
+    if queued:
+        rebuild_token_blacklist_filter_task.delay()
+
+
+def rebuild(batch_size: int = 5000) -> int:
+    """Refill the filters from Postgres; returns how many tokens it added."""
+    client = get_redis()
+    generation = client.get(GENERATION_KEY)
+    tokens = (
+        BlacklistedToken.objects.filter(token__expires_at__gt=timezone.now())
+        .values_list("token__jti", "token__expires_at")
+        .iterator(chunk_size=batch_size)
+    )
+    added = 0
+    # El cursor de servidor, dentro de una transacción (ver apps.utils.db_pool).
+    with transaction.atomic():
+        for batch in batched(tokens, batch_size):
+            if not add(batch):
+                break
+            added += len(batch)
+        else:
+            # Los tokens que entren mientras tanto ya los añade la señal.
+            mark_ready(client, generation)
+    # Sin READY_KEY la próxima comprobación lo vuelve a intentar.
+    client.delete(REBUILD_LOCK)
+    return added
+
+
+def mark_ready(client, generation) -> bool:
+    """Set ``READY_KEY`` if ``GENERATION_KEY`` is still ``generation``."""
+    with client.pipeline() as pipe:
+        try:
+            pipe.watch(GENERATION_KEY)
+            if pipe.get(GENERATION_KEY) != generation:
+                return False
+            pipe.multi()
+            pipe.set(READY_KEY, timezone.now().isoformat())
+            pipe.execute()
+        except redis.WatchError:
+            return False
+    return True
+
+
+def prune_token_blacklist(batch_size: int = 5000) -> int:
+    """Delete expired outstanding tokens in batches; returns how many."""
+    now = timezone.now()
+    deleted = 0
+    while True:
+        pks = list(
+            OutstandingToken.objects.filter(expires_at__lte=now)
+            .order_by("pk")
+            .values_list("pk", flat=True)[:batch_size],
+        )
+        if not pks:
+            return deleted
+        # Borra también sus BlacklistedToken (on_delete=CASCADE).
+        OutstandingToken.objects.filter(pk__in=pks).delete()
+        deleted += len(pks)
@@ -0,0 +1,76 @@
+"""
+djoser's emails, rendered and sent by Celery after the commit.
+
+djoser sends its emails inside the request (``EMAIL.<name>(request,
+context).send(to)``), so signup, activation and password resets waited on
+the SMTP server for up to ``EMAIL_TIMEOUT`` seconds. ``DJOSER["EMAIL"]``
+points every email at one of the classes below instead: their ``send`` only
+records the class, the user and the request's domain, protocol and site
+name, and queues :func:`apps.users.tasks.send_djoser_email` once the
+transaction commits. The task builds the email again without the request,
+so its tokens and links come from the user as committed.
+
+Another email goes through Celery by putting :class:`CeleryEmailMixin`
+first in its bases.
+"""
+
+from functools import partial
+
+from django.db import transaction
+from djoser import email
+
+SITE_CONTEXT = ("domain", "protocol", "site_name")
+
+
+class CeleryEmailMixin(email.BaseDjoserEmail):
+    """Queues the email for Celery on ``send``; ``send_now`` sends it."""
+
+    def send(self, to, *, fail_silently=False, **kwargs):
+        from .tasks import send_djoser_email
+
+        # Solo lo que sale de la petición; tokens y plantillas, en el worker.
+        site = email.BaseDjoserEmail.get_context_data(self)
+        transaction.on_commit(
+            partial(
+                send_djoser_email.delay,
+                f"{type(self).__module__}.{type(self).__qualname__}",
+                self.context["user"].pk,
+                {key: site[key] for key in SITE_CONTEXT},
+                list(to),
+                fail_silently=fail_silently,
+                **kwargs,
+            ),
+        )
+
+    def send_now(self, to, **kwargs):
+        super().send(to, **kwargs)
+
+
+class ActivationEmail(CeleryEmailMixin, email.ActivationEmail):
+    pass
+
+
+class ConfirmationEmail(CeleryEmailMixin, email.ConfirmationEmail):
+    pass
+
+
+class PasswordResetEmail(CeleryEmailMixin, email.PasswordResetEmail):
+    pass
+
+
+class PasswordChangedConfirmationEmail(
+    CeleryEmailMixin,
+    email.PasswordChangedConfirmationEmail,
+):
+    pass
+
+
+class UsernameChangedConfirmationEmail(
+    CeleryEmailMixin,
+    email.UsernameChangedConfirmationEmail,
+):
+    pass
+
+
+class UsernameResetEmail(CeleryEmailMixin, email.UsernameResetEmail):
+    pass
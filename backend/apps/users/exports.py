@@ -0,0 +1,9 @@
+USER_EXPORT_COLUMNS = {
+    "id": "pk",
+    "email": "email",
+    "first_name": "first_name",
+    "last_name": "last_name",
+    "is_active": "is_active",
+    "is_staff": "is_staff",
+    "last_login": "last_login",
+}
@@ -0,0 +1,252 @@
+"""
+Password hashing on a bounded pool of threads.
+
+Each Argon2 hash takes tens of milliseconds of CPU and ``ARGON2_MEMORY_COST``
+KiB of memory. Hashed inline, a burst of logins or signups takes as many
+threads, cores and memory as it has requests, and the other requests of the
+worker wait behind it. :class:`BoundedArgon2PasswordHasher` hashes on a pool
+of ``PASSWORD_HASHING_CONCURRENCY`` threads per process instead, and the
+rest wait their turn in its queue. argon2-cffi releases the GIL while it
+hashes, so threads reach as many cores as the cap allows without the
+pickling of a process pool.
+
+- Every worker publishes the queue's waits and the hashing times to Redis
+  (:func:`publish_hashing_stats`); ``GET api/password-hashing/stats/`` sums
+  them.
+- A login whose hash was made with other ``ARGON2_*`` costs, or by another
+  hasher, gets the new hash on the pool after the response
+  (:func:`rehash_later`). The password stays in the process' memory, never
+  in Celery's broker.
+"""
+
+import asyncio
+import contextlib
+import json
+import logging
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import Future
+from concurrent.futures import ThreadPoolExecutor
+
+import redis
+from django.conf import settings
+from django.contrib.auth.hashers import Argon2PasswordHasher
+from django.contrib.auth.hashers import make_password
+from django.core.signals import request_finished
+from django.core.signals import setting_changed
+from django.db import connections
+from django.db import transaction
+from django.dispatch import receiver
+
+from apps.utils.broadcast import encode
+from apps.utils.db_pool import worker_id
+from apps.utils.redis import get_redis
+
+logger = logging.getLogger(__name__)
+
+HASHING_STATS_PREFIX = "auth:hashing:"
+
+# Pool de este proceso y momento de su última publicación.
+_pools: dict[str, "HashingPool"] = {}
+_pools_lock = threading.Lock()
+_published: dict[str, float] = {}
+
+
+class HashingPool:
+    """Thread pool of ``max_workers`` threads that counts its queue."""
+
+    def __init__(self, max_workers: int):
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(
+            max_workers,
+            thread_name_prefix="password-hashing",
+        )
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.running = 0
+        self.queued = 0
+        self._reset()
+
+    def _reset(self) -> None:
+        self.started = 0
+        self.completed = 0
+        # Los que encontraron todos los hilos ocupados y tuvieron que esperar.
+        self.waited = 0
+        self.wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+        self.hash_seconds = 0.0
+
+    def _job(self, func: Callable, args: tuple, submitted: float):
+        started = time.perf_counter()
+        with self._lock:
+            self.queued -= 1
+            self.running += 1
+            self.started += 1
+            self.wait_seconds += started - submitted
+            self.max_wait_seconds = max(self.max_wait_seconds, started - submitted)
+        self._local.inside = True
+        try:
+            return func(*args)
+        finally:
+            self._local.inside = False
+            with self._lock:
+                self.running -= 1
+                self.completed += 1
+                self.hash_seconds += time.perf_counter() - started
+
+    def submit(self, func: Callable, *args) -> Future:
+        with self._lock:
+            if self.running + self.queued >= self.max_workers:
+                self.waited += 1
+            self.queued += 1
+        return self._executor.submit(self._job, func, args, time.perf_counter())
+
+    def run(self, func: Callable, *args):
+        """``func(*args)`` on the pool, blocking until it returns."""
+        # Desde un hilo del pool (rehash_later) esperar a otro podría bloquearlo.
+        if getattr(self._local, "inside", False):
+            return func(*args)
+        return self.submit(func, *args).result()
+
+    async def arun(self, func: Callable, *args):
+        """``func(*args)`` on the pool, without blocking the event loop."""
+        return await asyncio.wrap_future(self.submit(func, *args))
+
+    def snapshot(self, elapsed: float | None = None) -> dict:
+        """Metrics since the previous snapshot, ``elapsed`` seconds ago."""
+        with self._lock:
+            stats = {
+                "concurrency": self.max_workers,
+                "running": self.running,
+                "queued": self.queued,
+                "completed": self.completed,
+                "hashes_per_second": self.completed / elapsed if elapsed else 0.0,
+                "waited": self.waited,
+                "avg_wait_ms": (
+                    self.wait_seconds / self.started * 1000 if self.started else 0.0
+                ),
+                "max_wait_ms": self.max_wait_seconds * 1000,
+                "avg_hash_ms": (
+                    self.hash_seconds / self.completed * 1000 if self.completed else 0.0
+                ),
+            }
+            self._reset()
+        return stats
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=True)
+
+
+def hashing_pool() -> HashingPool:
+    """This process' pool, created on first use."""
+    with _pools_lock:
+        if "default" not in _pools:
+            _pools["default"] = HashingPool(settings.PASSWORD_HASHING_CONCURRENCY)
+        return _pools["default"]
+
+
+@receiver(setting_changed)
+def reset_hashing_pool(*, setting, **kwargs):
+    if setting == "PASSWORD_HASHING_CONCURRENCY":
+        with _pools_lock:
+            pool = _pools.pop("default", None)
+        if pool is not None:
+            pool.shutdown()
+
+
+class BoundedArgon2PasswordHasher(Argon2PasswordHasher):
+    """Argon2 with the ``ARGON2_*`` costs, hashing on :func:`hashing_pool`."""
+
+    @property
+    def time_cost(self):
+        return settings.ARGON2_TIME_COST
+
+    @property
+    def memory_cost(self):
+        return settings.ARGON2_MEMORY_COST
+
+    @property
+    def parallelism(self):
+        return settings.ARGON2_PARALLELISM
+
+    def encode(self, password, salt):
+        return hashing_pool().run(super().encode, password, salt)
+
+    def verify(self, password, encoded):
+        return hashing_pool().run(super().verify, password, encoded)
+
+
+def rehash_later(user, raw_password: str) -> None:
+    """Hash ``raw_password`` for ``user`` again on the pool, after the commit."""
+    manager = type(user)._default_manager  # noqa: SLF001
+    pk, old = user.pk, user.password
+
+    def rehash():
+        try:
+            # Si la contraseña cambió mientras tanto, gana el cambio.
+            manager.filter(pk=pk, password=old).update(
+                password=make_password(raw_password),
+            )
+        except Exception:
+            logger.exception("Could not rehash the password of user %s", pk)
+        finally:
+            connections.close_all()
+
+    transaction.on_commit(lambda: hashing_pool().submit(rehash))
+
+
+@receiver(request_finished)
+def publish_hashing_stats(**kwargs) -> None:
+    """Publish this worker's pool at most every PASSWORD_HASHING_STATS_INTERVAL."""
+    pool = _pools.get("default")
+    if pool is None:
+        return
+    now = time.monotonic()
+    then = _published.get("at")
+    interval = settings.PASSWORD_HASHING_STATS_INTERVAL
+    if then is not None and now - then < interval:
+        return
+    _published["at"] = now
+    stats = {
+        "worker": worker_id(),
+        "updated_at": time.time(),
+        **pool.snapshot(now - then if then else None),
+    }
+    # Caduca sola si el worker muere sin borrarla.
+    with contextlib.suppress(redis.RedisError):
+        get_redis().set(
+            f"{HASHING_STATS_PREFIX}{stats['worker']}",
+            encode(stats),
+            ex=max(int(interval * 3), 1),
+        )
+
+
+def worker_hashing_stats() -> list[dict]:
+    """Latest snapshot published by every live worker."""
+    client = get_redis()
+    keys = sorted(client.scan_iter(match=f"{HASHING_STATS_PREFIX}*", count=1000))
+    return [json.loads(raw) for raw in client.mget(keys) if raw] if keys else []
+
+
+def hashing_totals(workers: list[dict]) -> dict:
+    """Sums of the worker snapshots; the worst wait of any of them."""
+    totals = dict.fromkeys(
+        (
+            "concurrency",
+            "running",
+            "queued",
+            "completed",
+            "hashes_per_second",
+            "waited",
+        ),
+        0,
+    )
+    for worker in workers:
+        for field in totals:
+            totals[field] += worker[field]
+    totals["max_wait_ms"] = max(
+        (worker["max_wait_ms"] for worker in workers),
+        default=0.0,
+    )
+    return totals
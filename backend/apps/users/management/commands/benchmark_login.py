@@ -0,0 +1,93 @@
+import asyncio
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+
+from apps.users.hashers import worker_hashing_stats
+from apps.utils.benchmark import http_load
+from apps.utils.benchmark import summarize
+
+BENCHMARK_EMAIL = "benchmark-login@example.com"
+BENCHMARK_PASSWORD = "benchmark-login-Pass1"  # noqa: S105
+
+
+class Command(BaseCommand):
+    help = (
+        "Load a running ASGI server with logins (api/auth/jwt/create/) and "
+        "report logins per second per worker, their p50/p99 latency, the "
+        "latency of a cheap endpoint alone and during the burst, and the "
+        "password hashing queue of every worker."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--url", default="http://localhost:5000")
+        parser.add_argument("--requests", type=int, default=200)
+        parser.add_argument("--concurrency", type=int, default=16)
+        parser.add_argument(
+            "--probe",
+            default="/api/products/",
+            help="Endpoint timed alone and during the login burst.",
+        )
+        parser.add_argument(
+            "--email",
+            help=f"User logging in ({BENCHMARK_EMAIL} is created by default).",
+        )
+        parser.add_argument("--password", default=BENCHMARK_PASSWORD)
+
+    def handle(self, *args, **options):
+        email = options["email"]
+        if email is None:
+            email = BENCHMARK_EMAIL
+            users = get_user_model().objects
+            if not users.filter(email=email).exists():
+                users.create_user(email, options["password"])
+        login_url = f"{options['url']}/api/auth/jwt/create/"
+        probe_url = f"{options['url']}{options['probe']}"
+        credentials = {"email": email, "password": options["password"]}
+
+        # Calienta conexiones y comprueba las credenciales antes de medir.
+        _, _, errors = asyncio.run(http_load(login_url, 2, 1, body=credentials))
+        if errors:
+            msg = f"Could not log in as {email}."
+            raise CommandError(msg)
+        alone, _, _ = asyncio.run(http_load(probe_url, 200, 4))
+
+        async def burst():
+            return await asyncio.gather(
+                http_load(
+                    login_url,
+                    options["requests"],
+                    options["concurrency"],
+                    body=credentials,
+                ),
+                http_load(probe_url, 200, 4),
+            )
+
+        (logins, elapsed, errors), (during, _, _) = asyncio.run(burst())
+
+        # Lo que publicó cada worker (cada PASSWORD_HASHING_STATS_INTERVAL).
+        workers = worker_hashing_stats()
+        per_second = len(logins) / elapsed
+        stats = summarize(logins)
+        self.stdout.write(
+            f"logins: {per_second:.1f} req/s "
+            f"({per_second / max(len(workers), 1):.1f} per worker, "
+            f"{len(workers) or 'unknown'} workers), "
+            f"p50={stats['p50_ms']:.2f}ms p99={stats['p99_ms']:.2f}ms, "
+            f"errors={errors}",
+        )
+        for label, timings in (("alone", alone), ("during logins", during)):
+            stats = summarize(timings)
+            self.stdout.write(
+                f"{options['probe']} {label}: p50={stats['p50_ms']:.2f}ms "
+                f"p99={stats['p99_ms']:.2f}ms",
+            )
+        for worker in workers:
+            self.stdout.write(
+                f"{worker['worker']}: concurrency={worker['concurrency']} "
+                f"queued={worker['queued']} waited={worker['waited']} "
+                f"avg_wait={worker['avg_wait_ms']:.2f}ms "
+                f"max_wait={worker['max_wait_ms']:.2f}ms "
+                f"avg_hash={worker['avg_hash_ms']:.2f}ms",
+            )
@@ -1,6 +1,11 @@
+from asgiref.sync import sync_to_async
+from django.contrib.auth.hashers import check_password
+from django.contrib.auth.hashers import verify_password
 from django.contrib.auth.models import AbstractBaseUser, PermissionsMixin
 from django.utils.translation import gettext_lazy as _
 from django.db import models
+from .hashers import hashing_pool
+from .hashers import rehash_later
 from .managers import UserAccountManager
 
 class User(AbstractBaseUser, PermissionsMixin):
@@ -10,6 +15,8 @@ class User(AbstractBaseUser, PermissionsMixin):
   last_name = models.CharField(max_length=255, blank=True)
   is_active = models.BooleanField(default=True)
   is_staff = models.BooleanField(default=False)
+  # Sube al cambiar permisos o is_active: invalida los JWT emitidos antes.
+  token_version = models.PositiveIntegerField(default=0, editable=False)
 
   objects = UserAccountManager()
 
@@ -25,6 +32,29 @@ class User(AbstractBaseUser, PermissionsMixin):
   def __str__(self) -> str:
     return self.email
 
+  def check_password(self, raw_password: str) -> bool:
+    # Un hash con otros parámetros se rehace en el pool tras la respuesta.
+    return check_password(
+      raw_password, self.password, lambda raw: rehash_later(self, raw),
+    )
+
+  async def acheck_password(self, raw_password: str) -> bool:
+    # El de Django verifica dentro del event loop.
+    is_correct, must_update = await hashing_pool().arun(
+      verify_password, raw_password, self.password,
+    )
+    if is_correct and must_update:
+      await sync_to_async(rehash_later)(self, raw_password)
+    return is_correct
+
+  def refresh_from_db(self, using=None, fields=None, from_queryset=None):
+    # El usuario de un JWT (apps.users.authentication) solo trae los claims:
+    # el primer campo diferido que se lee carga el resto de la fila de una vez.
+    deferred = self.get_deferred_fields()
+    if fields is not None and deferred and set(fields) <= deferred:
+      fields = deferred
+    super().refresh_from_db(using, fields, from_queryset)
+
   class Meta:
     verbose_name = _("User")
     verbose_name_plural = _("Users")
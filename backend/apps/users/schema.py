@@ -0,0 +1,21 @@
+"""OpenAPI descriptions of the claims JWT classes, as for simplejwt's own."""
+
+from drf_spectacular.contrib.rest_framework_simplejwt import SimpleJWTScheme
+from drf_spectacular.contrib.rest_framework_simplejwt import (
+    TokenObtainPairSerializerExtension,
+)
+from drf_spectacular.contrib.rest_framework_simplejwt import (
+    TokenRefreshSerializerExtension,
+)
+
+
+class ClaimsJWTScheme(SimpleJWTScheme):
+    target_class = "apps.users.authentication.ClaimsJWTAuthentication"
+
+
+class ClaimsTokenObtainPairSerializerExtension(TokenObtainPairSerializerExtension):
+    target_class = "apps.users.serializers.ClaimsTokenObtainPairSerializer"
+
+
+class ClaimsTokenRefreshSerializerExtension(TokenRefreshSerializerExtension):
+    target_class = "apps.users.serializers.ClaimsTokenRefreshSerializer"
@@ -1,7 +1,15 @@
 from djoser.serializers import UserCreateSerializer
 from rest_framework import serializers
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+from rest_framework_simplejwt.serializers import TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
 from django.contrib.auth import get_user_model
 
+from .tokens import VERSION_CLAIM
+from .tokens import ClaimsRefreshToken
+from .tokens import add_user_claims
+
 User = get_user_model()
 
 
@@ -16,3 +24,44 @@ class UserCreateSerializer(UserCreateSerializer):
       "get_full_name",
       "get_short_name",
     )
+
+
+class ClaimsTokenObtainPairSerializer(TokenObtainPairSerializer):
+  token_class = ClaimsRefreshToken
+
+
+class ClaimsTokenRefreshSerializer(TokenRefreshSerializer):
+  """
+  Refresh that also rejects tokens issued before the user's permissions or
+  active flag changed, and copies the current claims into the new tokens.
+  """
+
+  token_class = ClaimsRefreshToken
+
+  def validate(self, attrs):
+    refresh = self.token_class(attrs["refresh"])
+    user = User.objects.filter(
+      **{jwt_settings.USER_ID_FIELD: refresh.get(jwt_settings.USER_ID_CLAIM)},
+    ).first()
+    if (
+      user is None
+      or not jwt_settings.USER_AUTHENTICATION_RULE(user)
+      # Los tokens sin versión son anteriores a los claims: se actualizan.
+      or refresh.get(VERSION_CLAIM, user.token_version) != user.token_version
+    ):
+      raise AuthenticationFailed(
+        self.error_messages["no_active_account"],
+        "no_active_account",
+      )
+    add_user_claims(refresh, user)
+    data = {"access": str(refresh.access_token)}
+
+    if jwt_settings.ROTATE_REFRESH_TOKENS:
+      if jwt_settings.BLACKLIST_AFTER_ROTATION:
+        refresh.blacklist()
+      refresh.set_jti()
+      refresh.set_exp()
+      refresh.set_iat()
+      data["refresh"] = str(refresh)
+
+    return data
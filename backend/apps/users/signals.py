@@ -0,0 +1,73 @@
+from django.contrib.auth.models import Group
+from django.db.models.signals import m2m_changed
+from django.db.models.signals import post_save
+from django.db.models.signals import pre_save
+from django.dispatch import receiver
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+
+from . import blacklist
+from .authentication import revoke_tokens
+from .models import User
+
+# Campos que cambian lo que un token permite hacer, o que viajan en sus
+# claims: un token con el email antiguo lo devolvería y lo guardaría.
+ACCESS_FIELDS = ("email", "is_active", "is_staff", "is_superuser")
+
+
+@receiver(pre_save, sender=User)
+def user_access_changing(sender, instance, update_fields, raw, using, **kwargs):
+    instance._access_changed = False  # noqa: SLF001
+    if raw or instance._state.adding:  # noqa: SLF001
+        return
+    if update_fields is not None and not set(ACCESS_FIELDS) & set(update_fields):
+        return
+    previous = (
+        User._base_manager.using(using)  # noqa: SLF001
+        .filter(pk=instance.pk)
+        .values(*ACCESS_FIELDS)
+        .first()
+    )
+    instance._access_changed = previous is not None and any(  # noqa: SLF001
+        previous[field] != getattr(instance, field) for field in ACCESS_FIELDS
+    )
+
+
+@receiver(post_save, sender=User)
+def user_access_changed(sender, instance, using, **kwargs):
+    if getattr(instance, "_access_changed", False):
+        revoke_tokens([instance.pk])
+        # Que otro save() de esta instancia no devuelva la versión anterior.
+        instance.refresh_from_db(using=using, fields=["token_version"])
+
+
+@receiver(m2m_changed, sender=User.groups.through)
+@receiver(m2m_changed, sender=User.user_permissions.through)
+def user_permissions_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if not reverse:
+        if action in {"post_add", "post_remove", "post_clear"}:
+            revoke_tokens([instance.pk])
+    # Desde el grupo o el permiso: pk_set son usuarios; clear no los trae.
+    elif action in {"post_add", "post_remove"}:
+        revoke_tokens(pk_set)
+    elif action == "pre_clear":
+        revoke_tokens(instance.user_set.values_list("pk", flat=True))
+
+
+@receiver(m2m_changed, sender=Group.permissions.through)
+def group_permissions_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in {"post_add", "post_remove", "pre_clear"}:
+        return
+    if action == "pre_clear":
+        groups = [instance.pk] if not reverse else instance.group_set.all()
+    elif not reverse:
+        groups = [instance.pk]
+    else:
+        groups = pk_set
+    revoke_tokens(User.objects.filter(groups__in=groups).values_list("pk", flat=True))
+
+
+@receiver(post_save, sender=BlacklistedToken)
+def token_blacklisted(sender, instance, created, **kwargs):
+    # Antes del commit: si se deshace, solo queda un falso positivo.
+    if created:
+        blacklist.add([(instance.token.jti, instance.token.expires_at)])
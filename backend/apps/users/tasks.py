@@ -2,7 +2,10 @@ from celery import shared_task
 from django.conf import settings
 from django.core.mail import EmailMultiAlternatives
 from django.template.loader import render_to_string
+from django.utils.module_loading import import_string
 
+from .blacklist import prune_token_blacklist
+from .blacklist import rebuild
 from .models import User
 
 
@@ -54,3 +57,30 @@ def send_activation_email(self, user_id, activation_link):
     except Exception as exc:
         # Retry the task up to 3 times with exponential backoff
         raise self.retry(exc=exc, countdown=60 * (2 ** self.request.retries))
+
+
+@shared_task(bind=True, max_retries=3)
+def send_djoser_email(self, email_class, user_id, context, to, **kwargs):
+    """Render and send a djoser email queued by ``CeleryEmailMixin``."""
+    user = User.objects.filter(pk=user_id).first()
+    if user is None:
+        # Borrado antes de que saliera el correo.
+        return None
+    message = import_string(email_class)(context={**context, "user": user})
+    try:
+        message.send_now(to, **kwargs)
+    except Exception as exc:
+        raise self.retry(exc=exc, countdown=60 * (2**self.request.retries)) from exc
+    return user_id
+
+
+@shared_task()
+def prune_token_blacklist_task():
+    """Delete expired outstanding and blacklisted refresh tokens."""
+    return prune_token_blacklist()
+
+
+@shared_task()
+def rebuild_token_blacklist_filter_task():
+    """Refill the Redis filters of the token blacklist from Postgres."""
+    return rebuild()
@@ -0,0 +1,40 @@
+import pytest
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+pytestmark = pytest.mark.django_db
+
+
+class TestAsyncCurrentUserView:
+    url = reverse("api:async-user-me")
+
+    def test_returns_the_token_user(self, user):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(user)}")
+
+        response = client.get(self.url)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.content == client.get("/api/auth/users/me/").content
+
+    def test_needs_a_valid_token(self, user):
+        client = APIClient()
+        assert client.get(self.url).status_code == status.HTTP_401_UNAUTHORIZED
+
+        client.credentials(HTTP_AUTHORIZATION="Bearer not-a-jwt")
+        response = client.get(self.url)
+
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+        assert response["WWW-Authenticate"] == 'Bearer realm="api"'
+        assert response.content == client.get("/api/auth/users/me/").content
+
+    def test_inactive_users(self, user):
+        token = AccessToken.for_user(user)
+        user.is_active = False
+        user.save()
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+
+        assert client.get(self.url).status_code == status.HTTP_401_UNAUTHORIZED
@@ -0,0 +1,186 @@
+import pytest
+from django.contrib.auth.models import Group
+from django.contrib.auth.models import Permission
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.test import APIClient
+from rest_framework.test import APIRequestFactory
+from rest_framework_simplejwt.tokens import AccessToken
+
+from apps.users.authentication import ClaimsJWTAuthentication
+from apps.users.tests.factories import UserFactory
+from apps.users.tokens import ClaimsAccessToken
+from apps.users.tokens import ClaimsRefreshToken
+
+pytestmark = pytest.mark.django_db(transaction=True)
+
+ME = "/api/auth/users/me/"
+
+
+def authenticate(token):
+    request = APIRequestFactory().get("/", HTTP_AUTHORIZATION=f"Bearer {token}")
+    return ClaimsJWTAuthentication().authenticate(request)[0]
+
+
+def client_for(token) -> APIClient:
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+    return client
+
+
+class TestClaims:
+    def test_login_issues_tokens_with_claims(self, user):
+        user.set_password("StrongPass123!")
+        user.save()
+
+        response = APIClient().post(
+            "/api/auth/jwt/create/",
+            {"email": user.email, "password": "StrongPass123!"},
+            format="json",
+        )
+
+        access = ClaimsAccessToken(response.data["access"])
+        assert access["user_id"] == user.pk
+        assert access["email"] == user.email
+        assert (access["is_active"], access["is_staff"], access["ver"]) == (
+            True,
+            False,
+            0,
+        )
+
+    def test_authenticates_without_loading_the_user(
+        self,
+        user,
+        django_assert_num_queries,
+    ):
+        token = ClaimsAccessToken.for_user(user)
+        authenticate(token)  # Guarda la versión en la caché.
+
+        with django_assert_num_queries(0):
+            request_user = authenticate(token)
+            assert request_user.pk == user.pk
+            assert request_user.email == user.email
+            assert not request_user.is_staff
+
+        # Lo demás se carga de una vez la primera vez que se lee.
+        with django_assert_num_queries(1):
+            assert request_user.first_name == user.first_name
+            assert request_user.last_name == user.last_name
+            assert not request_user.is_superuser
+
+    def test_views_get_the_whole_user(self, user):
+        client = client_for(ClaimsAccessToken.for_user(user))
+
+        response = client.get(ME)
+
+        assert response.data["first_name"] == user.first_name
+        assert client.get(reverse("api:async-user-me")).content == response.content
+
+    def test_tokens_without_claims_still_work(self, user):
+        response = client_for(AccessToken.for_user(user)).get(ME)
+
+        assert response.status_code == status.HTTP_200_OK
+
+    def test_saving_from_the_token_user_keeps_the_rest(self, user):
+        request_user = authenticate(ClaimsAccessToken.for_user(user))
+        request_user.first_name = "Ana"
+        request_user.save()
+
+        user.refresh_from_db()
+        assert user.first_name == "Ana"
+        assert user.has_usable_password()
+
+
+class TestRevocation:
+    @pytest.mark.parametrize(
+        "change",
+        [
+            {"is_staff": True},
+            {"is_superuser": True},
+            {"is_active": False},
+        ],
+    )
+    def test_access_changes_revoke_tokens(self, user, change):
+        token = ClaimsAccessToken.for_user(user)
+        assert client_for(token).get(ME).status_code == status.HTTP_200_OK
+
+        for field, value in change.items():
+            setattr(user, field, value)
+        user.save()
+
+        response = client_for(token).get(ME)
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+        assert response.data["detail"].code == "token_revoked"
+        if user.is_active:
+            new_token = ClaimsAccessToken.for_user(user)
+            assert client_for(new_token).get(ME).status_code == status.HTTP_200_OK
+
+    def test_email_changes_revoke_tokens(self, user):
+        token = ClaimsAccessToken.for_user(user)
+        user.email = "new@example.com"
+        user.save()
+
+        response = client_for(token).get(ME)
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+        assert response.data["detail"].code == "token_revoked"
+        # El usuario del token viejo ya no llega a guardar el email antiguo.
+        with pytest.raises(AuthenticationFailed):
+            authenticate(token)
+        user.refresh_from_db()
+        assert user.email == "new@example.com"
+
+        request_user = authenticate(ClaimsAccessToken.for_user(user))
+        assert request_user.email == "new@example.com"
+        request_user.first_name = "Ana"
+        request_user.save()
+        user.refresh_from_db()
+        assert (user.email, user.first_name) == ("new@example.com", "Ana")
+
+    def test_other_changes_keep_tokens(self, user):
+        token = ClaimsAccessToken.for_user(user)
+        user.first_name = "Ana"
+        user.save(update_fields=["first_name"])
+        user.save()
+
+        assert client_for(token).get(ME).status_code == status.HTTP_200_OK
+
+    def test_permission_changes_revoke_tokens(self, user):
+        other = UserFactory()
+        group = Group.objects.create(name="staff")
+        permission = Permission.objects.get(codename="view_order")
+        group.user_set.add(other)
+
+        def revoked(member, change):
+            token = ClaimsAccessToken.for_user(member)
+            change()
+            return client_for(token).get(ME).status_code == 401  # noqa: PLR2004
+
+        assert revoked(user, lambda: user.groups.add(group))
+        assert revoked(user, lambda: user.user_permissions.add(permission))
+        assert revoked(other, lambda: group.permissions.add(permission))
+        assert revoked(other, lambda: permission.group_set.clear())
+        assert revoked(other, lambda: group.user_set.clear())
+
+    def test_revoked_refresh_tokens_are_rejected(self, user):
+        refresh = ClaimsRefreshToken.for_user(user)
+        user.is_staff = True
+        user.save()
+        client = APIClient()
+
+        response = client.post(
+            "/api/auth/jwt/refresh/",
+            {"refresh": str(refresh)},
+            format="json",
+        )
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+        response = client.post(
+            "/api/auth/jwt/refresh/",
+            {"refresh": str(ClaimsRefreshToken.for_user(user))},
+            format="json",
+        )
+        access = ClaimsAccessToken(response.data["access"])
+        assert access["is_staff"]
+        assert access["ver"] == user.token_version == 1
+        assert client_for(access).get(ME).status_code == status.HTTP_200_OK
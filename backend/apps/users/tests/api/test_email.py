@@ -0,0 +1,123 @@
+import re
+
+import pytest
+from django.contrib.auth.tokens import default_token_generator
+from django.core import mail
+from djoser import email
+from djoser.utils import decode_uid
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from apps.users.email import ActivationEmail
+from apps.users.models import User
+from apps.users.tasks import send_djoser_email
+from apps.users.tokens import ClaimsAccessToken
+
+pytestmark = pytest.mark.django_db
+
+PASSWORD = "StrongPass123!"  # noqa: S105
+
+
+def link(message, prefix):
+    """uid and token of the ``prefix/{uid}/{token}`` link in ``message``."""
+    uid, token = re.search(rf"{prefix}/([\w-]+)/([\w-]+)", message.body).groups()
+    return User.objects.get(pk=decode_uid(uid)), token
+
+
+def test_signup_sends_the_activation_after_the_commit(
+    django_capture_on_commit_callbacks,
+):
+    with django_capture_on_commit_callbacks() as callbacks:
+        response = APIClient().post(
+            "/api/auth/users/",
+            {
+                "email": "ana@example.com",
+                "first_name": "Ana",
+                "last_name": "García",
+                "password": PASSWORD,
+                "re_password": PASSWORD,
+            },
+            format="json",
+        )
+        assert response.status_code == status.HTTP_201_CREATED
+        # Nada sale durante la petición.
+        assert mail.outbox == []
+
+    for callback in callbacks:
+        callback()
+
+    [message] = mail.outbox
+    assert message.to == ["ana@example.com"]
+    # El dominio sale de la petición aunque el correo se envíe sin ella.
+    assert "http://example.com/activate/" in message.body
+    user, token = link(message, "activate")
+    assert user.email == "ana@example.com"
+    assert default_token_generator.check_token(user, token)
+
+
+def test_password_reset_link_works(user, django_capture_on_commit_callbacks):
+    with django_capture_on_commit_callbacks(execute=True):
+        response = APIClient().post(
+            "/api/auth/users/reset_password/",
+            {"email": user.email},
+            format="json",
+        )
+
+    assert response.status_code == status.HTTP_204_NO_CONTENT
+    [message] = mail.outbox
+    reset_user, token = link(message, "password/reset/confirm")
+    assert reset_user == user
+    assert default_token_generator.check_token(reset_user, token)
+
+
+def test_confirmations_for_token_users(user, django_capture_on_commit_callbacks):
+    user.set_password(PASSWORD)
+    user.save()
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Bearer {ClaimsAccessToken.for_user(user)}")
+
+    with django_capture_on_commit_callbacks(execute=True):
+        response = client.post(
+            "/api/auth/users/set_password/",
+            {
+                "current_password": PASSWORD,
+                "new_password": "OtherPass456!",
+                "re_new_password": "OtherPass456!",
+            },
+            format="json",
+        )
+
+    assert response.status_code == status.HTTP_204_NO_CONTENT
+    [message] = mail.outbox
+    assert message.to == [user.email]
+    assert message.subject.startswith("example.com")
+
+
+def test_fail_silently_reaches_the_worker(
+    user,
+    monkeypatch,
+    django_capture_on_commit_callbacks,
+):
+    sent = []
+    monkeypatch.setattr(
+        email.BaseEmailMessage,
+        "send",
+        lambda self, to, **kwargs: sent.append((to, kwargs)),
+    )
+
+    with django_capture_on_commit_callbacks(execute=True):
+        ActivationEmail(context={"user": user}).send([user.email], fail_silently=True)
+
+    assert sent == [([user.email], {"fail_silently": True})]
+
+
+def test_deleted_users_get_nothing():
+    result = send_djoser_email(
+        "apps.users.email.ActivationEmail",
+        0,
+        {"domain": "example.com", "protocol": "https", "site_name": "Shop"},
+        ["gone@example.com"],
+    )
+
+    assert result is None
+    assert mail.outbox == []
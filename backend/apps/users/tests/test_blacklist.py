@@ -0,0 +1,111 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+from rest_framework_simplejwt.token_blacklist.models import OutstandingToken
+from rest_framework_simplejwt.utils import datetime_from_epoch
+
+from apps.users import blacklist
+from apps.users.tokens import ClaimsRefreshToken
+
+REFRESH = "/api/auth/jwt/refresh/"
+
+
+@pytest.fixture
+def ready(redis_client):
+    blacklist.rebuild()
+    return redis_client
+
+
+def expires_at(token):
+    return datetime_from_epoch(token["exp"])
+
+
+def refresh(token):
+    return APIClient().post(REFRESH, {"refresh": str(token)}, format="json")
+
+
+@pytest.mark.django_db(transaction=True)
+def test_rotated_tokens_are_rejected(user, ready):
+    token = ClaimsRefreshToken.for_user(user)
+
+    assert refresh(token).status_code == 200  # noqa: PLR2004
+    response = refresh(token)
+
+    assert response.status_code == 401  # noqa: PLR2004
+    assert blacklist.may_be_blacklisted(token["jti"], expires_at(token))
+
+
+def test_filter_misses_skip_the_database(user, ready, django_assert_num_queries):
+    token = ClaimsRefreshToken.for_user(user)
+
+    with django_assert_num_queries(0):
+        ClaimsRefreshToken(str(token))
+
+
+def test_without_filter_postgres_decides_and_it_is_rebuilt(user, ready):
+    token = ClaimsRefreshToken.for_user(user)
+    token.blacklist()
+    ready.flushdb()
+
+    with pytest.raises(TokenError):
+        ClaimsRefreshToken(str(token))
+
+    # La comprobación encoló la reconstrucción (síncrona en los tests).
+    assert ready.exists(blacklist.READY_KEY)
+    assert not ready.exists(blacklist.REBUILD_LOCK)
+    assert blacklist.may_be_blacklisted(token["jti"], expires_at(token))
+
+
+def test_failed_writes_distrust_the_filter(user, ready, monkeypatch):
+    def broken(*args, **kwargs):
+        raise blacklist.redis.ConnectionError
+
+    token = ClaimsRefreshToken.for_user(user)
+    monkeypatch.setattr("redis.client.Pipeline.execute", broken)
+    token.blacklist()
+    monkeypatch.undo()
+
+    assert not ready.exists(blacklist.READY_KEY)
+
+
+def test_rebuild_does_not_trust_a_filter_invalidated_meanwhile(
+    user,
+    redis_client,
+    monkeypatch,
+):
+    ClaimsRefreshToken.for_user(user).blacklist()
+    add = blacklist.add
+
+    def add_then_fail_elsewhere(tokens):
+        # Otro proceso no pudo escribir su token mientras se reconstruía.
+        blacklist.invalidate()
+        return add(tokens)
+
+    monkeypatch.setattr(blacklist, "add", add_then_fail_elsewhere)
+    assert blacklist.rebuild() == 1
+    assert not redis_client.exists(blacklist.READY_KEY)
+    assert not redis_client.exists(blacklist.REBUILD_LOCK)
+
+    monkeypatch.undo()
+    blacklist.rebuild()
+    assert redis_client.exists(blacklist.READY_KEY)
+
+
+def test_prune_deletes_expired_tokens(user, redis_client):
+    expired = ClaimsRefreshToken.for_user(user)
+    current = ClaimsRefreshToken.for_user(user)
+    expired.blacklist()
+    current.blacklist()
+    OutstandingToken.objects.filter(jti=expired["jti"]).update(
+        expires_at=timezone.now() - timedelta(seconds=1),
+    )
+
+    assert blacklist.prune_token_blacklist(batch_size=1) == 1
+    assert list(OutstandingToken.objects.values_list("jti", flat=True)) == [
+        current["jti"],
+    ]
+    assert BlacklistedToken.objects.get().token.jti == current["jti"]
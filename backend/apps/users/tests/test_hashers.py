@@ -0,0 +1,122 @@
+import threading
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.contrib.auth.hashers import check_password
+from django.contrib.auth.hashers import make_password
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from apps.users import hashers
+from apps.users.hashers import HashingPool
+from apps.users.hashers import hashing_pool
+from apps.users.hashers import publish_hashing_stats
+from apps.users.tests.factories import UserFactory
+
+PASSWORD = "StrongPass123!"  # noqa: S105
+
+
+@pytest.fixture
+def argon2(settings):
+    settings.PASSWORD_HASHERS = [
+        "apps.users.hashers.BoundedArgon2PasswordHasher",
+        "django.contrib.auth.hashers.MD5PasswordHasher",
+    ]
+    # Costes mínimos: los tests miden el pool, no Argon2.
+    settings.ARGON2_TIME_COST = 1
+    settings.ARGON2_MEMORY_COST = 64
+    settings.ARGON2_PARALLELISM = 1
+    settings.PASSWORD_HASHING_CONCURRENCY = 1
+    return settings
+
+
+def drain():
+    # Con un solo hilo, cuando acaba este han acabado los anteriores.
+    hashing_pool().submit(lambda: None).result()
+
+
+def test_pool_caps_concurrency_and_counts_waits():
+    pool = HashingPool(1)
+    release = threading.Event()
+    first = pool.submit(release.wait)
+    second = pool.submit(lambda: "done")
+
+    stats = pool.snapshot(elapsed=1)
+    assert (stats["running"], stats["queued"], stats["waited"]) == (1, 1, 1)
+
+    release.set()
+    assert second.result() == "done"
+    assert first.result()
+    stats = pool.snapshot(elapsed=1)
+    assert (stats["running"], stats["queued"], stats["completed"]) == (0, 0, 2)
+    assert stats["max_wait_ms"] > 0
+    pool.shutdown()
+
+
+def test_hashes_on_the_pool(argon2):
+    hashing_pool().snapshot()
+
+    encoded = make_password(PASSWORD)
+
+    assert encoded.startswith("argon2$argon2id$v=19$m=64,t=1,p=1$")
+    assert check_password(PASSWORD, encoded)
+    assert hashing_pool().snapshot()["completed"] == 2  # noqa: PLR2004
+
+
+@pytest.mark.django_db(transaction=True)
+def test_login_rehashes_after_the_response(argon2):
+    user = UserFactory()
+    user.password = make_password(PASSWORD, hasher="md5")
+    user.save()
+    client = APIClient()
+    credentials = {"email": user.email, "password": PASSWORD}
+
+    response = client.post("/api/auth/jwt/create/", credentials, format="json")
+
+    assert response.status_code == 200  # noqa: PLR2004
+    drain()
+    user.refresh_from_db()
+    assert user.password.startswith("argon2$argon2id$v=19$m=64,t=1,p=1$")
+
+    # Con otros costes, el siguiente login lo vuelve a rehacer.
+    argon2.ARGON2_TIME_COST = 2
+    assert client.post("/api/auth/jwt/create/", credentials, format="json").data
+    drain()
+    user.refresh_from_db()
+    assert user.password.startswith("argon2$argon2id$v=19$m=64,t=2,p=1$")
+
+
+@pytest.mark.django_db(transaction=True)
+def test_async_check_password_rehashes(argon2):
+    user = UserFactory()
+    user.password = make_password(PASSWORD, hasher="md5")
+    user.save()
+
+    assert not async_to_sync(user.acheck_password)("wrong")
+    assert async_to_sync(user.acheck_password)(PASSWORD)
+    drain()
+
+    user.refresh_from_db()
+    assert user.password.startswith("argon2$")
+    assert user.check_password(PASSWORD)
+
+
+def test_workers_publish_and_the_view_sums(argon2, db, monkeypatch, redis_client):
+    monkeypatch.setattr(hashers, "_published", {})
+    make_password(PASSWORD)
+    publish_hashing_stats()
+
+    [worker] = hashers.worker_hashing_stats()
+    assert (worker["concurrency"], worker["completed"]) == (1, 1)
+
+    client = APIClient()
+    url = reverse("api:password-hashing-stats-list")
+    client.force_authenticate(UserFactory())
+    assert client.get(url).status_code == 403  # noqa: PLR2004
+    client.force_authenticate(UserFactory(is_staff=True))
+
+    response = client.get(url)
+
+    assert response.data["workers"] == [worker]
+    assert response.data["completed"] == 1
+    assert response.data["max_wait_ms"] == worker["max_wait_ms"]
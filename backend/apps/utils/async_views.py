@@ -0,0 +1,95 @@
+"""
+Async read-only JSON views for the hot GET endpoints.
+
+Under Uvicorn every DRF view is sync: Django runs it through
+``sync_to_async`` and, with ``ATOMIC_REQUESTS``, inside a transaction
+(``BEGIN``/``COMMIT`` round trips even for a cache hit). An
+:class:`AsyncReadView` runs on the event loop instead:
+
+- it is exempt from ``ATOMIC_REQUESTS`` (Django refuses to wrap async
+  views in one anyway);
+- it reads through the async ORM and the async cache API;
+- it skips DRF's per-request machinery (negotiation, throttles, permission
+  classes) but answers the same JSON bodies and ``{"detail": ...}`` errors
+  as the sync endpoints, so clients can switch between them.
+
+Authentication is the bearer access token of ``SIMPLE_JWT``, checked only
+by views with ``authentication_required`` (from its claims, see
+apps.users.authentication); public views never look at it.
+"""
+
+from django.contrib.auth.models import AnonymousUser
+from django.db import transaction
+from django.http import HttpResponse
+from django.utils.decorators import method_decorator
+from django.views import View
+from rest_framework import status
+from rest_framework.exceptions import APIException
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.exceptions import NotAuthenticated
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+
+from apps.users.authentication import ClaimsJWTAuthentication
+
+
+async def aauthenticate(request):
+    """User of the request's bearer token, or ``None`` without one."""
+    authentication = ClaimsJWTAuthentication()
+    header = authentication.get_header(request)
+    if header is None:
+        return None
+    raw_token = authentication.get_raw_token(header)
+    if raw_token is None:
+        return None
+    return await authentication.aget_user(
+        authentication.get_validated_token(raw_token),
+    )
+
+
+def json_response(data, status_code: int = status.HTTP_200_OK) -> HttpResponse:
+    # El mismo render que las vistas DRF: cuerpos idénticos byte a byte.
+    return HttpResponse(
+        JSONRenderer().render(data),
+        content_type="application/json",
+        status=status_code,
+    )
+
+
+@method_decorator(transaction.non_atomic_requests, name="dispatch")
+class AsyncReadView(View):
+    """
+    Subclasses implement ``read``, which returns the payload; decorate
+    ``respond`` with ``acache_response`` to cache it.
+    """
+
+    http_method_names = ["get", "head", "options"]
+    authentication_required = False
+
+    async def get(self, request, *args, **kwargs):
+        # query_params, user... como en las vistas DRF.
+        request = Request(request)
+        try:
+            if self.authentication_required:
+                request.user = await aauthenticate(request) or AnonymousUser()
+                if not request.user.is_authenticated:
+                    raise NotAuthenticated
+            else:
+                request.user = AnonymousUser()
+            return await self.respond(request, *args, **kwargs)
+        except APIException as exc:
+            detail = exc.detail
+            response = json_response(
+                detail if isinstance(detail, dict | list) else {"detail": detail},
+                exc.status_code,
+            )
+            if isinstance(exc, NotAuthenticated | AuthenticationFailed):
+                response.status_code = status.HTTP_401_UNAUTHORIZED
+                response["WWW-Authenticate"] = 'Bearer realm="api"'
+            return response
+
+    async def respond(self, request, *args, **kwargs):
+        return json_response(await self.read(request, *args, **kwargs))
+
+    async def read(self, request, *args, **kwargs):
+        raise NotImplementedError
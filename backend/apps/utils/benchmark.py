@@ -0,0 +1,127 @@
+"""Small helpers shared by the ``benchmark_*`` management commands."""
+
+import asyncio
+import json
+import math
+import re
+import time
+from collections.abc import Callable
+from collections.abc import Sequence
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIRequestFactory
+
+
+def request_factory() -> APIRequestFactory:
+    """Request factory whose ``Host`` header passes ``ALLOWED_HOSTS``."""
+    host = next(
+        (h for h in settings.ALLOWED_HOSTS if not h.startswith((".", "*"))),
+        "localhost",
+    )
+    return APIRequestFactory(HTTP_HOST=host)
+
+
+CONTENT_LENGTH = re.compile(rb"(?im)^content-length:\s*(\d+)")
+
+
+async def _read_body(reader: asyncio.StreamReader, head: bytes) -> None:
+    if match := CONTENT_LENGTH.search(head):
+        await reader.readexactly(int(match.group(1)))
+        return
+    # Transfer-Encoding: chunked
+    while size := int((await reader.readline()).split(b";")[0], 16):
+        await reader.readexactly(size + 2)
+    await reader.readline()
+
+
+async def http_load(
+    url: str,
+    requests: int,
+    concurrency: int,
+    headers: dict[str, str] | None = None,
+    body: dict | None = None,
+) -> tuple[list[float], float, int]:
+    """
+    GET ``url`` (POST ``body`` as JSON, if given) ``requests`` times over
+    ``concurrency`` keep-alive HTTP/1.1 connections; returns per-request
+    timings, wall time and non-200 answers.
+    """
+    parts = urlsplit(url)
+    target = f"{parts.path}?{parts.query}" if parts.query else parts.path
+    payload = json.dumps(body).encode() if body is not None else b""
+    method = "POST" if body is not None else "GET"
+    lines = [f"{method} {target} HTTP/1.1", f"Host: {parts.netloc}"]
+    if body is not None:
+        lines += ["Content-Type: application/json", f"Content-Length: {len(payload)}"]
+    lines += [f"{name}: {value}" for name, value in (headers or {}).items()]
+    request = ("\r\n".join(lines) + "\r\n\r\n").encode() + payload
+    timings: list[float] = []
+    errors = 0
+
+    async def client(count: int) -> None:
+        nonlocal errors
+        reader, writer = await asyncio.open_connection(parts.hostname, parts.port or 80)
+        try:
+            for _ in range(count):
+                start = time.perf_counter()
+                writer.write(request)
+                head = await reader.readuntil(b"\r\n\r\n")
+                await _read_body(reader, head)
+                timings.append(time.perf_counter() - start)
+                errors += head.split(b" ", 2)[1] != b"200"
+        finally:
+            writer.close()
+
+    start = time.perf_counter()
+    await asyncio.gather(
+        *(
+            client(requests // concurrency + (index < requests % concurrency))
+            for index in range(concurrency)
+        ),
+    )
+    return timings, time.perf_counter() - start, errors
+
+
+def percentile(values: Sequence[float], pct: float) -> float:
+    """Nearest-rank percentile of ``values``."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(math.ceil(pct / 100 * len(ordered)) - 1, 0)
+    return ordered[rank]
+
+
+def summarize(timings: Sequence[float]) -> dict[str, float]:
+    """p50/p95/p99/max of ``timings`` (seconds) expressed in milliseconds."""
+    return {
+        "p50_ms": percentile(timings, 50) * 1000,
+        "p95_ms": percentile(timings, 95) * 1000,
+        "p99_ms": percentile(timings, 99) * 1000,
+        "max_ms": max(timings, default=0.0) * 1000,
+    }
+
+
+def measure(func: Callable[[], object], runs: int) -> tuple[list[float], list[int]]:
+    """Call ``func`` ``runs`` times and return per-call timings and query counts."""
+    timings: list[float] = []
+    queries: list[int] = []
+    for _ in range(runs):
+        with CaptureQueriesContext(connection) as ctx:
+            start = time.perf_counter()
+            func()
+            timings.append(time.perf_counter() - start)
+        queries.append(len(ctx.captured_queries))
+    return timings, queries
+
+
+def format_summary(label: str, timings: Sequence[float], queries: Sequence[int]) -> str:
+    stats = summarize(timings)
+    return (
+        f"{label}: {len(timings)} runs, "
+        f"queries/run max={max(queries, default=0)}, "
+        f"p50={stats['p50_ms']:.2f}ms p95={stats['p95_ms']:.2f}ms "
+        f"p99={stats['p99_ms']:.2f}ms max={stats['max_ms']:.2f}ms"
+    )
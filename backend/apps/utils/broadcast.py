@@ -0,0 +1,75 @@
+"""
+Messages from Django to WebSocket clients, across every ASGI worker.
+
+A group is the Redis pub/sub channel ``ws:<group>``. Each worker process
+subscribes to the groups its sockets joined and fans the messages out to
+them; see ``config.websocket``. Nothing is stored: a socket only gets the
+messages published while it is subscribed.
+
+Like the cache, publishing is best effort and never fails the caller.
+
+Groups:
+
+- ``stock.<product_id>``: ``{"type": "stock", "product", "stock", "in_stock"}``;
+- ``user.<user_id>``: ``{"type": "order", "order", "status"}`` and
+  ``{"type": "cart"}`` (the cart changed; fetch it again).
+
+Every worker also keeps a snapshot of its sockets under
+``ws:stats:<host>:<pid>``, read back by :func:`worker_stats`.
+"""
+
+import json
+import logging
+from functools import partial
+
+import redis
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+
+from .redis import get_redis
+
+logger = logging.getLogger(__name__)
+
+CHANNEL_PREFIX = "ws:"
+STATS_PREFIX = "ws:stats:"
+
+
+def channel(group: str) -> str:
+    return f"{CHANNEL_PREFIX}{group}"
+
+
+def stock_group(product_id: int) -> str:
+    return f"stock.{product_id}"
+
+
+def user_group(user_id: int) -> str:
+    return f"user.{user_id}"
+
+
+def encode(message: dict) -> str:
+    return json.dumps(message, cls=DjangoJSONEncoder)
+
+
+def group_send(*messages: tuple[str, dict]) -> None:
+    """Publish every ``(group, message)`` in one round trip."""
+    if not messages:
+        return
+    pipe = get_redis().pipeline(transaction=False)
+    for group, message in messages:
+        pipe.publish(channel(group), encode(message))
+    try:
+        pipe.execute()
+    except redis.RedisError:
+        logger.warning("WebSocket broadcast failed", exc_info=True)
+
+
+def group_send_on_commit(*messages: tuple[str, dict]) -> None:
+    """:func:`group_send` once the current transaction commits."""
+    transaction.on_commit(partial(group_send, *messages))
+
+
+def worker_stats() -> list[dict]:
+    """Latest snapshot of every live ASGI worker's WebSocket registry."""
+    client = get_redis()
+    keys = sorted(client.scan_iter(match=f"{STATS_PREFIX}*", count=1000))
+    return [json.loads(raw) for raw in client.mget(keys) if raw] if keys else []
@@ -0,0 +1,178 @@
+"""
+Conditional GET for viewset actions.
+
+:func:`conditional` gives every successful ``GET`` a weak ``ETag`` and
+answers ``304 Not Modified`` when the request's ``If-None-Match`` (or
+``If-Modified-Since``) still matches, without loading or serializing
+anything. The ETag covers the path, the normalized query, the versions of
+the given response cache groups and the validators:
+
+- actions with response cache groups: a digest of the response body. It is
+  taken on a miss from the response the action builds anyway and kept in
+  the cache under the same group versions, so these actions never run a
+  query for their validators. They go stale no longer than a cached
+  response would (``RESPONSE_CACHE_TIMEOUT``);
+- other list actions: ``MAX(updated_at)`` and ``COUNT(*)`` of the filtered
+  queryset, from a pre-query;
+- other detail actions: the ``updated_at`` of the object, from a pre-query.
+
+Only the last ones send ``Last-Modified``: a delete or a group bump changes
+the other responses without moving any ``updated_at``, and a client that
+only sends ``If-Modified-Since`` would keep a stale copy.
+"""
+
+import hashlib
+import json
+from functools import partial
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count
+from django.db.models import Max
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from rest_framework import status
+from rest_framework.utils.encoders import JSONEncoder
+
+from .response_cache import normalized_query
+from .response_cache import response_key
+from .response_cache import versions
+
+
+def list_validators(queryset) -> tuple:
+    row = queryset.order_by().aggregate(last=Max("updated_at"), count=Count("pk"))
+    return row["last"], row["count"]
+
+
+def detail_validators(queryset, lookup: dict) -> tuple | None:
+    last = (
+        queryset.filter(**lookup)
+        .prefetch_related(None)
+        .order_by()
+        .values_list("updated_at", flat=True)
+        .first()
+    )
+    return None if last is None else (last,)
+
+
+def is_detail(view, kwargs) -> bool:
+    return (view.lookup_url_kwarg or view.lookup_field) in kwargs
+
+
+def action_validators(view, kwargs) -> tuple | None:
+    if is_detail(view, kwargs):
+        lookup_kwarg = view.lookup_url_kwarg or view.lookup_field
+        return detail_validators(
+            view.get_queryset(),
+            {view.lookup_field: kwargs[lookup_kwarg]},
+        )
+    return list_validators(view.filter_queryset(view.get_queryset()))
+
+
+def body_digest(data) -> str:
+    return hashlib.sha1(
+        json.dumps(data, cls=JSONEncoder, sort_keys=True).encode(),
+        usedforsecurity=False,
+    ).hexdigest()
+
+
+def make_etag(request, validators: tuple, group_versions: list[int]) -> str:
+    digest = hashlib.sha1(
+        "|".join(
+            map(
+                str,
+                (request.path, normalized_query(request), *validators, *group_versions),
+            ),
+        ).encode(),
+        usedforsecurity=False,
+    ).hexdigest()
+    # Débil: el cuerpo depende también del renderer negociado.
+    return f'W/"{digest}"'
+
+
+def not_modified(request, etag: str, last_modified: int | None = None):
+    """A 304 carrying ``etag`` if the request's validators still match."""
+    response = get_conditional_response(
+        request,
+        etag=etag,
+        last_modified=last_modified,
+    )
+    if response is not None:
+        response["ETag"] = etag
+    return response
+
+
+def conditional(*groups: str, public: bool = False):
+    """
+    Add ``ETag`` (and ``Last-Modified``) to a viewset action and answer 304s.
+
+    ``groups`` and ``public`` are those of the action's ``cache_response``.
+    """
+
+    def decorator(method):
+        @wraps(method)
+        def wrapper(self, request, *args, **kwargs):
+            if request.method not in {"GET", "HEAD"}:
+                return method(self, request, *args, **kwargs)
+            if groups:
+                return cached_conditional(
+                    partial(method, self, request, *args, **kwargs),
+                    f"{type(self).__name__}.{method.__name__}",
+                    request,
+                    groups,
+                    public=public,
+                )
+            return queried_conditional(
+                partial(method, self, request, *args, **kwargs),
+                self,
+                request,
+                kwargs,
+            )
+
+        return wrapper
+
+    return decorator
+
+
+def cached_conditional(call, view: str, request, groups, *, public: bool):
+    """Validators from the cache, or from the body the miss builds anyway."""
+    group_versions = versions(groups)
+    key = response_key(f"{view}:validators", request, group_versions, public=public)
+    validators = cache.get(key)
+    if validators is not None:
+        etag = make_etag(request, validators, group_versions)
+        if (response := not_modified(request, etag)) is not None:
+            return response
+
+    response = call()
+    if response.status_code != status.HTTP_200_OK:
+        return response
+    if validators is None:
+        validators = (body_digest(response.data),)
+        cache.set(key, validators, settings.RESPONSE_CACHE_TIMEOUT)
+        etag = make_etag(request, validators, group_versions)
+        if (unchanged := not_modified(request, etag)) is not None:
+            return unchanged
+    response["ETag"] = etag
+    return response
+
+
+def queried_conditional(call, view, request, kwargs):
+    """Validators from a pre-query on ``updated_at``."""
+    validators = action_validators(view, kwargs)
+    if validators is None:
+        # No existe: que la acción responda el 404 como siempre.
+        return call()
+    # Solo el detalle: un borrado no mueve el MAX(updated_at) de una lista.
+    last = int(validators[0].timestamp()) if is_detail(view, kwargs) else None
+    etag = make_etag(request, validators, [])
+    if (response := not_modified(request, etag, last)) is not None:
+        return response
+
+    response = call()
+    if response.status_code == status.HTTP_200_OK:
+        response["ETag"] = etag
+        if last is not None:
+            response["Last-Modified"] = http_date(last)
+    return response
@@ -0,0 +1,191 @@
+"""
+Connection pooling profiles and their metrics.
+
+``DATABASE_POOL`` picks how connections to PostgreSQL are reused:
+
+- ``persistent``: Django's own, one connection per thread kept for
+  ``CONN_MAX_AGE`` seconds. Under Uvicorn every thread that touches the ORM
+  holds one, so connections grow with threads rather than with load.
+- ``psycopg``: a psycopg_pool pool per process shared by all its threads;
+  Django takes a connection per request and gives it back at the end. Each
+  worker publishes checkout times, waits and saturation to Redis every
+  ``DATABASE_POOL_STATS_INTERVAL`` seconds (:func:`publish_pool_stats`).
+- ``pgbouncer``: ``DATABASE_URL`` points at PgBouncer in transaction mode
+  (``PGBOUNCER_POOL_MODE=transaction`` in compose/production/pgbouncer).
+  Consecutive transactions may run on different server connections, so the
+  profile turns off prepared statements, which live in the server session.
+  Server-side cursors (``iterator()``) stay on and are only read inside
+  ``transaction.atomic()``, where they cannot outlive their connection.
+  Batch jobs that write while they read walk the table by primary key
+  instead. The metrics come from PgBouncer's admin console.
+
+The settings (config/settings/base.py) apply the profile to every alias,
+replicas included; ``GET api/database/pool/`` reports it.
+"""
+
+import contextlib
+import json
+import os
+import socket
+import time
+
+import psycopg
+import redis
+from django.conf import settings
+from django.core.signals import request_finished
+from django.db import DEFAULT_DB_ALIAS
+from django.db import connections
+from django.dispatch import receiver
+from psycopg.rows import dict_row
+
+from .broadcast import encode
+from .redis import get_redis
+
+POOL_STATS_PREFIX = "db:pool:"
+
+# Momento de la última publicación de este proceso.
+_published: dict[str, float] = {}
+
+
+def pool_snapshot(pool, elapsed: float | None = None) -> dict:
+    """
+    Metrics of a psycopg_pool pool since the previous snapshot, whose
+    counters it resets; ``elapsed`` seconds ago, for the rates.
+    """
+    stats = pool.pop_stats()
+    checkouts = stats.get("requests_num", 0)
+    waits = stats.get("requests_queued", 0)
+    wait_ms = stats.get("requests_wait_ms", 0)
+    in_use = stats["pool_size"] - stats["pool_available"]
+    return {
+        "size": stats["pool_size"],
+        "max_size": stats["pool_max"],
+        "in_use": in_use,
+        "saturation": in_use / stats["pool_max"],
+        # Peticiones esperando ahora mismo una conexión.
+        "waiting": stats.get("requests_waiting", 0),
+        "checkouts": checkouts,
+        "checkouts_per_second": checkouts / elapsed if elapsed else 0.0,
+        # Las que no encontraron conexión libre y tuvieron que esperar.
+        "waits": waits,
+        "timeouts": stats.get("requests_errors", 0),
+        "avg_checkout_ms": wait_ms / checkouts if checkouts else 0.0,
+        "avg_wait_ms": wait_ms / waits if waits else 0.0,
+    }
+
+
+def worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+@receiver(request_finished)
+def publish_pool_stats(**kwargs) -> None:
+    """Publish this worker's pools at most every DATABASE_POOL_STATS_INTERVAL."""
+    if settings.DATABASE_POOL != "psycopg":
+        return
+    now = time.monotonic()
+    then = _published.get("at")
+    interval = settings.DATABASE_POOL_STATS_INTERVAL
+    if then is not None and now - then < interval:
+        return
+    _published["at"] = now
+    # Solo los pools ya abiertos: .pool abriría el de un alias sin usar.
+    pools = connections[DEFAULT_DB_ALIAS]._connection_pools  # noqa: SLF001
+    stats = {
+        "worker": worker_id(),
+        "updated_at": time.time(),
+        "pools": {
+            alias: pool_snapshot(pool, now - then if then else None)
+            for alias, pool in sorted(pools.items())
+        },
+    }
+    # Caduca sola si el worker muere sin borrarla.
+    with contextlib.suppress(redis.RedisError):
+        get_redis().set(
+            f"{POOL_STATS_PREFIX}{stats['worker']}",
+            encode(stats),
+            ex=max(int(interval * 3), 1),
+        )
+
+
+def worker_pool_stats() -> list[dict]:
+    """Latest snapshot published by every live worker."""
+    client = get_redis()
+    keys = sorted(client.scan_iter(match=f"{POOL_STATS_PREFIX}*", count=1000))
+    return [json.loads(raw) for raw in client.mget(keys) if raw] if keys else []
+
+
+def pool_totals(workers: list[dict]) -> dict:
+    """Per-alias sums of the worker snapshots."""
+    totals = {}
+    for worker in workers:
+        for alias, pool in worker["pools"].items():
+            total = totals.setdefault(
+                alias,
+                dict.fromkeys(
+                    (
+                        "size",
+                        "max_size",
+                        "in_use",
+                        "waiting",
+                        "checkouts_per_second",
+                        "waits",
+                        "timeouts",
+                    ),
+                    0,
+                ),
+            )
+            for field in total:
+                total[field] += pool[field]
+    for total in totals.values():
+        total["saturation"] = (
+            total["in_use"] / total["max_size"] if total["max_size"] else 0.0
+        )
+    return totals
+
+
+def pgbouncer_snapshot(pool: dict, database: dict, stats: dict) -> dict:
+    """
+    Metrics of one PgBouncer database from its ``SHOW POOLS``, ``SHOW
+    DATABASES`` and ``SHOW STATS`` rows (times there are in microseconds).
+    """
+    in_use = pool["sv_active"]
+    return {
+        "database": pool["database"],
+        "pool_mode": pool["pool_mode"],
+        "pool_size": database["pool_size"],
+        "clients": pool["cl_active"],
+        "in_use": in_use,
+        "idle": pool["sv_idle"],
+        "saturation": in_use / database["pool_size"] if database["pool_size"] else 0.0,
+        # Clientes esperando ahora mismo una conexión del servidor.
+        "waiting": pool["cl_waiting"],
+        "max_wait_ms": pool["maxwait"] * 1000 + pool["maxwait_us"] / 1000,
+        "avg_wait_ms": stats["avg_wait_time"] / 1000,
+        "transactions_per_second": stats["avg_xact_count"],
+    }
+
+
+def pgbouncer_stats(alias: str = DEFAULT_DB_ALIAS) -> list[dict]:
+    """Pools of ``alias``'s database, read from PgBouncer's admin console."""
+    database = connections[alias].settings_dict
+    # La consola solo entiende el protocolo simple: ClientCursor lo usa.
+    with psycopg.connect(
+        host=database["HOST"],
+        port=database["PORT"] or None,
+        user=database["USER"],
+        password=database["PASSWORD"],
+        dbname="pgbouncer",
+        autocommit=True,
+        cursor_factory=psycopg.ClientCursor,
+        row_factory=dict_row,
+        connect_timeout=2,
+    ) as connection:
+        pools = connection.execute("SHOW POOLS").fetchall()
+        databases = {row["name"]: row for row in connection.execute("SHOW DATABASES")}
+        stats = {row["database"]: row for row in connection.execute("SHOW STATS")}
+    return [
+        pgbouncer_snapshot(pool, databases[pool["database"]], stats[pool["database"]])
+        for pool in pools
+        if pool["database"] == database["NAME"]
+    ]
@@ -0,0 +1,201 @@
+"""
+Streaming CSV and NDJSON exports.
+
+An export reads the queryset through a server-side cursor
+(``iterator(chunk_size=...)``) and yields the encoded rows in blocks of about
+``BLOCK_SIZE`` bytes to a ``StreamingHttpResponse``. Memory stays flat
+whatever the number of rows.
+
+The cursor is read inside its own transaction, opened by the generator
+itself, because the response body is produced after the view and its
+``ATOMIC_REQUESTS`` transaction have returned. Inside a transaction Django
+declares the cursor ``WITHOUT HOLD``, so it lives and dies on one server
+connection. That works behind pgbouncer in transaction pooling mode,
+where a ``WITH HOLD`` cursor opened in autocommit could land on another
+backend between fetches.
+
+Under ASGI Django consumes a synchronous streaming body with
+``sync_to_async(list)``, building the whole export in memory before the
+first byte leaves. There the response gets :func:`aiter_blocks` instead,
+which pulls one block at a time on the request's thread-sensitive thread,
+so the transaction and its cursor stay on one thread and connection.
+"""
+
+import csv
+import json
+from collections.abc import AsyncIterator
+from collections.abc import Generator
+from collections.abc import Iterable
+from collections.abc import Iterator
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models import QuerySet
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from django.utils.decorators import method_decorator
+from rest_framework.permissions import IsAdminUser
+from rest_framework.renderers import BaseRenderer
+from rest_framework.viewsets import GenericViewSet
+
+CSV = "csv"
+NDJSON = "ndjson"
+CONTENT_TYPES = {CSV: "text/csv; charset=utf-8", NDJSON: "application/x-ndjson"}
+BLOCK_SIZE = 64 * 1024
+
+
+class Echo:
+    """File-like object whose ``write`` returns the value; for ``csv.writer``."""
+
+    def write(self, value: str) -> str:
+        return value
+
+
+def stream_rows(queryset: QuerySet, lookups: Iterable[str]) -> Iterator[tuple]:
+    with transaction.atomic(using=queryset.db):
+        yield from queryset.values_list(*lookups).iterator(
+            chunk_size=settings.EXPORT_CHUNK_SIZE,
+        )
+
+
+def csv_lines(header: list[str], rows: Iterable[tuple]) -> Iterator[str]:
+    writer = csv.writer(Echo())
+    yield writer.writerow(header)
+    for row in rows:
+        yield writer.writerow(row)
+
+
+def ndjson_lines(header: list[str], rows: Iterable[tuple]) -> Iterator[str]:
+    for row in rows:
+        yield json.dumps(dict(zip(header, row, strict=True)), cls=DjangoJSONEncoder)
+        yield "\n"
+
+
+def blocks(lines: Iterable[str], size: int = BLOCK_SIZE) -> Iterator[bytes]:
+    """Join ``lines`` into blocks of about ``size`` bytes."""
+    buffer: list[str] = []
+    length = 0
+    for line in lines:
+        buffer.append(line)
+        length += len(line)
+        if length >= size:
+            yield "".join(buffer).encode()
+            buffer, length = [], 0
+    if buffer:
+        yield "".join(buffer).encode()
+
+
+async def aiter_blocks(
+    iterator: Generator[bytes, None, None],
+) -> AsyncIterator[bytes]:
+    """Async view of ``iterator``, advanced block by block in a thread."""
+    # thread_sensitive: el mismo hilo (y conexión) que abrió la transacción.
+    next_block = sync_to_async(next, thread_sensitive=True)
+    try:
+        while (block := await next_block(iterator, None)) is not None:
+            yield block
+    finally:
+        # Si el cliente se va, cierra el cursor y la transacción en ese hilo.
+        await sync_to_async(iterator.close, thread_sensitive=True)()
+
+
+def is_asgi(request) -> bool:
+    """Whether ``request`` (Django's or DRF's) is served by the ASGI handler."""
+    return isinstance(getattr(request, "_request", request), ASGIRequest)
+
+
+def streaming_export(
+    queryset: QuerySet,
+    columns: dict[str, str],
+    export_format: str,
+    name: str,
+    *,
+    asynchronous: bool = False,
+) -> StreamingHttpResponse:
+    """
+    Stream ``queryset`` as a ``<name>-<date>.<format>`` attachment;
+    ``columns`` maps each column name to its ``values_list`` lookup.
+    ``asynchronous`` gives the response an async body, for ASGI.
+    """
+    header = list(columns)
+    encode = csv_lines if export_format == CSV else ndjson_lines
+    # El cuerpo se genera fuera de la petición: fija ya la base (una réplica).
+    queryset = queryset.using(queryset.db)
+    content = blocks(encode(header, stream_rows(queryset, columns.values())))
+    response = StreamingHttpResponse(
+        aiter_blocks(content) if asynchronous else content,
+        content_type=CONTENT_TYPES[export_format],
+    )
+    filename = f"{name}-{timezone.localdate():%Y%m%d}.{export_format}"
+    response["Content-Disposition"] = f'attachment; filename="{filename}"'
+    return response
+
+
+def export_action(columns: dict[str, str], export_format: str, name: str):
+    """Admin action that streams the selected rows."""
+
+    def action(modeladmin, request, queryset):
+        return streaming_export(
+            queryset.order_by("pk"),
+            columns,
+            export_format,
+            name,
+            asynchronous=is_asgi(request),
+        )
+
+    action.__name__ = f"export_{export_format}"
+    action.short_description = f"Export selected as {export_format.upper()}"
+    return action
+
+
+class CSVRenderer(BaseRenderer):
+    """
+    Lets DRF negotiate ``?format=csv`` or ``Accept: text/csv``; exports
+    return a ``StreamingHttpResponse``, so only error bodies go through it.
+    """
+
+    media_type = "text/csv"
+    format = CSV
+    charset = "utf-8"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        rows = data.items() if isinstance(data, dict) else [("detail", data)]
+        return "".join(csv_lines(["field", "detail"], rows))
+
+
+class NDJSONRenderer(BaseRenderer):
+    media_type = "application/x-ndjson"
+    format = NDJSON
+    charset = "utf-8"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return json.dumps(data, cls=DjangoJSONEncoder) + "\n"
+
+
+# La transacción la abre stream_rows() al generar la respuesta.
+@method_decorator(transaction.non_atomic_requests, name="dispatch")
+class ExportViewSet(GenericViewSet):
+    """
+    Staff-only streaming export of ``get_queryset()``.
+
+    Subclasses set ``export_columns`` and ``export_name``; the format is
+    negotiated with ``?format=csv|ndjson`` or the ``Accept`` header.
+    """
+
+    permission_classes = [IsAdminUser]
+    renderer_classes = [CSVRenderer, NDJSONRenderer]
+    pagination_class = None
+    export_columns: dict[str, str] = {}
+    export_name = "export"
+
+    def list(self, request, *args, **kwargs):
+        return streaming_export(
+            self.filter_queryset(self.get_queryset()),
+            self.export_columns,
+            request.accepted_renderer.format,
+            self.export_name,
+            asynchronous=is_asgi(request),
+        )
@@ -0,0 +1,304 @@
+"""
+Keyset (cursor) pagination shared by every API list endpoint.
+
+Pages are addressed by the position of their boundary row on an indexed
+ordering tuple, e.g. ``(created_at, id)`` from ``AuditDates``, so fetching
+page N costs the same as fetching page 1: no ``OFFSET`` scan and no
+``COUNT(*)`` unless the client explicitly asks for one.
+"""
+
+import json
+from base64 import b64decode
+from base64 import b64encode
+from binascii import Error as BinasciiError
+
+from asgiref.sync import sync_to_async
+from django.core.exceptions import FieldDoesNotExist
+from django.core.exceptions import ValidationError
+from django.db import connections
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param
+from rest_framework.utils.urls import replace_query_param
+
+COUNT_EXACT = "exact"
+COUNT_ESTIMATE = "estimate"
+# Si REST_FRAMEWORK no fija PAGE_SIZE, las listas se paginan igual.
+DEFAULT_PAGE_SIZE = 12
+
+
+def estimate_count(queryset) -> int:
+    """
+    Row estimate for ``queryset`` taken from the PostgreSQL planner.
+
+    Runs ``EXPLAIN`` instead of ``COUNT(*)``, so the cost does not grow with
+    the table. Other backends fall back to an exact count.
+    """
+    queryset = queryset.order_by()
+    connection = connections[queryset.db]
+    if connection.vendor != "postgresql":
+        return queryset.count()
+    sql, params = queryset.query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+class LegacyPageNumberPagination(PageNumberPagination):
+    """``?page=N`` pagination kept for clients that have not moved to cursors."""
+
+    page_size = api_settings.PAGE_SIZE or DEFAULT_PAGE_SIZE
+    page_size_query_param = "page_size"
+    max_page_size = 100
+
+
+class KeysetPagination(BasePagination):
+    """
+    Opaque-cursor pagination over a unique ordering tuple.
+
+    The ordering comes from ``view.keyset_ordering`` when defined, otherwise
+    ``("-created_at", "-pk")`` for ``AuditDates`` models and ``("-pk",)`` for
+    everything else. ``pk`` is appended when missing so the tuple is unique.
+
+    Query parameters:
+
+    * ``cursor``: opaque position returned in ``next``/``previous``.
+    * ``page_size``: rows per page, capped at ``max_page_size``.
+    * ``count``: ``exact`` or ``estimate``; the count is skipped otherwise.
+    * ``page``: switches to :class:`LegacyPageNumberPagination`.
+    """
+
+    cursor_query_param = "cursor"
+    page_size_query_param = "page_size"
+    count_query_param = "count"
+    legacy_query_param = "page"
+    page_size = api_settings.PAGE_SIZE or DEFAULT_PAGE_SIZE
+    max_page_size = 100
+    default_ordering = ("-created_at", "-pk")
+    legacy_pagination_class = LegacyPageNumberPagination
+    invalid_cursor_message = "Invalid cursor"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.legacy_paginator = None
+        if (
+            self.legacy_query_param in request.query_params
+            and self.cursor_query_param not in request.query_params
+        ):
+            self.legacy_paginator = self.legacy_pagination_class()
+            ordering = self.get_ordering(request, queryset, view)
+            return self.legacy_paginator.paginate_queryset(
+                queryset.order_by(*ordering),
+                request,
+                view=view,
+            )
+
+        self.prepare(queryset, request, view)
+        self.count = self.get_count(queryset, request)
+        queryset, position = self.seek(queryset, request)
+        return self.finish(list(queryset[: self.page_size + 1]), position)
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """
+        Async twin of :meth:`paginate_queryset`; cursors only, without the
+        legacy ``page`` parameter.
+        """
+        self.request = request
+        self.legacy_paginator = None
+        self.prepare(queryset, request, view)
+        self.count = await self.aget_count(queryset, request)
+        queryset, position = self.seek(queryset, request)
+        return self.finish(
+            [row async for row in queryset[: self.page_size + 1]],
+            position,
+        )
+
+    def prepare(self, queryset, request, view) -> None:
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.fields = [
+            self._get_field(queryset.model, name.lstrip("-")) for name in self.ordering
+        ]
+
+    def seek(self, queryset, request):
+        """``queryset`` ordered and after the cursor position, and that position."""
+        position, self.reverse = self.decode_cursor(request)
+        ordering = self.ordering
+        if self.reverse:
+            ordering = tuple(_invert(name) for name in ordering)
+        queryset = queryset.order_by(*ordering)
+        if position is not None:
+            queryset = queryset.filter(self._after(ordering, position))
+        return queryset, position
+
+    def finish(self, results: list, position) -> list:
+        self.has_following = len(results) > self.page_size
+        self.page = results[: self.page_size]
+        if self.reverse:
+            self.page.reverse()
+        self.has_cursor = position is not None
+        return self.page
+
+    def get_paginated_response(self, data):
+        if self.legacy_paginator is not None:
+            return self.legacy_paginator.get_paginated_response(data)
+        return Response(self.get_paginated_data(data))
+
+    def get_paginated_data(self, data) -> dict:
+        payload = {
+            "next": self.get_next_link(),
+            "previous": self.get_previous_link(),
+            "results": data,
+        }
+        if self.count is not None:
+            payload = {"count": self.count, **payload}
+        return payload
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "count": {"type": "integer", "example": 123},
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                "name": self.cursor_query_param,
+                "required": False,
+                "in": "query",
+                "description": "The pagination cursor value.",
+                "schema": {"type": "string"},
+            },
+            {
+                "name": self.page_size_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Number of results to return per page.",
+                "schema": {"type": "integer"},
+            },
+            {
+                "name": self.count_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Include a total: `exact` or `estimate`.",
+                "schema": {"type": "string", "enum": [COUNT_EXACT, COUNT_ESTIMATE]},
+            },
+        ]
+
+    def get_page_size(self, request) -> int:
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if page_size <= 0:
+            return self.page_size
+        return min(page_size, self.max_page_size)
+
+    def get_ordering(self, request, queryset, view) -> tuple[str, ...]:
+        ordering = getattr(view, "keyset_ordering", None)
+        if ordering is None:
+            try:
+                queryset.model._meta.get_field("created_at")  # noqa: SLF001
+            except FieldDoesNotExist:
+                ordering = ("-pk",)
+            else:
+                ordering = self.default_ordering
+        ordering = tuple(ordering)
+        unique = {"pk", queryset.model._meta.pk.name}  # noqa: SLF001
+        if not unique & {name.lstrip("-") for name in ordering}:
+            ordering = (*ordering, "-pk")
+        return ordering
+
+    def get_count(self, queryset, request) -> int | None:
+        mode = request.query_params.get(self.count_query_param)
+        if mode == COUNT_EXACT:
+            return queryset.count()
+        if mode == COUNT_ESTIMATE:
+            return estimate_count(queryset)
+        return None
+
+    async def aget_count(self, queryset, request) -> int | None:
+        mode = request.query_params.get(self.count_query_param)
+        if mode == COUNT_EXACT:
+            return await queryset.acount()
+        if mode == COUNT_ESTIMATE:
+            return await sync_to_async(estimate_count)(queryset)
+        return None
+
+    def get_next_link(self) -> str | None:
+        if not self.page:
+            return None
+        if self.reverse or self.has_following:
+            return self.encode_cursor(self.page[-1], reverse=False)
+        return None
+
+    def get_previous_link(self) -> str | None:
+        if not self.page:
+            return None
+        if (self.reverse and self.has_following) or (
+            not self.reverse and self.has_cursor
+        ):
+            return self.encode_cursor(self.page[0], reverse=True)
+        return None
+
+    def encode_cursor(self, instance, *, reverse: bool) -> str:
+        values = [field.value_to_string(instance) for field in self.fields]
+        payload = json.dumps({"p": values, "r": int(reverse)}, separators=(",", ":"))
+        cursor = b64encode(payload.encode()).decode()
+        return replace_query_param(
+            remove_query_param(self.base_url, self.count_query_param),
+            self.cursor_query_param,
+            cursor,
+        )
+
+    def decode_cursor(self, request) -> tuple[list | None, bool]:
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None, False
+        try:
+            payload = json.loads(b64decode(encoded.encode(), validate=True))
+            values = payload["p"]
+            reverse = bool(payload.get("r"))
+            if len(values) != len(self.fields):
+                raise ValueError  # noqa: TRY301
+            position = [
+                field.to_python(value)
+                for field, value in zip(self.fields, values, strict=True)
+            ]
+        except (BinasciiError, KeyError, TypeError, ValueError, ValidationError):
+            raise NotFound(self.invalid_cursor_message) from None
+        return position, reverse
+
+    def _get_field(self, model, name):
+        if name == "pk":
+            return model._meta.pk  # noqa: SLF001
+        return model._meta.get_field(name)  # noqa: SLF001
+
+    def _after(self, ordering, position) -> Q:
+        """``WHERE`` clause for rows strictly after ``position`` on ``ordering``."""
+        condition = Q()
+        for index, name in enumerate(ordering):
+            lookup = "lt" if name.startswith("-") else "gt"
+            step = Q(**{f"{name.lstrip('-')}__{lookup}": position[index]})
+            for previous, value in zip(ordering[:index], position[:index], strict=True):
+                step &= Q(**{previous.lstrip("-"): value})
+            condition |= step
+        return condition
+
+
+def _invert(name: str) -> str:
+    return name[1:] if name.startswith("-") else f"-{name}"
@@ -0,0 +1,26 @@
+"""Shared client for the Redis at ``REDIS_URL``, for data that is not a cache."""
+
+from functools import cache
+
+import redis
+import redis.asyncio
+from django.conf import settings
+
+
+def _options() -> dict:
+    return {"ssl_cert_reqs": None} if settings.REDIS_SSL else {}
+
+
+@cache
+def get_redis() -> redis.Redis:
+    """Process-wide client; its connection pool is reused by every caller."""
+    return redis.Redis.from_url(settings.REDIS_URL, decode_responses=True, **_options())
+
+
+def get_async_redis() -> redis.asyncio.Redis:
+    """New asyncio client; its pool belongs to the event loop that uses it."""
+    return redis.asyncio.Redis.from_url(
+        settings.REDIS_URL,
+        decode_responses=True,
+        **_options(),
+    )
@@ -0,0 +1,205 @@
+"""
+Versioned response cache for read-only API actions.
+
+:func:`cache_response` stores ``response.data`` in the default cache under a
+key built from:
+
+- the view and action;
+- the request path and its normalized query parameters;
+- the current version of every model group the response depends on;
+- for non-public responses, the user.
+
+Writes never delete keys: :func:`bump` increments a group version, so every
+key built from the old version stops being read and simply expires.
+``RESPONSE_CACHE_TIMEOUT`` bounds how long data that changes without a bump
+(e.g. stock) can be served.
+
+Hits and misses are counted per view in the cache, under ``STATS_KEY``, and
+every cached action answers with an ``X-Cache: HIT`` or ``MISS`` header.
+
+:func:`acache_response` is the same cache for the async views of
+``apps.utils.async_views``, through the async cache API; it keeps the
+rendered body, so a hit skips serialization too.
+"""
+
+import hashlib
+import time
+from functools import partial
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.http import HttpResponse
+from rest_framework import status
+from rest_framework.response import Response
+
+VERSION_KEY = "response-cache:version:{}"
+RESPONSE_KEY = "response-cache:{view}:{versions}:{scope}:{digest}"
+STATS_KEY = "response-cache:stats:{view}:{outcome}"
+CACHE_HEADER = "X-Cache"
+# Parámetros que no cambian la respuesta y solo fragmentarían la caché.
+IGNORED_PARAMS = ("utm_", "_")
+
+
+def versions(groups: tuple[str, ...]) -> list[int]:
+    keys = [VERSION_KEY.format(group) for group in groups]
+    found = cache.get_many(keys)
+    for key in keys:
+        if key not in found:
+            # Arranca en un valor nuevo: nunca repite una versión ya usada.
+            cache.add(key, time.time_ns(), None)
+            found[key] = cache.get(key)
+    return [found[key] for key in keys]
+
+
+async def aversions(groups: tuple[str, ...]) -> list[int]:
+    """Async twin of :func:`versions`."""
+    keys = [VERSION_KEY.format(group) for group in groups]
+    found = await cache.aget_many(keys)
+    for key in keys:
+        if key not in found:
+            await cache.aadd(key, time.time_ns(), None)
+            found[key] = await cache.aget(key)
+    return [found[key] for key in keys]
+
+
+def bump(*groups: str) -> None:
+    """Invalidate every cached response that depends on any of ``groups``."""
+    for group in groups:
+        try:
+            cache.incr(VERSION_KEY.format(group))
+        except ValueError:
+            cache.add(VERSION_KEY.format(group), time.time_ns(), None)
+
+
+def bump_on_commit(*groups: str) -> None:
+    """:func:`bump` once the current transaction commits, or now outside one."""
+    transaction.on_commit(partial(bump, *groups))
+
+
+def normalized_query(request) -> str:
+    """Query string with sorted keys and without empty or tracking parameters."""
+    params = sorted(
+        (key, value)
+        for key, values in request.query_params.lists()
+        if not key.startswith(IGNORED_PARAMS)
+        for value in values
+        if value != ""
+    )
+    return "&".join(f"{key}={value}" for key, value in params)
+
+
+def count(view: str, outcome: str) -> None:
+    key = STATS_KEY.format(view=view, outcome=outcome)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, 0, None)
+        cache.incr(key)
+
+
+async def acount(view: str, outcome: str) -> None:
+    key = STATS_KEY.format(view=view, outcome=outcome)
+    try:
+        await cache.aincr(key)
+    except ValueError:
+        await cache.aadd(key, 0, None)
+        await cache.aincr(key)
+
+
+def stats(view: str) -> dict[str, int]:
+    keys = {
+        outcome: STATS_KEY.format(view=view, outcome=outcome)
+        for outcome in ("hit", "miss")
+    }
+    found = cache.get_many(keys.values())
+    return {outcome: found.get(key, 0) for outcome, key in keys.items()}
+
+
+def response_key(view: str, request, group_versions: list[int], *, public: bool) -> str:
+    user = request.user
+    scope = (
+        "public" if public else f"user:{user.pk}" if user.is_authenticated else "anon"
+    )
+    digest = hashlib.sha1(
+        f"{request.path}?{normalized_query(request)}".encode(),
+        usedforsecurity=False,
+    ).hexdigest()
+    return RESPONSE_KEY.format(
+        view=view,
+        versions=".".join(map(str, group_versions)),
+        scope=scope,
+        digest=digest,
+    )
+
+
+def cache_response(*groups: str, public: bool = False, timeout: int | None = None):
+    """
+    Cache the successful responses of a viewset action.
+
+    ``groups`` are the model groups whose writes invalidate the response.
+    With ``public=True`` every user shares the same entry, so only use it
+    when the response has nothing user-specific. Otherwise each user gets
+    its own entry and anonymous requests share one.
+    """
+
+    def decorator(method):
+        @wraps(method)
+        def wrapper(self, request, *args, **kwargs):
+            if request.method not in {"GET", "HEAD"}:
+                return method(self, request, *args, **kwargs)
+            view = f"{type(self).__name__}.{method.__name__}"
+            key = response_key(view, request, versions(groups), public=public)
+            cached = cache.get(key)
+            if cached is not None:
+                count(view, "hit")
+                response = Response(cached)
+                response[CACHE_HEADER] = "HIT"
+                return response
+
+            count(view, "miss")
+            response = method(self, request, *args, **kwargs)
+            if response.status_code == status.HTTP_200_OK:
+                cache.set(
+                    key,
+                    response.data,
+                    settings.RESPONSE_CACHE_TIMEOUT if timeout is None else timeout,
+                )
+            response[CACHE_HEADER] = "MISS"
+            return response
+
+        return wrapper
+
+    return decorator
+
+
+def acache_response(*groups: str, public: bool = False, timeout: int | None = None):
+    """:func:`cache_response` for the async ``get`` of an ``AsyncReadView``."""
+
+    def decorator(method):
+        @wraps(method)
+        async def wrapper(self, request, *args, **kwargs):
+            view = f"{type(self).__name__}.{method.__name__}"
+            key = response_key(view, request, await aversions(groups), public=public)
+            cached = await cache.aget(key)
+            if cached is not None:
+                await acount(view, "hit")
+                response = HttpResponse(cached, content_type="application/json")
+                response[CACHE_HEADER] = "HIT"
+                return response
+
+            await acount(view, "miss")
+            response = await method(self, request, *args, **kwargs)
+            if response.status_code == status.HTTP_200_OK:
+                await cache.aset(
+                    key,
+                    response.content,
+                    settings.RESPONSE_CACHE_TIMEOUT if timeout is None else timeout,
+                )
+            response[CACHE_HEADER] = "MISS"
+            return response
+
+        return wrapper
+
+    return decorator
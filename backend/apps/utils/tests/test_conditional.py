@@ -0,0 +1,166 @@
+import uuid
+
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from apps.catalog.models import Product
+from apps.catalog.services import refresh_listings
+from apps.catalog.tests.factories import ProductFactory
+from apps.inventory.services import reserve
+from apps.orders.models import Order
+from apps.utils.response_cache import VERSION_KEY
+from apps.utils.response_cache import bump
+
+pytestmark = pytest.mark.django_db
+
+
+class TestConditional:
+    def test_detail_returns_304_without_serializing(self):
+        product = ProductFactory()
+        client = APIClient()
+        url = reverse("api:product-detail", args=[product.slug])
+
+        first = client.get(url)
+        with CaptureQueriesContext(connection) as ctx:
+            second = client.get(url, headers={"If-None-Match": first["ETag"]})
+
+        assert first["ETag"].startswith('W/"')
+        # Depende también de la versión del catálogo, no solo de updated_at.
+        assert "Last-Modified" not in first
+        assert second.status_code == status.HTTP_304_NOT_MODIFIED
+        assert second["ETag"] == first["ETag"]
+        assert not second.content
+        # Los validadores salen de la caché, junto a la respuesta.
+        assert not [
+            q["sql"] for q in ctx.captured_queries if "SAVEPOINT" not in q["sql"]
+        ]
+
+    def test_detail_changes_with_updated_at_and_catalog_version(
+        self,
+        django_capture_on_commit_callbacks,
+    ):
+        product = ProductFactory()
+        client = APIClient()
+        url = reverse("api:product-detail", args=[product.slug])
+        etag = client.get(url)["ETag"]
+
+        bump("catalog")
+        after_bump = client.get(url, headers={"If-None-Match": etag})
+        product.name = "Renamed"
+        with django_capture_on_commit_callbacks(execute=True):
+            product.save()
+        after_save = client.get(url, headers={"If-None-Match": after_bump["ETag"]})
+
+        assert after_bump.status_code == status.HTTP_200_OK
+        assert after_save.status_code == status.HTTP_200_OK
+        assert after_save.data["name"] == "Renamed"
+
+    def test_list_validators_follow_rows(self, django_capture_on_commit_callbacks):
+        product = ProductFactory()
+        refresh_listings()
+        client = APIClient()
+        url = reverse("api:product-list")
+        first = client.get(url)
+        with CaptureQueriesContext(connection) as ctx:
+            client.get(url, headers={"If-None-Match": first["ETag"]})
+        # Ni COUNT ni MAX en un acierto de la caché.
+        assert not [q for q in ctx.captured_queries if "COUNT" in q["sql"]]
+
+        assert client.get(
+            url,
+            headers={"If-None-Match": first["ETag"]},
+        ).status_code == (status.HTTP_304_NOT_MODIFIED)
+        assert "Last-Modified" not in first
+        assert client.get(
+            f"{url}?in_stock=true",
+            headers={"If-None-Match": first["ETag"]},
+        ).status_code == (status.HTTP_200_OK)
+
+        Product.objects.filter(pk=product.pk).update(is_active=False)
+        with django_capture_on_commit_callbacks(execute=True):
+            refresh_listings()
+
+        assert client.get(
+            url,
+            headers={"If-None-Match": first["ETag"]},
+        ).status_code == (status.HTTP_200_OK)
+
+    def test_private_lists(self, user):
+        client = APIClient()
+        client.force_authenticate(user)
+        url = reverse("api:order-list")
+        etag = client.get(url)["ETag"]
+
+        Order.objects.create(
+            user=user,
+            subtotal=1,
+            total=1,
+            reservation_token=uuid.uuid4(),
+        )
+
+        assert client.get(url, headers={"If-None-Match": etag}).status_code == (
+            status.HTTP_200_OK
+        )
+
+    def test_list_misses_take_the_etag_from_the_body(self):
+        ProductFactory()
+        refresh_listings()
+        client = APIClient()
+        url = reverse("api:product-list")
+        etag = client.get(url)["ETag"]
+        # Caducan la respuesta y sus validadores, no la versión del catálogo.
+        version = cache.get(VERSION_KEY.format("catalog"))
+        cache.clear()
+        cache.set(VERSION_KEY.format("catalog"), version, None)
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = client.get(url, headers={"If-None-Match": etag})
+
+        # Mismo cuerpo, misma ETag; ni MAX ni COUNT para obtenerla.
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert not [q for q in ctx.captured_queries if "MAX(" in q["sql"]]
+
+    def test_private_details_send_last_modified(self, user):
+        order = Order.objects.create(
+            user=user,
+            subtotal=1,
+            total=1,
+            reservation_token=uuid.uuid4(),
+        )
+        client = APIClient()
+        client.force_authenticate(user)
+        url = reverse("api:order-detail", args=[order.pk])
+        first = client.get(url)
+
+        response = client.get(
+            url,
+            headers={"If-Modified-Since": first["Last-Modified"]},
+        )
+
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert "Last-Modified" not in client.get(reverse("api:order-list"))
+
+    def test_stock_changes_change_the_detail_etag(self):
+        product = ProductFactory(stock=5)
+        client = APIClient()
+        url = reverse("api:product-detail", args=[product.slug])
+        etag = client.get(url)["ETag"]
+
+        reserve([(product.pk, 1)])
+        # Sin bump: los validadores cacheados caducan con la respuesta.
+        cache.clear()
+        response = client.get(url, headers={"If-None-Match": etag})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["stock"] == 4  # noqa: PLR2004
+
+    def test_missing_object_is_still_a_404(self):
+        response = APIClient().get(reverse("api:product-detail", args=["nope"]))
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+        assert "ETag" not in response
@@ -0,0 +1,112 @@
+import pytest
+from django.db import connection
+from django.db import connections
+from django.urls import reverse
+from psycopg.conninfo import make_conninfo
+from psycopg_pool import ConnectionPool
+from psycopg_pool import PoolTimeout
+from rest_framework.test import APIClient
+
+from apps.users.tests.factories import UserFactory
+from apps.utils import db_pool
+from apps.utils.db_pool import pgbouncer_snapshot
+from apps.utils.db_pool import pool_snapshot
+from apps.utils.db_pool import publish_pool_stats
+from apps.utils.db_pool import worker_pool_stats
+
+
+@pytest.fixture
+def pool(db):
+    database = connection.settings_dict
+    conninfo = make_conninfo(
+        dbname=database["NAME"],
+        host=database["HOST"],
+        port=database["PORT"] or None,
+        user=database["USER"],
+        password=database["PASSWORD"],
+    )
+    with ConnectionPool(conninfo, min_size=1, max_size=1, timeout=0.05) as pool:
+        pool.wait()
+        yield pool
+
+
+def test_pool_snapshot(pool):
+    with pool.connection():
+        with pytest.raises(PoolTimeout):
+            pool.getconn()
+        stats = pool_snapshot(pool, elapsed=2)
+
+    assert (stats["size"], stats["max_size"], stats["in_use"]) == (1, 1, 1)
+    assert stats["saturation"] == 1.0
+    assert (stats["checkouts"], stats["waits"], stats["timeouts"]) == (2, 1, 1)
+    assert stats["checkouts_per_second"] == 1.0
+    assert stats["avg_wait_ms"] >= 50  # noqa: PLR2004
+    assert stats["avg_checkout_ms"] == stats["avg_wait_ms"] / 2
+
+    # Los contadores vuelven a cero tras cada instantánea.
+    stats = pool_snapshot(pool)
+    assert (stats["in_use"], stats["checkouts"], stats["waits"]) == (0, 0, 0)
+
+
+def test_workers_publish_and_the_view_sums(pool, settings, monkeypatch, redis_client):
+    settings.DATABASE_POOL = "psycopg"
+    monkeypatch.setattr(
+        type(connections["default"]),
+        "_connection_pools",
+        {"default": pool},
+    )
+    monkeypatch.setattr(db_pool, "_published", {})
+    with pool.connection():
+        publish_pool_stats()
+    with pool.connection():
+        pass
+    # Dentro del intervalo no vuelve a publicar.
+    publish_pool_stats()
+
+    [worker] = worker_pool_stats()
+    assert worker["pools"]["default"]["checkouts"] == 1
+    assert worker["pools"]["default"]["in_use"] == 1
+
+    client = APIClient()
+    url = reverse("api:database-pool-list")
+    client.force_authenticate(UserFactory())
+    assert client.get(url).status_code == 403  # noqa: PLR2004
+    client.force_authenticate(UserFactory(is_staff=True))
+
+    response = client.get(url)
+
+    assert response.data["mode"] == "psycopg"
+    assert response.data["workers"] == [worker]
+    assert response.data["pools"]["default"]["in_use"] == 1
+    assert response.data["pools"]["default"]["saturation"] == 1.0
+
+
+def test_persistent_connections_have_no_pool(db):
+    client = APIClient()
+    client.force_authenticate(UserFactory(is_staff=True))
+
+    response = client.get(reverse("api:database-pool-list"))
+
+    assert response.data == {"mode": "persistent"}
+
+
+def test_pgbouncer_snapshot():
+    stats = pgbouncer_snapshot(
+        {
+            "database": "ecommerce",
+            "pool_mode": "transaction",
+            "cl_active": 40,
+            "cl_waiting": 3,
+            "sv_active": 15,
+            "sv_idle": 5,
+            "maxwait": 1,
+            "maxwait_us": 250000,
+        },
+        {"name": "ecommerce", "pool_size": 20},
+        {"database": "ecommerce", "avg_wait_time": 1500, "avg_xact_count": 120},
+    )
+
+    assert stats["saturation"] == 0.75  # noqa: PLR2004
+    assert stats["waiting"] == 3  # noqa: PLR2004
+    assert stats["max_wait_ms"] == 1250  # noqa: PLR2004
+    assert stats["avg_wait_ms"] == 1.5  # noqa: PLR2004
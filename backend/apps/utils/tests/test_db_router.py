@@ -0,0 +1,128 @@
+import asyncio
+
+import pytest
+from django.http import HttpResponse
+from django.test import RequestFactory
+
+from apps.catalog.models import Product
+from apps.utils import db_router
+from apps.utils.db_router import PIN_COOKIE
+from apps.utils.db_router import ReplicaMiddleware
+from apps.utils.db_router import replication_lag
+from apps.utils.db_router import use_replicas
+
+
+@pytest.fixture
+def replicas(settings, monkeypatch):
+    settings.DATABASE_REPLICAS = ["replica1", "replica2"]
+    lags = {"replica1": 0.0, "replica2": 0.0}
+    checks = []
+
+    def lag(alias):
+        checks.append(alias)
+        if lags[alias] is None:
+            raise db_router.DatabaseError
+        return lags[alias]
+
+    monkeypatch.setattr(db_router, "replication_lag", lag)
+    monkeypatch.setattr(db_router, "_health", {})
+    return lags, checks
+
+
+def serve(request, view=lambda: None):
+    """Run ``view`` inside the middleware; returns the aliases it read from."""
+    reads = []
+
+    def get_response(request):
+        reads.append(Product.objects.all().db)
+        view()
+        reads.append(Product.objects.all().db)
+        return HttpResponse()
+
+    response = ReplicaMiddleware(get_response)(request)
+    return reads, response
+
+
+class TestReplicaRouter:
+    def test_safe_requests_read_one_replica(self, replicas):
+        reads, response = serve(RequestFactory().get("/"))
+
+        assert reads[0] in {"replica1", "replica2"}
+        assert reads[1] == reads[0]
+        assert PIN_COOKIE not in response.cookies
+
+    def test_unsafe_requests_read_the_primary(self, replicas):
+        reads, _ = serve(RequestFactory().post("/"))
+
+        assert reads == ["default", "default"]
+
+    def test_a_write_pins_the_request_and_then_the_client(self, replicas, settings):
+        # select_for_update() consulta db_for_write sin ir a la base de datos.
+        reads, response = serve(
+            RequestFactory().get("/"),
+            lambda: Product.objects.select_for_update().db,
+        )
+
+        assert reads[1] == "default"
+        cookie = response.cookies[PIN_COOKIE]
+        assert cookie["max-age"] == settings.DATABASE_REPLICA_PIN_SECONDS
+
+        request = RequestFactory().get("/")
+        request.COOKIES[PIN_COOKIE] = "1"
+        assert serve(request)[0] == ["default", "default"]
+
+    def test_outside_requests_reads_go_to_the_primary(self, replicas):
+        assert Product.objects.all().db == "default"
+        with use_replicas():
+            assert Product.objects.all().db in {"replica1", "replica2"}
+            assert Product.objects.select_for_update().db == "default"
+            assert Product.objects.all().db == "default"
+
+    def test_lagging_or_unreachable_replicas_leave_the_rotation(self, replicas):
+        lags, checks = replicas
+        lags.update(replica1=60.0, replica2=None)
+
+        assert serve(RequestFactory().get("/"))[0] == ["default", "default"]
+        lags.update(replica1=0.0)
+        # El resultado se reutiliza durante DATABASE_REPLICA_CHECK_INTERVAL.
+        assert serve(RequestFactory().get("/"))[0] == ["default", "default"]
+        assert sorted(checks) == ["replica1", "replica2"]
+
+        db_router._health.clear()  # noqa: SLF001
+        assert serve(RequestFactory().get("/"))[0] == ["replica1", "replica1"]
+
+    def test_without_replicas_everything_reads_the_primary(self):
+        reads, response = serve(
+            RequestFactory().get("/"),
+            lambda: Product.objects.select_for_update().db,
+        )
+
+        assert reads == ["default", "default"]
+        assert PIN_COOKIE not in response.cookies
+
+
+def test_async_requests_keep_their_own_state(replicas):
+    async def get_response(request):
+        await asyncio.sleep(0)
+        if request.method == "POST":
+            Product.objects.select_for_update().db  # noqa: B018
+        return HttpResponse(Product.objects.all().db)
+
+    middleware = ReplicaMiddleware(get_response)
+
+    async def both():
+        return await asyncio.gather(
+            middleware(RequestFactory().get("/")),
+            middleware(RequestFactory().post("/")),
+        )
+
+    read, wrote = asyncio.run(both())
+    assert read.content.decode() in {"replica1", "replica2"}
+    assert PIN_COOKIE not in read.cookies
+    assert wrote.content == b"default"
+    assert PIN_COOKIE in wrote.cookies
+
+
+@pytest.mark.django_db
+def test_a_primary_reports_no_lag():
+    assert replication_lag("default") == 0
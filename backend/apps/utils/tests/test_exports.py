@@ -0,0 +1,138 @@
+import csv
+import io
+import json
+import uuid
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.contrib.admin.sites import site
+from django.test import AsyncClient
+from django.test import RequestFactory
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from apps.orders.models import Order
+from apps.users.models import User
+from apps.users.tests.factories import UserFactory
+from apps.users.tokens import ClaimsAccessToken
+from apps.utils import exports
+from apps.utils.exports import blocks
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def staff_client() -> APIClient:
+    client = APIClient()
+    client.force_authenticate(UserFactory(is_staff=True))
+    return client
+
+
+def content(response) -> str:
+    return b"".join(response.streaming_content).decode()
+
+
+def test_blocks_join_lines_up_to_the_size():
+    assert list(blocks(["ab", "cd", "e"], size=3)) == [b"abcd", b"e"]
+    assert list(blocks([])) == []
+
+
+class TestExportViewSet:
+    def test_streams_users_as_csv(self, staff_client, settings):
+        settings.EXPORT_CHUNK_SIZE = 2
+        UserFactory.create_batch(4)
+
+        response = staff_client.get(reverse("api:user-export-list"), {"format": "csv"})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.streaming
+        assert response["Content-Type"] == "text/csv; charset=utf-8"
+        assert response["Content-Disposition"].startswith(
+            'attachment; filename="users-',
+        )
+        rows = list(csv.DictReader(io.StringIO(content(response))))
+        assert [row["email"] for row in rows] == list(
+            User.objects.order_by("pk").values_list("email", flat=True),
+        )
+
+    def test_streams_orders_as_ndjson(self, staff_client):
+        order = Order.objects.create(
+            user=UserFactory(),
+            subtotal=10,
+            total=10,
+            reservation_token=uuid.uuid4(),
+        )
+
+        response = staff_client.get(
+            reverse("api:order-export-list"),
+            headers={"Accept": "application/x-ndjson"},
+        )
+
+        [row] = [json.loads(line) for line in content(response).splitlines()]
+        assert row.pop("created_at").startswith(f"{order.created_at:%Y-%m-%dT%H:%M:%S}")
+        assert row == {
+            "id": order.pk,
+            "user_email": order.user.email,
+            "status": "placed",
+            "subtotal": "10.00",
+            "coupon_code": "",
+            "discount": "0.00",
+            "total": "10.00",
+        }
+
+    def test_streams_block_by_block_under_asgi(self, settings, monkeypatch):
+        settings.EXPORT_CHUNK_SIZE = 2
+        UserFactory.create_batch(4)
+        token = ClaimsAccessToken.for_user(UserFactory(is_staff=True))
+        pulled = []
+        blocks = exports.blocks
+
+        def counted(lines, size=1):
+            for block in blocks(lines, size):
+                pulled.append(block)
+                yield block
+
+        monkeypatch.setattr(exports, "blocks", counted)
+
+        async def first_blocks():
+            response = await AsyncClient().get(
+                reverse("api:user-export-list"),
+                {"format": "csv"},
+                headers={"Authorization": f"Bearer {token}"},
+            )
+            received = []
+            async for block in response.streaming_content:
+                # Cada bloque sale antes de generar el siguiente.
+                assert len(pulled) == len(received) + 1
+                received.append(block)
+            return response, b"".join(received).decode()
+
+        response, body = async_to_sync(first_blocks)()
+
+        assert response.is_async
+        rows = list(csv.DictReader(io.StringIO(body)))
+        assert [row["email"] for row in rows] == list(
+            User.objects.order_by("pk").values_list("email", flat=True),
+        )
+
+    def test_staff_only(self, user):
+        client = APIClient()
+        client.force_authenticate(user)
+
+        response = client.get(reverse("api:user-export-list"), {"format": "csv"})
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+def test_admin_action_streams_selected_rows():
+    users = UserFactory.create_batch(3)
+    model_admin = site._registry[User]  # noqa: SLF001
+    request = RequestFactory().get("/")
+    request.user = UserFactory(is_staff=True, is_superuser=True)
+    action = model_admin.get_actions(request)["export_csv"][0]
+
+    response = action(model_admin, None, User.objects.filter(pk__in=[users[0].pk]))
+
+    rows = list(csv.DictReader(io.StringIO(content(response))))
+    assert [row["email"] for row in rows] == [users[0].email]
@@ -0,0 +1,81 @@
+import pytest
+from rest_framework.exceptions import NotFound
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from apps.users.models import User
+from apps.utils.pagination import KeysetPagination
+
+pytestmark = pytest.mark.django_db
+
+
+class FakeView:
+    keyset_ordering = ("first_name", "pk")
+
+
+def paginate(url, view=None, page_size=None):
+    paginator = KeysetPagination()
+    if page_size:
+        paginator.page_size = page_size
+    request = Request(APIRequestFactory().get(url))
+    page = paginator.paginate_queryset(User.objects.all(), request, view=view)
+    return paginator, page, paginator.get_paginated_response([u.pk for u in page]).data
+
+
+@pytest.fixture
+def users():
+    return User.objects.bulk_create(
+        User(email=f"user{i}@example.com", first_name=f"name{i // 3}")
+        for i in range(10)
+    )
+
+
+class TestKeysetPagination:
+    def test_walks_forward_and_back_without_gaps(self, users):
+        seen = []
+        url = "/fake-url/"
+        while url:
+            _, _, data = paginate(url, view=FakeView(), page_size=4)
+            seen.extend(data["results"])
+            url = data["next"]
+
+        expected = [u.pk for u in sorted(users, key=lambda u: (u.first_name, u.pk))]
+        assert seen == expected
+
+        _, _, last = paginate(
+            paginate("/fake-url/", view=FakeView(), page_size=4)[2]["next"],
+            view=FakeView(),
+            page_size=4,
+        )
+        _, _, back = paginate(last["previous"], view=FakeView(), page_size=4)
+        assert back["results"] == expected[:4]
+        assert back["previous"] is None
+
+    def test_defaults_to_pk_without_created_at(self, users):
+        paginator, _, data = paginate("/fake-url/", page_size=3)
+        assert paginator.ordering == ("-pk",)
+        assert data["results"] == sorted((u.pk for u in users), reverse=True)[:3]
+
+    def test_count_is_skipped_unless_requested(self, users):
+        _, _, data = paginate("/fake-url/")
+        assert "count" not in data
+
+        _, _, data = paginate("/fake-url/?count=exact")
+        assert data["count"] == len(users)
+
+        _, _, data = paginate("/fake-url/?count=estimate")
+        assert isinstance(data["count"], int)
+
+    def test_page_param_uses_legacy_pagination(self, users):
+        page_size = 4
+        _, _, data = paginate(
+            f"/fake-url/?page=2&page_size={page_size}",
+            view=FakeView(),
+        )
+        assert data["count"] == len(users)
+        assert len(data["results"]) == page_size
+        assert "page=3" in data["next"]
+
+    def test_invalid_cursor(self, users):
+        with pytest.raises(NotFound):
+            paginate("/fake-url/?cursor=not-a-cursor")
@@ -0,0 +1,96 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.response import Response
+from rest_framework.test import APIClient
+from rest_framework.test import APIRequestFactory
+from rest_framework.test import force_authenticate
+from rest_framework.viewsets import ViewSet
+
+from apps.catalog.services import refresh_listings
+from apps.catalog.tests.factories import ProductFactory
+from apps.users.tests.factories import UserFactory
+from apps.utils.response_cache import CACHE_HEADER
+from apps.utils.response_cache import bump
+from apps.utils.response_cache import cache_response
+from apps.utils.response_cache import stats
+
+pytestmark = pytest.mark.django_db
+
+
+class WhoAmIViewSet(ViewSet):
+    calls = 0
+
+    @cache_response("users")
+    def list(self, request):
+        WhoAmIViewSet.calls += 1
+        if request.query_params.get("fail"):
+            return Response(status=400)
+        return Response({"user": request.user.pk})
+
+
+def whoami(user=None, query=""):
+    request = APIRequestFactory().get(f"/whoami/{query}")
+    if user:
+        force_authenticate(request, user)
+    return WhoAmIViewSet.as_view({"get": "list"})(request)
+
+
+class TestCacheResponse:
+    def test_second_read_is_served_from_cache(self):
+        ProductFactory()
+        refresh_listings()
+        client = APIClient()
+        url = reverse("api:product-list")
+
+        first = client.get(url, {"in_stock": "true", "brand": ""})
+        with CaptureQueriesContext(connection) as ctx:
+            second = client.get(f"{url}?utm_source=mail&in_stock=true")
+
+        assert (first[CACHE_HEADER], second[CACHE_HEADER]) == ("MISS", "HIT")
+        assert second.data == first.data
+        # Ni la página ni los validadores de conditional() van a Postgres.
+        assert not [
+            q["sql"] for q in ctx.captured_queries if "SAVEPOINT" not in q["sql"]
+        ]
+        assert stats("ProductViewSet.list") == {"hit": 1, "miss": 1}
+
+    def test_bump_invalidates(self):
+        client = APIClient()
+        url = reverse("api:product-list")
+        client.get(url)
+
+        bump("catalog")
+
+        assert client.get(url)[CACHE_HEADER] == "MISS"
+
+    def test_listing_writes_bump_the_catalog(self, django_capture_on_commit_callbacks):
+        client = APIClient()
+        url = reverse("api:product-list")
+        assert client.get(url).data["results"] == []
+
+        with django_capture_on_commit_callbacks(execute=True):
+            ProductFactory()
+
+        response = client.get(url)
+        assert response[CACHE_HEADER] == "MISS"
+        assert len(response.data["results"]) == 1
+
+    def test_private_responses_are_kept_per_user(self):
+        alice, bob = UserFactory.create_batch(2)
+        WhoAmIViewSet.calls = 0
+
+        assert whoami(alice).data == {"user": alice.pk}
+        assert whoami(bob).data == {"user": bob.pk}
+        assert whoami().data == {"user": None}
+        assert whoami(alice)[CACHE_HEADER] == "HIT"
+        assert WhoAmIViewSet.calls == 3  # noqa: PLR2004
+
+    def test_errors_are_not_cached(self):
+        WhoAmIViewSet.calls = 0
+
+        whoami(query="?fail=1")
+        whoami(query="?fail=1")
+
+        assert WhoAmIViewSet.calls == 2  # noqa: PLR2004
@@ -0,0 +1,320 @@
+import asyncio
+import json
+from datetime import timedelta
+
+import pytest
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from apps.cart import services as cart
+from apps.catalog.tests.factories import ProductFactory
+from apps.inventory.services import reserve
+from apps.users.tests.factories import UserFactory
+from apps.utils.broadcast import STATS_PREFIX
+from apps.utils.broadcast import channel
+from apps.utils.broadcast import encode
+from apps.utils.broadcast import group_send
+from config.websocket import CLOSE_IDLE
+from config.websocket import CLOSE_TRY_AGAIN_LATER
+from config.websocket import CLOSE_UNAUTHORIZED
+from config.websocket import Connection
+from config.websocket import get_registry
+from config.websocket import websocket_application
+
+TIMEOUT = 2
+
+
+def published(pubsub) -> dict:
+    # La primera lectura puede ser la confirmación del SUBSCRIBE.
+    for _ in range(2):
+        message = pubsub.get_message(timeout=TIMEOUT)
+        if message is not None:
+            return json.loads(message["data"])
+    return {}
+
+
+class Socket:
+    """Drives ``websocket_application`` like an ASGI server would."""
+
+    def __init__(self, token=None):
+        self.inbox: asyncio.Queue = asyncio.Queue()
+        self.outbox: asyncio.Queue = asyncio.Queue()
+        query = f"token={token}".encode() if token else b""
+        scope = {"type": "websocket", "path": "/ws/", "query_string": query}
+        self.task = asyncio.create_task(
+            websocket_application(scope, self.inbox.get, self.outbox.put),
+        )
+
+    async def connect(self):
+        await self.inbox.put({"type": "websocket.connect"})
+        assert (await self.event())["type"] == "websocket.accept"
+
+    async def send(self, text):
+        await self.inbox.put({"type": "websocket.receive", "text": text})
+
+    async def subscribe(self, group):
+        await self.send(json.dumps({"action": "subscribe", "group": group}))
+        return await self.json()
+
+    async def event(self):
+        return await asyncio.wait_for(self.outbox.get(), TIMEOUT)
+
+    async def json(self):
+        return json.loads((await self.event())["text"])
+
+    async def close(self):
+        await self.inbox.put({"type": "websocket.disconnect"})
+        await asyncio.wait_for(self.task, TIMEOUT)
+
+
+@pytest.fixture
+def member(transactional_db):
+    return UserFactory()
+
+
+@pytest.fixture
+def token(member):
+    return str(AccessToken.for_user(member))
+
+
+@pytest.mark.usefixtures("redis_client")
+class TestWebsocketApplication:
+    def test_ping(self, token):
+        async def scenario():
+            socket = Socket(token)
+            await socket.connect()
+            await socket.send("ping")
+            assert (await socket.event())["text"] == "pong!"
+            await socket.close()
+
+        asyncio.run(scenario())
+
+    def test_group_messages_reach_every_subscriber(self, token):
+        async def scenario():
+            alice, bob, other = Socket(token), Socket(token), Socket(token)
+            for socket in (alice, bob, other):
+                await socket.connect()
+            assert await alice.subscribe("stock.1") == {
+                "type": "subscribed",
+                "group": "stock.1",
+            }
+            await bob.subscribe("stock.1")
+            await other.subscribe("stock.2")
+
+            group_send(("stock.1", {"type": "stock", "stock": 3}))
+
+            assert await alice.json() == {"type": "stock", "stock": 3}
+            assert await bob.json() == {"type": "stock", "stock": 3}
+            assert other.outbox.empty()
+            for socket in (alice, bob, other):
+                await socket.close()
+
+        asyncio.run(scenario())
+
+    def test_user_groups_need_that_user(self, member, token):
+        async def scenario():
+            socket = Socket(token)
+            await socket.connect()
+
+            assert (await socket.subscribe(f"user.{member.pk + 1}"))["type"] == "error"
+            assert (await socket.subscribe(f"user.{member.pk}"))["type"] == "subscribed"
+            await socket.close()
+
+        asyncio.run(scenario())
+
+    def test_invalid_messages(self, token):
+        async def scenario():
+            socket = Socket(token)
+            await socket.connect()
+            await socket.send("{not json")
+            assert (await socket.json())["detail"] == "Invalid message."
+            await socket.send(json.dumps({"action": "shout", "group": "stock.1"}))
+            assert (await socket.json())["detail"] == "Unknown action."
+            await socket.close()
+
+        asyncio.run(scenario())
+
+    def test_invalid_token_is_rejected_before_accepting(self, member):
+        async def scenario():
+            socket = Socket("not-a-jwt")
+            await socket.inbox.put({"type": "websocket.connect"})
+            assert await socket.event() == {
+                "type": "websocket.close",
+                "code": CLOSE_UNAUTHORIZED,
+            }
+            await asyncio.wait_for(socket.task, TIMEOUT)
+
+        asyncio.run(scenario())
+
+    def test_token_in_the_first_message(self, member, token):
+        async def scenario():
+            socket = Socket()
+            await socket.connect()
+            await socket.send(json.dumps({"action": "auth", "token": token}))
+            assert await socket.json() == {"type": "authenticated"}
+            assert (await socket.subscribe(f"user.{member.pk}"))["type"] == "subscribed"
+            await socket.close()
+
+        asyncio.run(scenario())
+
+    def test_anything_else_before_authenticating_closes(self, member):
+        async def scenario():
+            socket = Socket()
+            await socket.connect()
+            await socket.send(json.dumps({"action": "subscribe", "group": "stock.1"}))
+            assert await socket.event() == {
+                "type": "websocket.close",
+                "code": CLOSE_UNAUTHORIZED,
+            }
+            await socket.close()
+
+        asyncio.run(scenario())
+
+
+@pytest.mark.usefixtures("redis_client")
+class TestRegistry:
+    def test_heartbeat_pings_and_reaps(self, settings, token):
+        async def scenario():
+            quiet, chatty, anonymous = Socket(token), Socket(token), Socket()
+            for socket in (quiet, chatty, anonymous):
+                await socket.connect()
+            registry = get_registry()
+            now = asyncio.get_running_loop().time()
+
+            registry.reap(now + 1)
+            assert await quiet.json() == {"type": "ping"}
+            assert await chatty.json() == {"type": "ping"}
+            assert anonymous.outbox.empty()
+
+            await chatty.send("pong")
+            await asyncio.sleep(0)
+            registry.reap(now + settings.WEBSOCKET_IDLE_TIMEOUT)
+            assert (await quiet.event())["code"] == CLOSE_IDLE
+            assert (await anonymous.event())["code"] == CLOSE_UNAUTHORIZED
+            assert await chatty.json() == {"type": "ping"}
+            assert registry.totals["reaped"] == 1
+
+            # quiet sí termina el cierre; anonymous no contesta y se aborta.
+            await quiet.close()
+            registry.reap(
+                now
+                + settings.WEBSOCKET_IDLE_TIMEOUT
+                + settings.WEBSOCKET_CLOSE_TIMEOUT,
+            )
+            await asyncio.wait_for(anonymous.task, TIMEOUT)
+            assert registry.totals["aborted"] == 1
+            assert len(registry.connections) == 1
+            await chatty.close()
+            assert registry.connections == set()
+
+        asyncio.run(scenario())
+
+    def test_expired_tokens_are_closed(self, member):
+        token = AccessToken.for_user(member)
+        token.set_exp(lifetime=timedelta(seconds=30))
+
+        async def scenario():
+            socket = Socket(str(token))
+            await socket.connect()
+            get_registry().reap(asyncio.get_running_loop().time() + 30)
+            assert (await socket.event())["code"] == CLOSE_UNAUTHORIZED
+            await socket.close()
+
+        asyncio.run(scenario())
+
+    def test_stats(self, token, redis_client):
+        async def scenario():
+            socket = Socket(token)
+            await socket.connect()
+            await socket.send("ping")
+            await socket.event()
+            registry = get_registry()
+            now = asyncio.get_running_loop().time()
+            registry.stats(now)
+            await socket.send("ping")
+            await socket.event()
+            stats = registry.stats(now + 2)
+            await socket.close()
+            return stats
+
+        stats = asyncio.run(scenario())
+
+        assert stats["connections"] == stats["authenticated"] == 1
+        assert (stats["received"], stats["sent"]) == (2, 2)
+        assert stats["received_per_second"] == stats["sent_per_second"] == 1 / 2
+
+        redis_client.set(f"{STATS_PREFIX}{stats['worker']}", encode(stats))
+        admin = UserFactory(is_staff=True)
+        client = APIClient()
+        url = reverse("api:websocket-stats-list")
+        client.force_authenticate(UserFactory())
+        assert client.get(url).status_code == 403  # noqa: PLR2004
+        client.force_authenticate(admin)
+
+        response = client.get(url)
+
+        assert response.data["connections"] == 1
+        assert response.data["workers"] == [stats]
+
+
+def test_slow_client_is_closed_when_its_queue_fills():
+    async def scenario():
+        sent = []
+        blocked = asyncio.Event()
+
+        async def send(message):
+            sent.append(message)
+            if message["type"] == "websocket.send":
+                await blocked.wait()
+
+        connection = Connection(send, queue_size=2)
+        writer = asyncio.create_task(connection.write())
+        for index in range(4):
+            connection.push(str(index))
+            await asyncio.sleep(0)
+        blocked.set()
+        await asyncio.wait_for(writer, TIMEOUT)
+        return sent
+
+    sent = asyncio.run(scenario())
+
+    assert sent == [
+        {"type": "websocket.send", "text": "0"},
+        {"type": "websocket.close", "code": CLOSE_TRY_AGAIN_LATER},
+    ]
+
+
+@pytest.mark.django_db
+class TestPublishers:
+    @pytest.fixture
+    def messages(self, redis_client):
+        pubsub = redis_client.pubsub(ignore_subscribe_messages=True)
+
+        def read(*groups):
+            pubsub.subscribe(*(channel(group) for group in groups))
+            return pubsub
+
+        yield read
+        pubsub.close()
+
+    def test_cart_writes(self, user, messages):
+        pubsub = messages(f"user.{user.pk}")
+
+        cart.add_item(user.pk, 1)
+
+        assert published(pubsub) == {"type": "cart"}
+
+    def test_stock_changes(self, messages, django_capture_on_commit_callbacks):
+        product = ProductFactory(stock=2)
+        pubsub = messages(f"stock.{product.pk}")
+
+        with django_capture_on_commit_callbacks(execute=True):
+            reserve([(product.pk, 2)])
+
+        assert published(pubsub) == {
+            "type": "stock",
+            "product": product.pk,
+            "stock": 0,
+            "in_stock": False,
+        }
@@ -1,3 +1,57 @@
-from django.shortcuts import render
+import psycopg
+from django.conf import settings
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import extend_schema
+from rest_framework.exceptions import APIException
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from rest_framework.viewsets import ViewSet
 
-# Create your views here.
+from .broadcast import worker_stats
+from .db_pool import pgbouncer_stats
+from .db_pool import pool_totals
+from .db_pool import worker_pool_stats
+
+
+class WebsocketStatsViewSet(ViewSet):
+    """Open sockets and message rates of every ASGI worker, for operators."""
+
+    permission_classes = [IsAdminUser]
+
+    @extend_schema(operation_id="websockets_stats", responses=OpenApiTypes.OBJECT)
+    def list(self, request):
+        workers = worker_stats()
+        totals = {
+            field: sum(worker[field] for worker in workers)
+            for field in (
+                "connections",
+                "authenticated",
+                "received_per_second",
+                "sent_per_second",
+            )
+        }
+        return Response({**totals, "workers": workers})
+
+
+class DatabasePoolStatsViewSet(ViewSet):
+    """Usage of the connection pools of DATABASE_POOL, for operators."""
+
+    permission_classes = [IsAdminUser]
+
+    @extend_schema(operation_id="database_pool_stats", responses=OpenApiTypes.OBJECT)
+    def list(self, request):
+        mode = settings.DATABASE_POOL
+        if mode == "psycopg":
+            workers = worker_pool_stats()
+            return Response(
+                {"mode": mode, "pools": pool_totals(workers), "workers": workers},
+            )
+        if mode == "pgbouncer":
+            try:
+                pools = pgbouncer_stats()
+            except psycopg.Error as exc:
+                msg = "PgBouncer's admin console is unavailable."
+                raise APIException(msg) from exc
+            return Response({"mode": mode, "pools": pools})
+        # Conexiones persistentes: cada hilo tiene la suya, no hay pool.
+        return Response({"mode": mode})
@@ -7,6 +7,9 @@ if [ -z "$POSTGRES_USER" ] || [ -z "$POSTGRES_PASSWORD" ]; then
     exit 1
 fi
 
+# Modo de pool: session (por defecto) o transaction
+export PGBOUNCER_POOL_MODE="${PGBOUNCER_POOL_MODE:-session}"
+
 # Generar userlist.txt desde el template usando envsubst
 echo "Generating userlist.txt from template..."
 envsubst < /etc/pgbouncer/userlist.template.txt > /etc/pgbouncer/userlist.txt
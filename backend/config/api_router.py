@@ -3,7 +3,58 @@ from django.urls import path
 from rest_framework.routers import DefaultRouter
 from rest_framework.routers import SimpleRouter
 
+from apps.cart.api.views import CartViewSet
+from apps.catalog.api.async_views import AsyncProductDetailView
+from apps.catalog.api.async_views import AsyncProductListView
+from apps.catalog.api.views import AutocompleteViewSet
+from apps.catalog.api.views import CategoryViewSet
+from apps.catalog.api.views import ProductViewSet
+from apps.orders.api.views import OrderExportViewSet
+from apps.orders.api.views import OrderViewSet
+from apps.users.api.async_views import AsyncCurrentUserView
+from apps.users.api.views import PasswordHashingStatsViewSet
+from apps.users.api.views import UserExportViewSet
+from apps.utils.views import DatabasePoolStatsViewSet
+from apps.utils.views import WebsocketStatsViewSet
+
 router = DefaultRouter() if settings.DEBUG else SimpleRouter()
 
+router.register("autocomplete", AutocompleteViewSet, basename="autocomplete")
+router.register("cart", CartViewSet, basename="cart")
+router.register("categories", CategoryViewSet, basename="category")
+router.register(
+    "database/pool",
+    DatabasePoolStatsViewSet,
+    basename="database-pool",
+)
+router.register("exports/orders", OrderExportViewSet, basename="order-export")
+router.register("exports/users", UserExportViewSet, basename="user-export")
+router.register("orders", OrderViewSet, basename="order")
+router.register(
+    "password-hashing/stats",
+    PasswordHashingStatsViewSet,
+    basename="password-hashing-stats",
+)
+router.register("products", ProductViewSet, basename="product")
+router.register(
+    "websockets/stats",
+    WebsocketStatsViewSet,
+    basename="websocket-stats",
+)
+
 app_name = "api"
-urlpatterns = router.urls + []
+# Lecturas calientes servidas por vistas async; ver apps.utils.async_views.
+urlpatterns = [
+    *router.urls,
+    path(
+        "async/products/",
+        AsyncProductListView.as_view(),
+        name="async-product-list",
+    ),
+    path(
+        "async/products/<str:slug>/",
+        AsyncProductDetailView.as_view(),
+        name="async-product-detail",
+    ),
+    path("async/users/me/", AsyncCurrentUserView.as_view(), name="async-user-me"),
+]
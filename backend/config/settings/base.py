@@ -6,6 +6,7 @@ import ssl
 from pathlib import Path
 
 import environ
+from django.core.exceptions import ImproperlyConfigured
 
 BASE_DIR = Path(__file__).resolve(strict=True).parent.parent.parent
 # apps/
@@ -50,6 +51,35 @@ LOCALE_PATHS = [str(BASE_DIR / "locale")]
 # https://docs.djangoproject.com/en/dev/ref/settings/#databases
 DATABASES = {"default": env.db("DATABASE_URL")}
 DATABASES["default"]["ATOMIC_REQUESTS"] = True
+# Read replicas of default: one "replica<N>" alias per URL, used by
+# apps.utils.db_router for the reads of safe requests
+DATABASE_REPLICAS = []
+for _index, _url in enumerate(env.list("DATABASE_REPLICA_URLS", default=[]), 1):
+    _replica = env.db_url_config(_url)
+    _replica.setdefault("OPTIONS", {}).setdefault("connect_timeout", 2)
+    _replica["TEST"] = {"MIRROR": "default"}
+    DATABASES[f"replica{_index}"] = _replica
+    DATABASE_REPLICAS.append(f"replica{_index}")
+DATABASE_ROUTERS = ["apps.utils.db_router.ReplicaRouter"]
+# How connections are reused (apps/utils/db_pool.py): "persistent" (one per
+# thread, kept CONN_MAX_AGE), "psycopg" (a psycopg_pool pool per process) or
+# "pgbouncer" (DATABASE_URL points at PgBouncer in transaction mode)
+DATABASE_POOL = env("DATABASE_POOL", default="persistent")
+for _database in DATABASES.values():
+    if DATABASE_POOL == "psycopg":
+        _database.setdefault("OPTIONS", {})["pool"] = {
+            "min_size": env.int("DATABASE_POOL_MIN_SIZE", default=2),
+            "max_size": env.int("DATABASE_POOL_MAX_SIZE", default=10),
+            "timeout": env.float("DATABASE_POOL_TIMEOUT", default=10.0),
+        }
+    elif DATABASE_POOL == "pgbouncer":
+        # Cada transacción puede ir a otra conexión del servidor: nada de
+        # sentencias preparadas, que viven en la sesión. Los cursores de
+        # servidor se quedan, pero solo dentro de transaction.atomic().
+        _database.setdefault("OPTIONS", {})["prepare_threshold"] = None
+    elif DATABASE_POOL != "persistent":
+        msg = f"Unknown DATABASE_POOL {DATABASE_POOL!r}"
+        raise ImproperlyConfigured(msg)
 # https://docs.djangoproject.com/en/stable/ref/settings/#std:setting-DEFAULT_AUTO_FIELD
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
@@ -75,11 +105,19 @@ DJANGO_APPS = [
     "django.contrib.staticfiles",
     # "django.contrib.humanize", # Handy template tags
     "django.contrib.admin",
+    "django.contrib.postgres",
     "django.forms",
 ]
 
 PROJECT_APPS = ["apps.users"]
-ECOMMERCE_APPS = []
+ECOMMERCE_APPS = [
+    "apps.catalog",
+    "apps.inventory",
+    "apps.cart",
+    "apps.orders",
+    "apps.pricing",
+    "apps.recommendations",
+]
 THIRD_PARTY_APPS = [
     "corsheaders",
     "rest_framework",
@@ -126,7 +164,8 @@ LOGIN_URL = "admin:login"
 # https://docs.djangoproject.com/en/dev/ref/settings/#password-hashers
 PASSWORD_HASHERS = [
     # https://docs.djangoproject.com/en/dev/topics/auth/passwords/#using-argon2-with-django
-    "django.contrib.auth.hashers.Argon2PasswordHasher",
+    # Argon2 on a bounded thread pool, see apps/users/hashers.py
+    "apps.users.hashers.BoundedArgon2PasswordHasher",
     "django.contrib.auth.hashers.PBKDF2PasswordHasher",
     "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
     "django.contrib.auth.hashers.BCryptSHA256PasswordHasher",
@@ -149,6 +188,7 @@ MIDDLEWARE = [
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",
+    "apps.utils.db_router.ReplicaMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.locale.LocaleMiddleware",
@@ -338,11 +378,11 @@ CELERY_WORKER_HIJACK_ROOT_LOGGER = False
 # django-rest-framework - https://www.django-rest-framework.org/api-guide/settings/
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "apps.users.authentication.ClaimsJWTAuthentication",
     ),
     "DEFAULT_PERMISSION_CLASSES": ("rest_framework.permissions.IsAuthenticatedOrReadOnly",),
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
-    "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
+    "DEFAULT_PAGINATION_CLASS": "apps.utils.pagination.KeysetPagination",
     "PAGE_SIZE": 12,
 }
 
@@ -353,7 +393,9 @@ SIMPLE_JWT = {
     "ROTATE_REFRESH_TOKENS": True,
     "BLACKLIST_AFTER_ROTATION": True,
     "ALGORITHM": "HS256",
-    "AUTH_TOKEN_CLASSES": ("rest_framework_simplejwt.tokens.AccessToken",),
+    "AUTH_TOKEN_CLASSES": ("apps.users.tokens.ClaimsAccessToken",),
+    "TOKEN_OBTAIN_SERIALIZER": "apps.users.serializers.ClaimsTokenObtainPairSerializer",
+    "TOKEN_REFRESH_SERIALIZER": "apps.users.serializers.ClaimsTokenRefreshSerializer",
 }
 
 DJOSER = {
@@ -369,14 +411,23 @@ DJOSER = {
   'USERNAME_RESET_CONFIRM_URL': 'email/reset/confirm/{uid}/{token}',
   'ACTIVATION_URL': 'activate/{uid}/{token}',
   'SEND_ACTIVATION_EMAIL': True,
-  'SOCIAL_AUTH_TOKEN_STRATEGY': 'djoser.social.token.jwt.TokenStrategy',
+  'SOCIAL_AUTH_TOKEN_STRATEGY': 'apps.users.authentication.TokenStrategy',
   'SOCIAL_AUTH_ALLOWED_REDIRECT_URIS': env.list("DJOSER_SOCIAL_AUTH_ALLOWED_REDIRECT_URIS", default=['http://localhost:8000/google', 'http://localhost:8000/facebook']),
   'SERIALIZERS': {
       'user_create': 'apps.users.serializers.UserCreateSerializer',
       'user': 'apps.users.serializers.UserCreateSerializer',
       'current_user': 'apps.users.serializers.UserCreateSerializer',
       'user_delete': 'djoser.serializers.UserDeleteSerializer',
-  }
+  },
+  # Rendered and sent by Celery after the commit, see apps/users/email.py
+  'EMAIL': {
+      'activation': 'apps.users.email.ActivationEmail',
+      'confirmation': 'apps.users.email.ConfirmationEmail',
+      'password_reset': 'apps.users.email.PasswordResetEmail',
+      'password_changed_confirmation': 'apps.users.email.PasswordChangedConfirmationEmail',
+      'username_changed_confirmation': 'apps.users.email.UsernameChangedConfirmationEmail',
+      'username_reset': 'apps.users.email.UsernameResetEmail',
+  },
 }
 
 # By Default swagger ui is available only to admin user(s). You can change permission classes to change that
@@ -392,3 +443,65 @@ SPECTACULAR_SETTINGS = {
 # ------------------------------------------------------------------------------
 # Frontend URL for email activation links
 FRONTEND_URL = env("FRONTEND_URL", default="http://localhost:5173")
+# How long checkout reservations hold stock before expire_reservations_task
+# gives it back
+INVENTORY_RESERVATION_TTL = datetime.timedelta(
+    minutes=env.int("INVENTORY_RESERVATION_MINUTES", default=15),
+)
+# Carts idle in Redis for longer than this are dropped and reloaded from
+# Postgres on the next request
+CART_REDIS_TTL = datetime.timedelta(days=env.int("CART_REDIS_DAYS", default=7))
+# How long replies to requests with an Idempotency-Key are kept for replays
+IDEMPOTENCY_KEY_TTL = datetime.timedelta(hours=24)
+# Upper bound on how long a cached API response is served; writes that bump
+# its group version invalidate it sooner
+RESPONSE_CACHE_TIMEOUT = env.int("RESPONSE_CACHE_SECONDS", default=60)
+# Rows fetched per round trip by the server-side cursor of streaming exports
+EXPORT_CHUNK_SIZE = 2000
+# Responsive variants generated for every product image upload
+IMAGE_VARIANT_WIDTHS = [320, 640, 960, 1280, 1920]
+IMAGE_VARIANT_FORMATS = ["webp", "jpeg"]
+IMAGE_VARIANT_QUALITY = 80
+# Width of the variant used as image_url in catalog listings
+IMAGE_LISTING_WIDTH = 640
+# "Frequently bought together": neighbours kept per product, orders looked
+# at, pairs seen in fewer orders than the minimum are dropped as noise and
+# the co-occurrence normalization ("cosine" or "lift")
+RECOMMENDATIONS_TOP_N = 10
+RECOMMENDATIONS_WINDOW = datetime.timedelta(days=180)
+RECOMMENDATIONS_MIN_CO_OCCURRENCE = 2
+RECOMMENDATIONS_METRIC = "cosine"
+# WebSocket fan-out (config/websocket.py): messages queued per socket before
+# a slow client is disconnected, and groups a socket may join
+WEBSOCKET_SEND_QUEUE_SIZE = 64
+WEBSOCKET_MAX_GROUPS = 100
+# Sockets must authenticate within WEBSOCKET_AUTH_TIMEOUT seconds; they are
+# pinged every WEBSOCKET_HEARTBEAT_INTERVAL, closed after
+# WEBSOCKET_IDLE_TIMEOUT without a frame from the client, and aborted if
+# they have not gone away WEBSOCKET_CLOSE_TIMEOUT after being closed
+WEBSOCKET_AUTH_TIMEOUT = 10
+WEBSOCKET_HEARTBEAT_INTERVAL = 20
+WEBSOCKET_IDLE_TIMEOUT = 60
+WEBSOCKET_CLOSE_TIMEOUT = 10
+# Read replicas (apps/utils/db_router.py): clients read the primary for
+# DATABASE_REPLICA_PIN_SECONDS after a write, and replicas more than
+# DATABASE_REPLICA_MAX_LAG seconds behind (measured every
+# DATABASE_REPLICA_CHECK_INTERVAL seconds) are skipped
+DATABASE_REPLICA_PIN_SECONDS = env.int("DATABASE_REPLICA_PIN_SECONDS", default=5)
+DATABASE_REPLICA_MAX_LAG = env.float("DATABASE_REPLICA_MAX_LAG", default=5.0)
+DATABASE_REPLICA_CHECK_INTERVAL = 5
+# Each worker publishes its psycopg pool metrics this often (seconds)
+DATABASE_POOL_STATS_INTERVAL = 10
+# Bloom filters in front of the refresh token blacklist (apps/users/blacklist.py),
+# one per day of expiry: 2**24 bits (2 MiB) keep ~1% false positives up to
+# ~1.7M blacklisted tokens a day
+TOKEN_BLACKLIST_BLOOM_BITS = 2**24
+TOKEN_BLACKLIST_BLOOM_HASHES = 7
+# Password hashing (apps/users/hashers.py): Argon2 hashes run at once per
+# worker process, their costs (raising them rehashes passwords at the next
+# login) and how often each worker publishes the pool's metrics (seconds)
+PASSWORD_HASHING_CONCURRENCY = env.int("PASSWORD_HASHING_CONCURRENCY", default=2)
+ARGON2_TIME_COST = env.int("ARGON2_TIME_COST", default=2)
+ARGON2_MEMORY_COST = env.int("ARGON2_MEMORY_COST", default=102400)
+ARGON2_PARALLELISM = env.int("ARGON2_PARALLELISM", default=8)
+PASSWORD_HASHING_STATS_INTERVAL = 10
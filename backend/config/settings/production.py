@@ -2,6 +2,7 @@
 import logging
 
 from .base import *  # noqa: F403
+from .base import DATABASE_POOL
 from .base import DATABASES
 from .base import REDIS_URL
 from .base import SPECTACULAR_SETTINGS
@@ -21,7 +22,10 @@ CORS_ALLOWED_ORIGINS = env.list("DJANGO_CORS_ALLOWED_ORIGINS", default=[])
 
 # DATABASES
 # ------------------------------------------------------------------------------
-DATABASES["default"]["CONN_MAX_AGE"] = env.int("CONN_MAX_AGE", default=60)
+# Con el pool de psycopg Django devuelve la conexión al acabar la petición.
+if DATABASE_POOL != "psycopg":
+    for _database in DATABASES.values():
+        _database["CONN_MAX_AGE"] = env.int("CONN_MAX_AGE", default=60)
 
 # CACHES
 # ------------------------------------------------------------------------------
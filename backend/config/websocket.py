@@ -1,13 +1,455 @@
-async def websocket_application(scope, receive, send):
+"""
+WebSocket endpoint with group broadcast across every ASGI worker.
+
+Gunicorn runs several Uvicorn workers, so the socket that must get a message
+is usually connected to another process. Django publishes to Redis pub/sub
+(``apps.utils.broadcast``); every worker has one :class:`Hub` with a single
+pub/sub connection, subscribed to the groups its sockets joined, that fans
+each message out to them.
+
+Each socket gets its own bounded send queue drained by a writer task, so a
+slow client never holds up the others: when its queue is full the socket is
+closed with code 1013 (try again later) instead of buffering without limit.
+
+Sockets authenticate with a ``SIMPLE_JWT`` access token, either as
+``?token=<jwt>`` on the handshake (an invalid one is rejected before the
+upgrade) or in an ``auth`` message within ``WEBSOCKET_AUTH_TIMEOUT``. Sending
+a new token before the current one expires keeps the socket open.
+
+Every worker has one :class:`Registry` of its open sockets. Each
+``WEBSOCKET_HEARTBEAT_INTERVAL`` it pings them and closes the ones that did
+not authenticate in time, whose token expired (4401) or that sent nothing for
+``WEBSOCKET_IDLE_TIMEOUT`` (4408); sockets that still have not gone away
+after ``WEBSOCKET_CLOSE_TIMEOUT`` are aborted. It also stores its counters
+in Redis for ``apps.utils.broadcast.worker_stats``.
+
+Client protocol (text frames):
+
+- ``{"action": "auth", "token": "<jwt>"}`` -> ``{"type": "authenticated"}``;
+- ``ping`` -> ``pong!``; ``pong`` answers the server's ``{"type": "ping"}``;
+- ``{"action": "subscribe" | "unsubscribe", "group": "<group>"}`` ->
+  ``{"type": "subscribed" | "unsubscribed", "group": ...}`` or
+  ``{"type": "error", "detail": ...}``.
+
+``stock.<product_id>`` groups are open to every authenticated socket;
+``user.<id>`` groups need ``scope["user"]`` to be that user.
+"""
+
+import asyncio
+import contextlib
+import json
+import os
+import re
+import socket
+import time
+import weakref
+from urllib.parse import parse_qs
+
+import redis
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import close_old_connections
+from rest_framework.exceptions import AuthenticationFailed
+
+from apps.users.authentication import ClaimsJWTAuthentication
+from apps.utils.broadcast import CHANNEL_PREFIX
+from apps.utils.broadcast import STATS_PREFIX
+from apps.utils.broadcast import channel
+from apps.utils.broadcast import encode
+from apps.utils.redis import get_async_redis
+
+PUBLIC_GROUP = re.compile(r"stock\.\d+")
+USER_GROUP = re.compile(r"user\.(\d+)")
+CLOSE_TRY_AGAIN_LATER = 1013
+CLOSE_UNAUTHORIZED = 4401
+CLOSE_IDLE = 4408
+# Pausa antes de volver a leer tras perder la conexión con Redis.
+RECONNECT_DELAY = 1.0
+PING = encode({"type": "ping"})
+_CLOSE = object()
+
+
+def can_join(scope: dict, group: str) -> bool:
+    if PUBLIC_GROUP.fullmatch(group):
+        return True
+    match = USER_GROUP.fullmatch(group)
+    user = scope.get("user")
+    return bool(
+        match
+        and user is not None
+        and user.is_authenticated
+        and str(user.pk) == match.group(1),
+    )
+
+
+def _authenticate(raw_token: str):
+    close_old_connections()
+    try:
+        authentication = ClaimsJWTAuthentication()
+        token = authentication.get_validated_token(raw_token)
+        return authentication.get_user(token), token["exp"]
+    except AuthenticationFailed:
+        return None
+    finally:
+        close_old_connections()
+
+
+async def authenticate(raw_token: str):
+    """``(user, exp)`` of a valid access token, or ``None``."""
+    return await sync_to_async(_authenticate)(raw_token)
+
+
+def query_token(scope: dict) -> str | None:
+    query = parse_qs(scope.get("query_string", b"").decode("latin-1"))
+    return query.get("token", [None])[0]
+
+
+class Connection:
+    """One socket: its groups, its bounded send queue and its liveness."""
+
+    def __init__(self, send, queue_size: int | None = None):
+        self.send = send
+        self.queue: asyncio.Queue = asyncio.Queue(
+            queue_size or settings.WEBSOCKET_SEND_QUEUE_SIZE,
+        )
+        self.groups: set[str] = set()
+        self.close_code: int | None = None
+        self.task: asyncio.Task | None = None
+        self.aborted = False
+        loop = asyncio.get_running_loop()
+        self.opened_at = self.last_seen = loop.time()
+        self.closing_at: float | None = None
+        # En la hora del bucle (monotónica), no en la del token.
+        self.expires_at: float | None = None
+        self.received = 0
+        self.sent = 0
+
+    @property
+    def authenticated(self) -> bool:
+        return self.expires_at is not None
+
+    def touch(self) -> None:
+        self.received += 1
+        self.last_seen = asyncio.get_running_loop().time()
+
+    def authorize(self, exp: int) -> None:
+        self.expires_at = asyncio.get_running_loop().time() + exp - time.time()
+
+    def push(self, text: str) -> None:
+        """Queue ``text``; a full queue closes the socket instead."""
+        if self.close_code is not None:
+            return
+        try:
+            self.queue.put_nowait(text)
+        except asyncio.QueueFull:
+            self.close(CLOSE_TRY_AGAIN_LATER)
+
+    def close(self, code: int) -> None:
+        """Drop whatever is pending and close the socket with ``code``."""
+        if self.close_code is not None:
+            return
+        self.close_code = code
+        self.closing_at = asyncio.get_running_loop().time()
+        # Lo pendiente ya no se enviará: deja sitio para el cierre.
+        while not self.queue.empty():
+            self.queue.get_nowait()
+        self.queue.put_nowait(_CLOSE)
+
+    def abort(self) -> None:
+        """End the application of a socket that never finished closing."""
+        self.aborted = True
+        if self.task is not None:
+            self.task.cancel()
+
+    async def write(self) -> None:
+        while True:
+            text = await self.queue.get()
+            if text is _CLOSE:
+                await self.send({"type": "websocket.close", "code": self.close_code})
+                return
+            await self.send({"type": "websocket.send", "text": text})
+            self.sent += 1
+
+
+class Hub:
+    """The groups joined by this worker's sockets and their pub/sub connection."""
+
+    def __init__(self):
+        self.groups: dict[str, set[Connection]] = {}
+        self.pubsub = get_async_redis().pubsub()
+        # Serializa SUBSCRIBE/UNSUBSCRIBE para que lleguen en orden a Redis.
+        self.lock = asyncio.Lock()
+        self.listener: asyncio.Task | None = None
+
+    async def join(self, connection: Connection, group: str) -> None:
+        connection.groups.add(group)
+        members = self.groups.get(group)
+        if members is not None:
+            members.add(connection)
+            return
+        self.groups[group] = {connection}
+        try:
+            async with self.lock:
+                await self.pubsub.subscribe(channel(group))
+        except redis.RedisError:
+            for member in self.groups.pop(group, ()):
+                member.groups.discard(group)
+            raise
+        if self.listener is None:
+            self.listener = asyncio.create_task(self.listen())
+
+    async def leave(self, connection: Connection, group: str) -> None:
+        connection.groups.discard(group)
+        members = self.groups.get(group)
+        if members is None:
+            return
+        members.discard(connection)
+        if not members:
+            del self.groups[group]
+            # Sin Redis no llega nada al canal: basta con olvidar el grupo.
+            with contextlib.suppress(redis.RedisError):
+                async with self.lock:
+                    await self.pubsub.unsubscribe(channel(group))
+
+    async def discard(self, connection: Connection) -> None:
+        for group in list(connection.groups):
+            await self.leave(connection, group)
+
+    def dispatch(self, channel_name: str, data: str) -> None:
+        group = channel_name.removeprefix(CHANNEL_PREFIX)
+        for connection in list(self.groups.get(group, ())):
+            connection.push(data)
+
+    async def listen(self) -> None:
+        while True:
+            try:
+                message = await self.pubsub.get_message(
+                    ignore_subscribe_messages=True,
+                    timeout=1.0,
+                )
+            except redis.RedisError:
+                # Al reconectar, redis-py vuelve a suscribir los canales.
+                await asyncio.sleep(RECONNECT_DELAY)
+                continue
+            if message is not None:
+                self.dispatch(message["channel"], message["data"])
+
+
+class Registry:
+    """This worker's open sockets: heartbeats, reaping and counters."""
+
+    def __init__(self):
+        self.connections: set[Connection] = set()
+        self.worker = f"{socket.gethostname()}:{os.getpid()}"
+        self.totals = dict.fromkeys(
+            ("opened", "closed", "reaped", "aborted", "received", "sent"),
+            0,
+        )
+        self.previous: tuple[float, int, int] | None = None
+        self.heartbeat: asyncio.Task | None = None
+
+    def add(self, connection: Connection) -> None:
+        self.connections.add(connection)
+        self.totals["opened"] += 1
+        if self.heartbeat is None:
+            self.heartbeat = asyncio.create_task(self.run())
+
+    def remove(self, connection: Connection) -> None:
+        if connection not in self.connections:
+            return
+        self.connections.remove(connection)
+        self.totals["closed"] += 1
+        self.totals["received"] += connection.received
+        self.totals["sent"] += connection.sent
+
+    def reap(self, now: float) -> None:
+        """Ping live sockets and close or abort the ones that must go."""
+        for connection in list(self.connections):
+            if connection.closing_at is not None:
+                if now - connection.closing_at >= settings.WEBSOCKET_CLOSE_TIMEOUT:
+                    self.totals["aborted"] += 1
+                    connection.abort()
+            elif (connection.authenticated and now >= connection.expires_at) or (
+                not connection.authenticated
+                and now - connection.opened_at >= settings.WEBSOCKET_AUTH_TIMEOUT
+            ):
+                connection.close(CLOSE_UNAUTHORIZED)
+            elif now - connection.last_seen >= settings.WEBSOCKET_IDLE_TIMEOUT:
+                self.totals["reaped"] += 1
+                connection.close(CLOSE_IDLE)
+            elif connection.authenticated:
+                connection.push(PING)
+
+    def stats(self, now: float) -> dict:
+        received = self.totals["received"] + sum(
+            connection.received for connection in self.connections
+        )
+        sent = self.totals["sent"] + sum(
+            connection.sent for connection in self.connections
+        )
+        stats = {
+            **self.totals,
+            "worker": self.worker,
+            "connections": len(self.connections),
+            "authenticated": sum(
+                connection.authenticated for connection in self.connections
+            ),
+            "received": received,
+            "sent": sent,
+            "received_per_second": 0.0,
+            "sent_per_second": 0.0,
+            "updated_at": time.time(),
+        }
+        if self.previous is not None:
+            then, previous_received, previous_sent = self.previous
+            if elapsed := now - then:
+                stats["received_per_second"] = (received - previous_received) / elapsed
+                stats["sent_per_second"] = (sent - previous_sent) / elapsed
+        self.previous = now, received, sent
+        return stats
+
+    async def run(self) -> None:
+        client = get_async_redis()
+        interval = settings.WEBSOCKET_HEARTBEAT_INTERVAL
+        while True:
+            await asyncio.sleep(interval)
+            now = asyncio.get_running_loop().time()
+            self.reap(now)
+            # Caduca sola si el worker muere sin borrarla.
+            with contextlib.suppress(redis.RedisError):
+                await client.set(
+                    f"{STATS_PREFIX}{self.worker}",
+                    encode(self.stats(now)),
+                    ex=max(int(interval * 3), 1),
+                )
+
+
+_hubs: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+_registries: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+
+def get_hub() -> Hub:
+    """The hub of the running event loop (one per worker process)."""
+    loop = asyncio.get_running_loop()
+    hub = _hubs.get(loop)
+    if hub is None:
+        hub = _hubs[loop] = Hub()
+    return hub
+
+
+def get_registry() -> Registry:
+    """The registry of the running event loop (one per worker process)."""
+    loop = asyncio.get_running_loop()
+    registry = _registries.get(loop)
+    if registry is None:
+        registry = _registries[loop] = Registry()
+    return registry
+
+
+async def handle_auth(scope: dict, connection: Connection, raw_token) -> None:
+    session = await authenticate(raw_token) if isinstance(raw_token, str) else None
+    current = scope.get("user")
+    if session is None or (current is not None and current.pk != session[0].pk):
+        connection.close(CLOSE_UNAUTHORIZED)
+        return
+    scope["user"], exp = session
+    connection.authorize(exp)
+    connection.push(encode({"type": "authenticated"}))
+
+
+async def handle_command(
+    scope: dict,
+    connection: Connection,
+    action: str,
+    group: str,
+) -> dict:
+    hub = get_hub()
+    if action == "unsubscribe":
+        await hub.leave(connection, group)
+        return {"type": "unsubscribed", "group": group}
+    if action != "subscribe":
+        return {"type": "error", "detail": "Unknown action."}
+    if not can_join(scope, group):
+        return {"type": "error", "detail": "Forbidden group.", "group": group}
+    if (
+        group not in connection.groups
+        and len(connection.groups) >= settings.WEBSOCKET_MAX_GROUPS
+    ):
+        return {"type": "error", "detail": "Too many groups.", "group": group}
+    try:
+        await hub.join(connection, group)
+    except redis.RedisError:
+        return {"type": "error", "detail": "Unavailable.", "group": group}
+    return {"type": "subscribed", "group": group}
+
+
+async def handle_text(scope: dict, connection: Connection, text: str) -> None:
+    if text == "pong":
+        return
+    if text == "ping" and connection.authenticated:
+        connection.push("pong!")
+        return
+    try:
+        command = json.loads(text)
+        action = command["action"]
+        if action == "auth":
+            await handle_auth(scope, connection, command.get("token"))
+            return
+        group = str(command["group"])
+    except (ValueError, KeyError, TypeError):
+        command = None
+    if not connection.authenticated:
+        connection.close(CLOSE_UNAUTHORIZED)
+    elif command is None:
+        connection.push(encode({"type": "error", "detail": "Invalid message."}))
+    else:
+        connection.push(encode(await handle_command(scope, connection, action, group)))
+
+
+async def serve(scope: dict, receive, connection: Connection) -> None:
     while True:
         event = await receive()
 
-        if event["type"] == "websocket.connect":
-            await send({"type": "websocket.accept"})
-
         if event["type"] == "websocket.disconnect":
-            break
+            return
 
         if event["type"] == "websocket.receive":
-            if event["text"] == "ping":
-                await send({"type": "websocket.send", "text": "pong!"})
+            connection.touch()
+            if event.get("text") and connection.close_code is None:
+                await handle_text(scope, connection, event["text"])
+
+
+async def websocket_application(scope, receive, send):
+    event = await receive()
+    if event["type"] != "websocket.connect":
+        return
+    session = None
+    if (raw_token := query_token(scope)) is not None:
+        session = await authenticate(raw_token)
+        if session is None:
+            # Antes de aceptar: el servidor responde 403 al handshake.
+            await send({"type": "websocket.close", "code": CLOSE_UNAUTHORIZED})
+            return
+    await send({"type": "websocket.accept"})
+
+    # Desde aquí todo envío pasa por la cola de la conexión.
+    connection = Connection(send)
+    connection.task = asyncio.current_task()
+    if session is not None:
+        scope["user"], exp = session
+        connection.authorize(exp)
+    registry = get_registry()
+    registry.add(connection)
+    writer = asyncio.create_task(connection.write())
+    try:
+        await serve(scope, receive, connection)
+    except asyncio.CancelledError:
+        # Abortado por el registro: el servidor cierra el transporte al volver.
+        if not connection.aborted:
+            raise
+    finally:
+        registry.remove(connection)
+        await get_hub().discard(connection)
+        writer.cancel()
+        # Un cliente que ya se fue hace fallar el último envío: da igual.
+        await asyncio.gather(writer, return_exceptions=True)